@@ -14,7 +14,10 @@ from dotenv import load_dotenv
 import quasarr.providers.web_server
 from quasarr.api import get_api
 from quasarr.constants import FALLBACK_USER_AGENT
+from quasarr.downloads.packages.history_archive import start_history_archiver
+from quasarr.downloads.packages.snapshot import start_package_snapshot_service
 from quasarr.providers import shared_state, version
+from quasarr.providers.cache_maintenance import start_cache_maintenance
 from quasarr.providers.log import (
     crit,
     debug,
@@ -33,6 +36,7 @@ from quasarr.providers.utils import (
 )
 from quasarr.search.sources.helpers import get_login_required_hostnames
 from quasarr.storage.config import Config, get_clean_hostnames
+from quasarr.storage.imdb_dataset import imdb_dataset_importer
 from quasarr.storage.setup import (
     flaresolverr_config,
     hostname_credentials_config,
@@ -240,6 +244,17 @@ def run():
         )
         updater.start()
 
+        if os.environ.get("IMDB_DATASET"):
+            imdb_importer = multiprocessing.Process(
+                target=imdb_dataset_importer,
+                args=(shared_state_dict, shared_state_lock),
+                daemon=True,
+            )
+            imdb_importer.start()
+
+        # Runs in this process, as it holds the caches used by searches
+        start_cache_maintenance()
+
         try:
             get_api(shared_state_dict, shared_state_lock)
         except KeyboardInterrupt:
@@ -333,6 +348,8 @@ def update_checker(shared_state_dict, shared_state_lock):
 def jdownloader_connection(shared_state_dict, shared_state_lock):
     try:
         shared_state.set_state(shared_state_dict, shared_state_lock)
+        snapshot_service = None
+        history_archiver = None
 
         while True:
             shared_state.set_device_from_config()
@@ -360,6 +377,11 @@ def jdownloader_connection(shared_state_dict, shared_state_lock):
             except Exception as e:
                 error(f"Error starting downloads: {e}")
 
+            if snapshot_service is None:
+                snapshot_service = start_package_snapshot_service(shared_state)
+            if history_archiver is None:
+                history_archiver = start_history_archiver(shared_state)
+
             while True:
                 time.sleep(300)
                 device_state = shared_state.check_device(
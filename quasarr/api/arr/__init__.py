@@ -4,6 +4,7 @@
 
 import traceback
 import xml.sax.saxutils as sax_utils
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from urllib.parse import parse_qs, urlparse
 from xml.etree import ElementTree
@@ -11,7 +12,8 @@ from xml.etree import ElementTree
 from bottle import request
 
 from quasarr.downloads import download
-from quasarr.downloads.packages import delete_package, get_packages
+from quasarr.downloads.packages import delete_packages
+from quasarr.downloads.packages.snapshot import get_packages_from_snapshot
 from quasarr.providers import shared_state
 from quasarr.providers.auth import require_api_key
 from quasarr.providers.log import debug, error, info, warn
@@ -26,6 +28,9 @@ from quasarr.search import get_search_results
 from quasarr.search.sources import get_sources
 from quasarr.storage.categories import get_download_categories, get_search_categories
 
+# Uploads of one POST /api request that are scraped at the same time
+MAX_CONCURRENT_GRABS = 4
+
 
 def setup_arr_routes(app):
     @app.get("/download/")
@@ -49,43 +54,63 @@ def setup_arr_routes(app):
         downloads = request.files.getall("name")
         nzo_ids = []  # naming structure for package IDs expected in newznab
 
+        # Extract category from request, SABnzbd addfile expects &cat=...
+        category_param = getattr(request.query, "cat", None)
+        download_category = determine_category(request_from, category_param)
+
+        # The request is only accessible from this thread, so all uploads are read first
+        grabs = []
         for upload in downloads:
             file_content = upload.file.read()
             root = ElementTree.fromstring(file_content)
-
-            title = sax_utils.unescape(root.find(".//file").attrib["title"])
-
-            url = root.find(".//file").attrib["url"]
-
-            size_mb = root.find(".//file").attrib["size_mb"]
-            password = root.find(".//file").attrib.get("password")
-            imdb_id = root.find(".//file").attrib.get("imdb_id")
-            source_key = root.find(".//file").attrib.get("source_key") or None
-
-            # Extract category from request, SABnzbd addfile expects &cat=...
-            category_param = getattr(request.query, "cat", None)
-            download_category = determine_category(request_from, category_param)
-
-            info(f"Attempting download for <y>{title}</y>")
+            file = root.find(".//file")
+
+            grabs.append(
+                {
+                    "title": sax_utils.unescape(file.attrib["title"]),
+                    "url": file.attrib["url"],
+                    "size_mb": file.attrib["size_mb"],
+                    "password": file.attrib.get("password"),
+                    "imdb_id": file.attrib.get("imdb_id"),
+                    "source_key": file.attrib.get("source_key") or None,
+                }
+            )
+
+        def grab(job):
+            info(f"Attempting download for <y>{job['title']}</y>")
             try:
-                downloaded = download(
+                return download(
                     shared_state,
                     request_from,
                     download_category,
-                    title,
-                    url,
-                    size_mb,
-                    password,
-                    imdb_id,
-                    source_key,
+                    job["title"],
+                    job["url"],
+                    job["size_mb"],
+                    job["password"],
+                    job["imdb_id"],
+                    job["source_key"],
                 )
             except Exception as e:
+                # Other uploads may already be added, so their ids must still be returned
                 if type(e).__name__ == "TokenExpiredException":
                     warn(
-                        f"Download failed for <y>{title}</y>: MyJDownloader token expired."
+                        f"Download failed for <y>{job['title']}</y>: MyJDownloader token expired."
                     )
-                    continue
-                raise e
+                else:
+                    error(f"Download failed for <y>{job['title']}</y>: {e}")
+                    debug(traceback.format_exc())
+                return None
+
+        # Multiple uploads are scraped concurrently, results keep the upload order
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(MAX_CONCURRENT_GRABS, len(grabs)))
+        ) as executor:
+            results = list(executor.map(grab, grabs))
+
+        for job, downloaded in zip(grabs, results, strict=True):
+            if downloaded is None:
+                continue
+            title = job["title"]
             try:
                 success = downloaded["success"]
                 package_id = downloaded["package_id"]
@@ -218,17 +243,22 @@ def setup_arr_routes(app):
 
                 elif mode == "queue" or mode == "history":
                     if request.query.name and request.query.name == "delete":
-                        package_id = request.query.value
+                        # SABnzbd accepts a comma separated list of ids
+                        package_ids = [
+                            package_id.strip()
+                            for package_id in request.query.value.split(",")
+                            if package_id.strip()
+                        ]
                         package_title = getattr(request.query, "title", None)
-                        deleted = delete_package(
-                            shared_state, package_id, package_title=package_title
+                        deleted = delete_packages(
+                            shared_state, package_ids, package_title=package_title
                         )
-                        response = {"status": deleted, "nzo_ids": [package_id]}
+                        response = {"status": deleted, "nzo_ids": package_ids}
                         if not deleted:
                             response["quasarr_error"] = True
                         return response
 
-                    packages = get_packages(shared_state)
+                    packages = get_packages_from_snapshot(shared_state)
                     if mode == "queue":
                         return {
                             "queue": {
@@ -6,7 +6,8 @@ from bottle import redirect, request
 
 import quasarr.providers.html_images as images
 from quasarr.api.jdownloader import get_jdownloader_disconnected_page
-from quasarr.downloads.packages import delete_package, get_packages
+from quasarr.downloads.packages import delete_package
+from quasarr.downloads.packages.snapshot import get_packages_from_snapshot
 from quasarr.providers import shared_state
 from quasarr.providers.auth import require_api_key, require_browser_auth
 from quasarr.providers.html_templates import render_button, render_centered_html
@@ -228,7 +229,7 @@ def _render_history_item(item):
 
 def _render_packages_content():
     """Render just the packages content (used for both full page and AJAX refresh)."""
-    downloads = get_packages(shared_state)
+    downloads = get_packages_from_snapshot(shared_state)
     queue = downloads.get("queue", [])
     history = downloads.get("history", [])
 
@@ -363,7 +364,7 @@ def setup_packages_routes(app):
                 "history_count": 0,
             }
 
-        downloads = get_packages(shared_state)
+        downloads = get_packages_from_snapshot(shared_state)
         return {
             "connected": True,
             "linkgrabber": downloads.get(
@@ -4,6 +4,8 @@
 
 import hashlib
 import json
+import threading
+import time
 
 from quasarr.constants import (
     AUTO_DECRYPT_PATTERNS,
@@ -11,9 +13,14 @@ from quasarr.constants import (
 )
 from quasarr.downloads.linkcrypters.hide import decrypt_links_if_hide
 from quasarr.downloads.packages import get_packages
+from quasarr.downloads.packages.package_ids import (
+    is_known_package_id,
+    query_package_ids,
+    sync_package_ids,
+)
 from quasarr.downloads.sources import get_sources as get_download_sources
 from quasarr.providers.hostname_issues import clear_hostname_issue, mark_hostname_issue
-from quasarr.providers.log import info, warn
+from quasarr.providers.log import debug, info, warn
 from quasarr.providers.notifications import send_discord_message
 from quasarr.providers.statistics import StatsHelper
 from quasarr.providers.utils import (
@@ -27,6 +34,10 @@ from quasarr.storage.categories import (
     get_download_category_mirrors,
 )
 
+# Package ids currently being processed, so concurrent grabs of the same release are skipped
+_packages_in_progress = set()
+_packages_in_progress_lock = threading.Lock()
+
 # =============================================================================
 # DETERMINISTIC PACKAGE ID GENERATION
 # =============================================================================
@@ -318,6 +329,19 @@ def package_id_exists(shared_state, package_id):
         return True
     if shared_state.get_db("failed").retrieve(package_id):
         return True
+    if shared_state.get_db("history_archive").retrieve(package_id):
+        return True
+
+    if is_known_package_id(shared_state, package_id) is False:
+        return False
+
+    try:
+        fetched_at = time.time()
+        package_ids = query_package_ids(shared_state.get_device())
+        sync_package_ids(shared_state, package_ids, fetched_at)
+        return package_id in package_ids
+    except Exception as e:
+        debug(f"Targeted package id query failed, reading all packages: {e}")
 
     data = get_packages(shared_state) or {}
 
@@ -432,32 +456,43 @@ def download(
             title, final_source_key, client_type, download_category
         )
 
-        # Skip Download if package_id already exists
-        if package_id_exists(shared_state, package_id):
-            warn(f"Package {package_id} already exists. Skipping download!")
-            return {"success": True, "package_id": package_id, "title": title}
+        # Skip Download if package_id is already being added
+        with _packages_in_progress_lock:
+            if package_id in _packages_in_progress:
+                warn(f"Package {package_id} is already being added. Skipping download!")
+                return {"success": True, "package_id": package_id, "title": title}
+            _packages_in_progress.add(package_id)
+
+        try:
+            # Skip Download if package_id already exists
+            if package_id_exists(shared_state, package_id):
+                warn(f"Package {package_id} already exists. Skipping download!")
+                return {"success": True, "package_id": package_id, "title": title}
+
+            if source_result is None:
+                result = fail(
+                    title,
+                    package_id,
+                    shared_state,
+                    reason=f'Could not find matching source for "{title}" - "{url}"',
+                )
+                return {"package_id": package_id, **result}
 
-        if source_result is None:
-            result = fail(
+            result = process_links(
+                shared_state,
+                source_result,
                 title,
+                password,
                 package_id,
-                shared_state,
-                reason=f'Could not find matching source for "{title}" - "{url}"',
+                imdb_id,
+                url,
+                size_mb,
+                label,
             )
             return {"package_id": package_id, **result}
-
-        result = process_links(
-            shared_state,
-            source_result,
-            title,
-            password,
-            package_id,
-            imdb_id,
-            url,
-            size_mb,
-            label,
-        )
-        return {"package_id": package_id, **result}
+        finally:
+            with _packages_in_progress_lock:
+                _packages_in_progress.discard(package_id)
 
     except Exception as e:
         if not package_id:
@@ -13,8 +13,13 @@ from quasarr.constants import (
     EXTRACTION_COMPLETE_MARKERS,
     PACKAGE_ID_PATTERN,
 )
+from quasarr.downloads.packages.package_ids import (
+    forget_package_id,
+    sync_package_ids,
+)
 from quasarr.providers.jd_cache import JDPackageCache
 from quasarr.providers.log import debug, info, trace
+from quasarr.providers.myjd_api import PACKAGE_IDS, query_params
 from quasarr.storage.categories import get_download_category_from_package_id
 
 # =============================================================================
@@ -288,6 +293,8 @@ def get_packages(shared_state, _cache=None, auto_start=True):
     else:
         cache = _cache
         trace("Using provided cache instance")
+    fetched_at = time.time()
+    cache.prefetch()
 
     # === PROTECTED PACKAGES (CAPTCHA required) ===
     protected_packages = shared_state.get_db("protected").retrieve_all_titles()
@@ -356,7 +363,7 @@ def get_packages(shared_state, _cache=None, auto_start=True):
 
     # === LINKGRABBER PACKAGES ===
     linkgrabber_packages = cache.linkgrabber_packages
-    linkgrabber_links = cache.linkgrabber_links
+    linkgrabber_links_by_package = cache.linkgrabber_links_by_package
 
     debug(f"Processing <g>{len(linkgrabber_packages)}</g> linkgrabber packages")
 
@@ -364,17 +371,16 @@ def get_packages(shared_state, _cache=None, auto_start=True):
         for package in linkgrabber_packages:
             package_name = package.get("name", "unknown")
             package_uuid = package.get("uuid")
+            package_links = linkgrabber_links_by_package.get(package_uuid, [])
 
             comment = package.get("comment")
             if not is_quasarr_package(comment):
-                comment = get_links_comment(package, linkgrabber_links)
+                comment = get_links_comment(package, package_links)
             # Validate comment is a real ID - if not, ignore it
             if not is_quasarr_package(comment):
                 comment = None
 
-            link_details = get_links_status(
-                package, linkgrabber_links, is_archive=False
-            )
+            link_details = get_links_status(package, package_links, is_archive=False)
 
             error = link_details["error"]
             offline_mirror_linkids = link_details["offline_mirror_linkids"]
@@ -411,6 +417,7 @@ def get_packages(shared_state, _cache=None, auto_start=True):
     # === DOWNLOADER PACKAGES ===
     downloader_packages = cache.downloader_packages
     downloader_links = cache.downloader_links
+    downloader_links_by_package = cache.downloader_links_by_package
 
     debug(
         f"Processing <g>{len(downloader_packages)}</g> downloader packages with <g>{len(downloader_links)}</g> links"
@@ -428,10 +435,11 @@ def get_packages(shared_state, _cache=None, auto_start=True):
         for package in downloader_packages:
             package_name = package.get("name", "unknown")
             package_uuid = package.get("uuid")
+            package_links = downloader_links_by_package.get(package_uuid, [])
 
             comment = package.get("comment")
             if not is_quasarr_package(comment):
-                comment = get_links_comment(package, downloader_links)
+                comment = get_links_comment(package, package_links)
             # Validate comment is a real ID - if not, ignore it
             if not is_quasarr_package(comment):
                 comment = None
@@ -442,7 +450,7 @@ def get_packages(shared_state, _cache=None, auto_start=True):
             )
             debug(f"Package '{package_name}' is_archive={is_archive}")
 
-            link_details = get_links_status(package, downloader_links, is_archive)
+            link_details = get_links_status(package, package_links, is_archive)
 
             error = link_details["error"]
             finished = link_details["all_finished"]
@@ -490,6 +498,19 @@ def get_packages(shared_state, _cache=None, auto_start=True):
                 }
             )
 
+    # Only complete lists prove that an id is not in JDownloader
+    if not cache.query_failed:
+        sync_package_ids(
+            shared_state,
+            {
+                package["comment"]
+                for package in packages
+                if package["type"] in ("linkgrabber", "downloader")
+                and package["comment"]
+            },
+            fetched_at,
+        )
+
     # === BUILD RESPONSE ===
     linkgrabber_collecting = bool(cache.is_collecting)
     downloads = {
@@ -648,6 +669,13 @@ def get_packages(shared_state, _cache=None, auto_start=True):
         else:
             info(f"Invalid package location {package['location']}")
 
+    # === ARCHIVED HISTORY ===
+    # Lazy import, the history archive module builds on this one
+    from quasarr.downloads.packages.history_archive import get_archived_history
+
+    live_ids = {item["nzo_id"] for item in downloads["queue"] + downloads["history"]}
+    downloads["history"] += get_archived_history(shared_state, live_ids)
+
     # === AUTO-START QUASARR PACKAGES ===
     if auto_start and not linkgrabber_collecting:
         debug("Linkgrabber not collecting, checking for packages to auto-start")
@@ -656,14 +684,13 @@ def get_packages(shared_state, _cache=None, auto_start=True):
         links_to_start = []
 
         for package in linkgrabber_packages:
-            comment = get_links_comment(package, linkgrabber_links)
+            package_uuid = package.get("uuid")
+            package_links = linkgrabber_links_by_package.get(package_uuid, [])
+            comment = get_links_comment(package, package_links)
             if is_quasarr_package(comment):
-                package_uuid = package.get("uuid")
                 if package_uuid:
                     package_link_ids = [
-                        link.get("uuid")
-                        for link in linkgrabber_links
-                        if link.get("packageUUID") == package_uuid and link.get("uuid")
+                        link.get("uuid") for link in package_links if link.get("uuid")
                     ]
                     if package_link_ids:
                         debug(
@@ -675,9 +702,8 @@ def get_packages(shared_state, _cache=None, auto_start=True):
                         info(
                             f"Package {package_uuid} has no links in linkgrabber - skipping start"
                         )
-                    # Only start one package at a time
-                    break
 
+        # All eligible packages are started with one call
         if packages_to_start and links_to_start:
             debug(
                 f"Moving <g>{len(packages_to_start)}</g> packages with <g>{len(links_to_start)}</g> links to download list"
@@ -751,10 +777,71 @@ def get_packages(shared_state, _cache=None, auto_start=True):
     return downloads
 
 
-def delete_package(shared_state, package_id, package_title=None):
-    """Delete a package from JDownloader and/or the database."""
+def _find_packages_by_title(package_lists, package_title):
+    """Find packages whose name matches package_title, ignoring status prefixes."""
+    matches = []
+    for package_location, package_collection in package_lists.items():
+        for package in package_collection:
+            # Queue items use 'filename', History items use 'name'
+            name = (
+                package.get("filename")
+                if package_location == "queue"
+                else package.get("name")
+            )
+
+            # Clean up name for comparison if in queue (remove status prefixes)
+            if package_location == "queue" and name:
+                for prefix in [
+                    "[Downloading] ",
+                    "[Extracting] ",
+                    "[Paused] ",
+                    "[Linkgrabber] ",
+                    "[CAPTCHA not solved!] ",
+                ]:
+                    name = name.replace(prefix, "")
+
+            if name and package_title:
+                normalized_name = " ".join(str(name).split()).lower()
+                normalized_title = " ".join(str(package_title).split()).lower()
+                if (
+                    normalized_name == normalized_title
+                    or normalized_name in normalized_title
+                    or normalized_title in normalized_name
+                ):
+                    matches.append(package)
+    return matches
+
+
+def _remaining_package_uuids(shared_state, package_uuids):
+    """
+    Return the package UUIDs still present in linkgrabber or downloader.
+    A list that could not be queried counts as still containing all of them.
+    """
+    remaining = set()
+    device = shared_state.get_device()
+    for endpoint, name in (
+        (device.linkgrabber, "linkgrabber_packages"),
+        (device.downloads, "downloader_packages"),
+    ):
+        try:
+            current = endpoint.query_packages(query_params(name, PACKAGE_IDS))
+            remaining |= {p.get("uuid") for p in current} & package_uuids
+        except Exception:
+            remaining |= package_uuids
+    return remaining
+
+
+def delete_packages(shared_state, package_ids, package_title=None):
+    """
+    Delete packages from JDownloader and/or the database.
+
+    All targets are resolved from one package list, removed with one cleanup call per
+    JDownloader list and one database transaction, and verified together.
+    The title is only used to find a single package whose ID is unknown.
+    Returns True if at least one package was deleted.
+    """
     debug(
-        f"delete_package: Starting deletion of package {package_id} (title: {package_title})"
+        f"delete_packages: Starting deletion of packages {package_ids} (title: {package_title})"
     )
 
     try:
@@ -768,208 +855,159 @@ def delete_package(shared_state, package_id, package_title=None):
             "history": packages.get("history", []),
         }
 
-        matches = []
-
         # 1. Try to find by ID
-        for _package_location, package_collection in package_lists.items():
-            for package in package_collection:
-                if str(package.get("nzo_id", "")) == str(package_id):
-                    matches.append(package)
+        wanted = {str(package_id) for package_id in package_ids}
+        matches = [
+            package
+            for package_collection in package_lists.values()
+            for package in package_collection
+            if str(package.get("nzo_id", "")) in wanted
+        ]
 
         # 2. If not found by ID, try to find by Title
-        if not matches and package_title:
+        if not matches and package_title and len(package_ids) == 1:
             debug(
-                f"delete_package: ID '{package_id}' not found, trying title '{package_title}'"
+                f"delete_packages: ID '{package_ids[0]}' not found, trying title '{package_title}'"
             )
-            for package_location, package_collection in package_lists.items():
-                for package in package_collection:
-                    # Queue items use 'filename', History items use 'name'
-                    name = (
-                        package.get("filename")
-                        if package_location == "queue"
-                        else package.get("name")
-                    )
-
-                    # Clean up name for comparison if in queue (remove status prefixes)
-                    if package_location == "queue" and name:
-                        for prefix in [
-                            "[Downloading] ",
-                            "[Extracting] ",
-                            "[Paused] ",
-                            "[Linkgrabber] ",
-                            "[CAPTCHA not solved!] ",
-                        ]:
-                            name = name.replace(prefix, "")
-
-                    if name and package_title:
-                        normalized_name = " ".join(str(name).split()).lower()
-                        normalized_title = " ".join(str(package_title).split()).lower()
-                        if (
-                            normalized_name == normalized_title
-                            or normalized_name in normalized_title
-                            or normalized_title in normalized_name
-                        ):
-                            matches.append(package)
+            matches = _find_packages_by_title(package_lists, package_title)
 
         if not matches:
-            info(f"Failed to delete package {package_id} - not found by ID or Title")
+            info(
+                f"Failed to delete package {', '.join(map(str, package_ids))} - not found by ID or Title"
+            )
             return False
 
-        success = False
+        jd_packages = {}  # package_uuid -> package
+        lg_link_ids = []
+        dl_link_ids = []
+        db_packages = {}  # nzo_id -> package
+
         for package in matches:
             package_type = package.get("type")
             package_uuid = package.get("uuid")
-
-            # Get title for logging
-            deleted_title = package.get("filename") or package.get("name") or "Unknown"
-
             debug(
-                f"delete_package: Found package to delete - type={package_type}, uuid={package_uuid}, package={package}"
+                f"delete_packages: Found package to delete - type={package_type}, uuid={package_uuid}, package={package}"
             )
 
-            # Perform deletion based on package type
             if package_type in ["linkgrabber", "downloader"]:
                 if not package_uuid:
                     debug(
-                        f"delete_package: Cannot delete {package_type} package - UUID is missing"
+                        f"delete_packages: Cannot delete {package_type} package - UUID is missing"
                     )
                     continue
+                jd_packages[package_uuid] = package
 
                 # Collect link IDs if available in cache
-                lg_link_ids = []
-                dl_link_ids = []
-
                 if package_type == "linkgrabber":
-                    lg_link_ids = get_links_matching_package_uuid(
-                        package, cache.linkgrabber_links
-                    )
-                elif package_type == "downloader":
-                    dl_link_ids = get_links_matching_package_uuid(
-                        package, cache.downloader_links
-                    )
-
-                debug(
-                    f"delete_package: Deleting package {package_uuid} from BOTH Linkgrabber and Downloader"
-                )
-
-                # 1. Delete from Linkgrabber
-                try:
-                    shared_state.get_device().linkgrabber.cleanup(
-                        "DELETE_ALL",
-                        "REMOVE_LINKS_AND_DELETE_FILES",
-                        "SELECTED",
-                        lg_link_ids,
-                        [package_uuid],
-                    )
-                except Exception as e:
-                    debug(f"delete_package: Linkgrabber cleanup failed: {e}")
-
-                # 2. Delete from Downloader
-                try:
-                    shared_state.get_device().downloads.cleanup(
-                        "DELETE_ALL",
-                        "REMOVE_LINKS_AND_DELETE_FILES",
-                        "SELECTED",
-                        dl_link_ids,
-                        [package_uuid],
-                    )
-                except Exception as e:
-                    debug(f"delete_package: Downloads cleanup failed: {e}")
-
-                # 3. Verify deletion from BOTH with polling.
-                # JDownloader cleanup is asynchronous and may need a few seconds.
-                lg_gone = False
-                dl_gone = False
-                verification_deadline = time.time() + 15
-
-                while time.time() < verification_deadline:
-                    lg_gone = False
-                    dl_gone = False
-
-                    try:
-                        current_lg_packages = (
-                            shared_state.get_device().linkgrabber.query_packages()
-                        )
-                        lg_gone = not any(
-                            p.get("uuid") == package_uuid for p in current_lg_packages
-                        )
-                    except Exception:
-                        lg_gone = False
-
-                    try:
-                        current_dl_packages = (
-                            shared_state.get_device().downloads.query_packages()
-                        )
-                        dl_gone = not any(
-                            p.get("uuid") == package_uuid for p in current_dl_packages
-                        )
-                    except Exception:
-                        dl_gone = False
-
-                    if lg_gone and dl_gone:
-                        break
-
-                    time.sleep(0.5)
-
-                if not lg_gone:
-                    info(
-                        f"Verification failed: Package {deleted_title} still exists in linkgrabber"
+                    lg_link_ids += get_links_matching_package_uuid(
+                        package,
+                        cache.linkgrabber_links_by_package.get(package_uuid, []),
                     )
-                if not dl_gone:
-                    info(
-                        f"Verification failed: Package {deleted_title} still exists in downloader"
+                else:
+                    dl_link_ids += get_links_matching_package_uuid(
+                        package,
+                        cache.downloader_links_by_package.get(package_uuid, []),
                     )
 
-                if lg_gone and dl_gone:
-                    info(f"Deleted package <y>{deleted_title}</y> from JDownloader")
-                    success = True
-
-            elif package_type in ["protected", "failed"]:
+            elif package_type in ["protected", "failed", "archived"]:
                 db_id = package.get("nzo_id")
                 if not db_id:
                     debug(
-                        f"delete_package: Cannot delete {package_type} package - ID is missing"
+                        f"delete_packages: Cannot delete {package_type} package - ID is missing"
                     )
                     continue
+                db_packages[db_id] = package
 
-                debug(
-                    f"delete_package: Deleting {db_id} from BOTH Protected and Failed DBs"
-                )
+        deleted = []
 
-                # 1. Delete from Protected
-                try:
-                    shared_state.get_db("protected").delete(db_id)
-                except Exception as e:
-                    debug(f"delete_package: Protected DB delete exception: {e}")
+        if jd_packages:
+            package_uuids = set(jd_packages)
+            debug(
+                f"delete_packages: Deleting {len(package_uuids)} packages from BOTH Linkgrabber and Downloader"
+            )
 
-                # 2. Delete from Failed
-                try:
-                    shared_state.get_db("failed").delete(db_id)
-                except Exception as e:
-                    debug(f"delete_package: Failed DB delete exception: {e}")
+            # 1. Delete from Linkgrabber
+            try:
+                shared_state.get_device().linkgrabber.cleanup(
+                    "DELETE_ALL",
+                    "REMOVE_LINKS_AND_DELETE_FILES",
+                    "SELECTED",
+                    lg_link_ids,
+                    list(package_uuids),
+                )
+            except Exception as e:
+                debug(f"delete_packages: Linkgrabber cleanup failed: {e}")
 
-                # 3. Verify deletion from BOTH
-                protected_exists = shared_state.get_db("protected").retrieve(db_id)
-                failed_exists = shared_state.get_db("failed").retrieve(db_id)
+            # 2. Delete from Downloader
+            try:
+                shared_state.get_device().downloads.cleanup(
+                    "DELETE_ALL",
+                    "REMOVE_LINKS_AND_DELETE_FILES",
+                    "SELECTED",
+                    dl_link_ids,
+                    list(package_uuids),
+                )
+            except Exception as e:
+                debug(f"delete_packages: Downloads cleanup failed: {e}")
+
+            # 3. Verify deletion from BOTH with polling.
+            # JDownloader cleanup is asynchronous and may need a few seconds.
+            remaining = package_uuids
+            verification_deadline = time.time() + 15
+            while time.time() < verification_deadline:
+                remaining = _remaining_package_uuids(shared_state, package_uuids)
+                if not remaining:
+                    break
+                time.sleep(0.5)
 
-                if protected_exists:
+            for package_uuid, package in jd_packages.items():
+                deleted_title = (
+                    package.get("filename") or package.get("name") or "Unknown"
+                )
+                if package_uuid in remaining:
                     info(
-                        f"Verification failed: Package {deleted_title} still exists in protected DB"
+                        f"Verification failed: Package {deleted_title} still exists in JDownloader"
                     )
+                else:
+                    info(f"Deleted package <y>{deleted_title}</y> from JDownloader")
+                    deleted.append(package)
 
-                if failed_exists:
-                    info(
-                        f"Verification failed: Package {deleted_title} still exists in failed DB"
+        if db_packages:
+            debug(
+                f"delete_packages: Deleting {len(db_packages)} packages from Protected, Failed and archive DBs"
+            )
+            also_from = ["failed"]
+            if any(p.get("type") == "archived" for p in db_packages.values()):
+                also_from.append("history_archive")
+            try:
+                shared_state.get_db("protected").delete_many(
+                    list(db_packages), also_from=also_from
+                )
+                for package in db_packages.values():
+                    deleted_title = (
+                        package.get("filename") or package.get("name") or "Unknown"
                     )
-
-                if not protected_exists and not failed_exists:
                     info(f"Deleted package <y>{deleted_title}</y> from DBs")
-                    success = True
+                    deleted.append(package)
+            except Exception as e:
+                info(f"Verification failed: Packages still exist in DBs: {e}")
+
+        for package in deleted:
+            forget_package_id(shared_state, package.get("nzo_id"))
 
-        return success
+        # Lazy import, the snapshot module builds on this one
+        from quasarr.downloads.packages.snapshot import invalidate_package_snapshot
+
+        invalidate_package_snapshot(shared_state)
+        return bool(deleted)
 
     except Exception as e:
-        info(f"Failed to delete package {package_id}")
-        debug(f"delete_package: Exception during deletion: {type(e).__name__}: {e}")
-        debug(f"delete_package: Traceback: {traceback.format_exc()}")
+        info(f"Failed to delete package {', '.join(map(str, package_ids))}")
+        debug(f"delete_packages: Exception during deletion: {type(e).__name__}: {e}")
+        debug(f"delete_packages: Traceback: {traceback.format_exc()}")
         return False
+
+
+def delete_package(shared_state, package_id, package_title=None):
+    """Delete a package from JDownloader and/or the database."""
+    return delete_packages(shared_state, [package_id], package_title)
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+"""
+Opt-in archive of finished history entries, so JDownloader's download list stays small.
+
+Quasarr never lets JDownloader clean up finished downloads, so every package
+would stay in the download list and slow down all link queries. If
+HISTORY_ARCHIVE is set, finished Quasarr packages that were reported in the
+history for that many hours are stored in the history_archive table and their
+links are removed from JDownloader. Downloaded files are kept. Archived entries
+are still part of the history until they are deleted through the API.
+"""
+
+import json
+import os
+import threading
+import time
+
+from quasarr.downloads.packages import (
+    get_links_matching_package_uuid,
+    get_packages,
+    is_quasarr_package,
+)
+from quasarr.providers.jd_cache import JDPackageCache
+from quasarr.providers.log import debug, info
+
+HISTORY_ARCHIVE_TABLE = "history_archive"
+CHECK_INTERVAL = 5 * 60
+
+
+def _archive_after():
+    try:
+        return max(0, int(os.environ.get("HISTORY_ARCHIVE", 0))) * 60 * 60
+    except ValueError:
+        return 0
+
+
+def get_archived_history(shared_state, exclude_ids=()):
+    """
+    Return the archived history slots, newest first.
+    Slots whose id is in exclude_ids are skipped, as the package is back in JDownloader.
+    """
+    rows = shared_state.get_db(HISTORY_ARCHIVE_TABLE).retrieve_all_titles() or []
+    archived = []
+    for package_id, value in rows:
+        if package_id in exclude_ids:
+            continue
+        try:
+            data = json.loads(value)
+            archived.append((data["archived_at"], data["slot"]))
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            debug(f"Failed to parse archived package {package_id}: {e}")
+    archived.sort(key=lambda entry: entry[0], reverse=True)
+    return [slot for _, slot in archived]
+
+
+class HistoryArchiver:
+    def __init__(self, shared_state, archive_after):
+        self.shared_state = shared_state
+        self.archive_after = archive_after
+        self.first_seen = {}  # package_id -> first time reported as completed
+
+    def _due_packages(self, history):
+        now = time.time()
+        first_seen = {}
+        due = []
+        for slot in history:
+            package_id = slot.get("nzo_id")
+            if (
+                slot.get("type") != "downloader"
+                or slot.get("status") != "Completed"
+                or not slot.get("uuid")
+                or not is_quasarr_package(package_id)
+            ):
+                continue
+            first_seen[package_id] = self.first_seen.get(package_id, now)
+            if now - first_seen[package_id] >= self.archive_after:
+                due.append(slot)
+        # Packages that left the history start over if they ever return
+        self.first_seen = first_seen
+        return due
+
+    def run_once(self):
+        """
+        Archive all packages that are due. Returns the number of archived packages.
+        """
+        cache = JDPackageCache(self.shared_state.get_device())
+        packages = get_packages(self.shared_state, _cache=cache, auto_start=False)
+        # Incomplete lists would restart the period of all missing packages
+        if cache.query_failed:
+            return 0
+
+        due = self._due_packages(packages.get("history", []))
+        if not due:
+            return 0
+
+        # Stored first, a failed removal only leaves the package in both places
+        db = self.shared_state.get_db(HISTORY_ARCHIVE_TABLE)
+        archived_at = time.time()
+        for slot in due:
+            archived_slot = {**slot, "type": "archived", "uuid": None}
+            db.update_store(
+                slot["nzo_id"],
+                json.dumps({"archived_at": archived_at, "slot": archived_slot}),
+            )
+
+        package_uuids = [slot["uuid"] for slot in due]
+        link_ids = []
+        for slot in due:
+            link_ids += get_links_matching_package_uuid(
+                slot, cache.downloader_links_by_package.get(slot["uuid"], [])
+            )
+        self.shared_state.get_device().downloads.cleanup(
+            "DELETE_ALL",
+            "REMOVE_LINKS_ONLY",
+            "SELECTED",
+            link_ids,
+            package_uuids,
+        )
+
+        for slot in due:
+            self.first_seen.pop(slot["nzo_id"], None)
+            info(f"Archived finished package <y>{slot.get('name')}</y>")
+
+        # Lazy import, the snapshot module builds on get_packages() as well
+        from quasarr.downloads.packages.snapshot import invalidate_package_snapshot
+
+        invalidate_package_snapshot(self.shared_state)
+        return len(due)
+
+    def run(self):
+        info(
+            f"History archive enabled, archiving finished packages after {self.archive_after // 3600}h"
+        )
+        self.shared_state.get_db(HISTORY_ARCHIVE_TABLE).create_index()
+        while True:
+            try:
+                self.run_once()
+            except Exception as e:
+                debug(f"Failed to archive history: {e}")
+            time.sleep(CHECK_INTERVAL)
+
+
+def start_history_archiver(shared_state):
+    """
+    Start the history archiver in the current process, if enabled through HISTORY_ARCHIVE.
+    """
+    archive_after = _archive_after()
+    if not archive_after:
+        return None
+    archiver = HistoryArchiver(shared_state, archive_after)
+    thread = threading.Thread(target=archiver.run, daemon=True)
+    thread.start()
+    return archiver
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+"""
+Known Quasarr package ids in JDownloader, for cheap duplicate checks.
+
+The set is replaced whenever the full JDownloader lists were read and extended
+by every package Quasarr adds. Since packages with Quasarr ids only enter
+JDownloader through download_package(), an id missing from a recent set does not
+exist. A listed id may have been removed in JDownloader directly, so it is
+confirmed with a targeted query.
+
+Added ids are only listed by JDownloader once the linkgrabber finished crawling
+them, so a sync keeps every id added during its query or shortly before.
+"""
+
+import time
+
+from quasarr.constants import PACKAGE_ID_PATTERN
+from quasarr.providers.myjd_api import PACKAGE_COMMENTS, query_params
+
+# Older sets are not trusted for negative answers
+KNOWN_IDS_MAX_AGE = 60 * 60
+# Added ids survive syncs for this long, while the linkgrabber may still be crawling them
+REMEMBERED_GRACE = 10 * 60
+
+_KEY = "known_package_ids"
+
+
+def _is_quasarr_id(comment):
+    return bool(comment) and bool(PACKAGE_ID_PATTERN.match(str(comment)))
+
+
+def _quasarr_ids(entries):
+    return {
+        entry["comment"] for entry in entries if _is_quasarr_id(entry.get("comment"))
+    }
+
+
+def _modify(shared_state, change):
+    shared_state.lock.acquire()
+    try:
+        known = shared_state.values.get(_KEY) or {
+            "ids": set(),
+            "synced_at": 0,
+            "remembered": {},
+        }
+        shared_state.values[_KEY] = change(known)
+    finally:
+        shared_state.lock.release()
+
+
+def sync_package_ids(shared_state, package_ids, fetched_at):
+    """
+    Replace the known ids with all Quasarr ids currently in JDownloader.
+    fetched_at is the time the query of package_ids started. Ids added after it,
+    or within REMEMBERED_GRACE, are kept even if JDownloader did not list them.
+    """
+
+    def change(known):
+        keep_after = min(fetched_at, time.time() - REMEMBERED_GRACE)
+        remembered = {
+            package_id: added_at
+            for package_id, added_at in known["remembered"].items()
+            if added_at >= keep_after
+        }
+        return {
+            "ids": set(package_ids) | set(remembered),
+            "synced_at": fetched_at,
+            "remembered": remembered,
+        }
+
+    _modify(shared_state, change)
+
+
+def remember_package_id(shared_state, package_id):
+    _modify(
+        shared_state,
+        lambda known: {
+            **known,
+            "ids": known["ids"] | {package_id},
+            "remembered": {**known["remembered"], package_id: time.time()},
+        },
+    )
+
+
+def forget_package_id(shared_state, package_id):
+    _modify(
+        shared_state,
+        lambda known: {
+            **known,
+            "ids": known["ids"] - {package_id},
+            "remembered": {
+                key: added_at
+                for key, added_at in known["remembered"].items()
+                if key != package_id
+            },
+        },
+    )
+
+
+def is_known_package_id(shared_state, package_id):
+    """
+    Returns False if package_id is certainly not in JDownloader, None if that has to be confirmed.
+    """
+    known = shared_state.values.get(_KEY)
+    if not known or time.time() - known["synced_at"] > KNOWN_IDS_MAX_AGE:
+        return None
+    if package_id in known["ids"]:
+        return None
+    return False
+
+
+def query_package_ids(device):
+    """
+    Read the Quasarr ids of all JDownloader packages, querying nothing but comments.
+    Links are only queried for lists with packages that carry no Quasarr id themselves.
+    Raises ValueError if a query failed.
+    """
+    package_ids = set()
+    for endpoint, name in (
+        (device.linkgrabber, "linkgrabber"),
+        (device.downloads, "downloader"),
+    ):
+        packages = endpoint.query_packages(
+            query_params(f"{name}_packages", PACKAGE_COMMENTS)
+        )
+        if not isinstance(packages, list):
+            raise ValueError(f"Querying {name} packages failed")
+        package_ids |= _quasarr_ids(packages)
+
+        if not all(_is_quasarr_id(p.get("comment")) for p in packages):
+            links = endpoint.query_links(
+                query_params(f"{name}_links", PACKAGE_COMMENTS)
+            )
+            if not isinstance(links, list):
+                raise ValueError(f"Querying {name} links failed")
+            package_ids |= _quasarr_ids(links)
+    return package_ids
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+"""
+Opt-in package snapshots, so SABnzbd queue/history polls are answered without
+rebuilding everything from My.JDownloader.
+
+The JDownloader process refreshes the package lists in the background, every
+few seconds while packages are queued and less often when idle. The lists are
+published to the shared state as one compact JSON blob, which is only rewritten
+when they changed, together with a small header holding the generation and the
+time of the last refresh. Readers only use a snapshot younger than
+PACKAGE_SNAPSHOT seconds and fall back to a live get_packages() otherwise.
+"""
+
+import json
+import os
+import threading
+import time
+
+from quasarr.downloads.packages import get_packages
+from quasarr.providers.jd_cache import JDPackageCache
+from quasarr.providers.log import debug, info
+
+# Refresh interval while packages are queued or the linkgrabber is collecting
+ACTIVE_INTERVAL = 3
+# Granularity in which the service checks for invalidations while waiting
+WAKE_INTERVAL = 1
+
+
+def _max_age():
+    try:
+        return max(0, int(os.environ.get("PACKAGE_SNAPSHOT", 0)))
+    except ValueError:
+        return 0
+
+
+def _is_active(packages):
+    if packages.get("linkgrabber", {}).get("is_collecting"):
+        return True
+    return any(item.get("type") != "protected" for item in packages.get("queue", []))
+
+
+def invalidate_package_snapshot(shared_state):
+    """
+    Drop the current snapshot after JDownloader or the package databases were changed,
+    and ask the service to refresh right away.
+    """
+    if not _max_age():
+        return
+    shared_state.update("package_snapshot", None)
+    shared_state.update("package_snapshot_data", None)
+    shared_state.update("package_snapshot_requested", time.time())
+
+
+def get_packages_from_snapshot(shared_state):
+    """
+    Return the packages of the latest snapshot, if it is recent enough, else build them live.
+    While snapshots are enabled, auto-start is left to the background service.
+    """
+    max_age = _max_age()
+    if max_age:
+        snapshot = shared_state.values.get("package_snapshot")
+        if snapshot and time.time() - snapshot["created_at"] <= max_age:
+            data = shared_state.values.get("package_snapshot_data")
+            # The blob is written before its header, so it is never older than the header
+            if data and data[0] >= snapshot["generation"]:
+                return json.loads(data[1])
+        return get_packages(shared_state, auto_start=False)
+    return get_packages(shared_state)
+
+
+class PackageSnapshotService:
+    def __init__(self, shared_state, max_age):
+        self.shared_state = shared_state
+        self.max_age = max_age
+        # A refresh may take a while, so idle snapshots are renewed well within max_age
+        self.idle_interval = max(ACTIVE_INTERVAL, max_age // 2)
+        self.generation = 0
+        self.blob = None
+
+    def refresh(self):
+        started = time.time()
+        cache = JDPackageCache(self.shared_state.get_device())
+        packages = get_packages(self.shared_state, _cache=cache)
+        # Lists that could not be read would be served as empty
+        if cache.query_failed:
+            debug("Package snapshot not refreshed, querying JDownloader failed")
+            return packages
+        # Packages changed while this refresh ran, so its result may already be outdated
+        if self.shared_state.values.get("package_snapshot_requested", 0) > started:
+            return packages
+        blob = json.dumps(packages, separators=(",", ":")).encode("utf-8")
+        # Unchanged lists only renew the header, the blob stays in place
+        if blob != self.blob or not self.shared_state.values.get(
+            "package_snapshot_data"
+        ):
+            self.generation += 1
+            self.blob = blob
+            self.shared_state.update("package_snapshot_data", (self.generation, blob))
+        self.shared_state.update(
+            "package_snapshot",
+            {"generation": self.generation, "created_at": started},
+        )
+        return packages
+
+    def _wait(self, interval, started):
+        deadline = started + interval
+        while time.time() < deadline:
+            time.sleep(WAKE_INTERVAL)
+            requested = self.shared_state.values.get("package_snapshot_requested", 0)
+            if requested > started:
+                return
+
+    def run(self):
+        info(f"Package snapshots enabled, serving lists up to {self.max_age}s old")
+        while True:
+            started = time.time()
+            try:
+                packages = self.refresh()
+                active = _is_active(packages)
+            except Exception as e:
+                debug(f"Failed to refresh package snapshot: {e}")
+                active = False
+            self._wait(ACTIVE_INTERVAL if active else self.idle_interval, started)
+
+
+def start_package_snapshot_service(shared_state):
+    """
+    Start the snapshot service in the current process, if enabled through PACKAGE_SNAPSHOT.
+    """
+    max_age = _max_age()
+    if not max_age:
+        return None
+    service = PackageSnapshotService(shared_state, max_age)
+    thread = threading.Thread(target=service.run, daemon=True)
+    thread.start()
+    return service
@@ -3,7 +3,6 @@
 # Project by https://github.com/rix1337
 
 import re
-import uuid
 from urllib.parse import urlencode, urljoin, urlparse, urlunparse
 
 import requests
@@ -11,10 +10,11 @@ from bs4 import BeautifulSoup
 
 from quasarr.downloads.sources.helpers.abstract_source import AbstractDownloadSource
 from quasarr.providers.cloudflare import (
-    flaresolverr_create_session,
-    flaresolverr_destroy_session,
+    apply_cf_clearance,
+    cf_clearance_store,
     flaresolverr_get,
     flaresolverr_post,
+    flaresolverr_session_pool,
     is_cloudflare_challenge,
 )
 from quasarr.providers.log import debug, info, warn
@@ -231,12 +231,16 @@ def _strategy_standard(url, headers):
     debug(f"Attempting Standard Strategy (No FlareSolverr) for {url}")
     session = requests.Session()
     clean_url = _remove_fragment(url)
+    # A clearance solved by FlareSolverr earlier lets plain requests pass Cloudflare
+    headers, _, clearance = apply_cf_clearance(clean_url, headers, session)
 
     try:
         # 1. GET
         r = session.get(clean_url, headers=headers, timeout=10)
         if r.status_code == 403 or is_cloudflare_challenge(r.text):
             debug("Standard GET hit Cloudflare/403.")
+            if clearance:
+                cf_clearance_store.reject(clean_url, clearance)
             return None
         r.raise_for_status()
 
@@ -274,6 +278,8 @@ def _strategy_standard(url, headers):
 
         if r_post.status_code == 403 or is_cloudflare_challenge(r_post.text):
             debug("Standard POST hit Cloudflare/403.")
+            if clearance:
+                cf_clearance_store.reject(clean_url, clearance)
             return None
         r_post.raise_for_status()
 
@@ -302,12 +308,14 @@ def _strategy_flaresolverr_loop(shared_state, url):
         return {"links": [], "imdb_id": None}
 
     debug("Starting FlareSolverr Strategy (Robust Loop)...")
-    session_id = str(uuid.uuid4())
+    session_id = flaresolverr_session_pool.acquire(shared_state, url)
 
-    if not flaresolverr_create_session(shared_state, session_id):
+    if not session_id:
         info("Could not create FlareSolverr session.")
         return {"links": [], "imdb_id": None}
 
+    healthy = True
+
     try:
         clean_url = _remove_fragment(url)
 
@@ -370,8 +378,10 @@ def _strategy_flaresolverr_loop(shared_state, url):
 
     except Exception as e:
         warn(f"FlareSolverr Error: {e}")
+        healthy = False
         return {"links": [], "imdb_id": None}
 
     finally:
-        debug(f"Destroying FlareSolverr session: {session_id}")
-        flaresolverr_destroy_session(shared_state, session_id)
+        flaresolverr_session_pool.release(
+            shared_state, url, session_id, healthy=healthy
+        )
@@ -3,11 +3,27 @@
 # Project by https://github.com/rix1337
 
 import re
+import threading
 from urllib.parse import unquote, urlparse
 
 import requests
 from bs4 import BeautifulSoup
 
+_session = None
+_session_lock = threading.Lock()
+
+
+def _get_session():
+    """
+    Return the keep-alive session shared by all mirror checks.
+    The releases API request follows the series page request on the same connection.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+        return _session
+
 
 def _normalize_mirror_name(mirror_name):
     normalized = str(mirror_name).lower().strip()
@@ -42,12 +58,16 @@ def _normalize_release_name(release_name):
     return normalized.strip(".")
 
 
-def _fetch_release_hosters(url, user_agent, release_title):
+def _resolve_release_api_url(url, user_agent):
+    """
+    Resolve a series page URL to the releases API URL of its media.
+    Returns None if the page does not expose a media id.
+    """
     parsed = urlparse(url)
     base_url = f"{parsed.scheme}://{parsed.netloc}"
     headers = {"User-Agent": user_agent}
 
-    page_response = requests.get(url, headers=headers, timeout=15)
+    page_response = _get_session().get(url, headers=headers, timeout=15)
     page_response.raise_for_status()
     soup = BeautifulSoup(page_response.text, "html.parser")
 
@@ -59,15 +79,22 @@ def _fetch_release_hosters(url, user_agent, release_title):
     if not media_id:
         return None
 
+    return f"{base_url}/api/media/{media_id}/releases"
+
+
+def _fetch_release_hosters(url, user_agent, release_title):
+    headers = {"User-Agent": user_agent}
+
+    # The releases API is addressed by the media id, which only the series page exposes
+    api_url = _resolve_release_api_url(url, user_agent)
+    if not api_url:
+        return None
+
     target_release = _normalize_release_name(release_title)
     if not target_release:
         return None
 
-    api_response = requests.get(
-        f"{base_url}/api/media/{media_id}/releases",
-        headers=headers,
-        timeout=15,
-    )
+    api_response = _get_session().get(api_url, headers=headers, timeout=15)
     api_response.raise_for_status()
     release_map = api_response.json()
 
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from quasarr.providers.log import debug
+
+
+def is_dead_link(url):
+    return bool(url) and "/404.html" in url
+
+
+class RedirectResolver:
+    """
+    Resolves mirror/redirect URLs of download sources with bounded concurrency.
+
+    Resolved URLs are cached by source URL. Links that end up on a 404 page are
+    cached as dead for a shorter period, so repeated grabs of the same release
+    neither re-resolve working mirrors nor retry dead ones.
+    Failed resolutions (None) are never cached.
+    Concurrent resolutions of the same URL are coalesced into one.
+    """
+
+    def __init__(self, max_workers=8, ttl=6 * 60 * 60, dead_ttl=30 * 60):
+        self.max_workers = max_workers
+        self.ttl = ttl
+        self.dead_ttl = dead_ttl
+        self.last_cleaned = time.time()
+        self.cache = {}
+        self.in_flight = {}
+        self.lock = threading.Lock()
+
+    def clean(self, now):
+        if now - self.last_cleaned < 60:
+            return
+        keys_to_delete = [k for k, (_, exp) in self.cache.items() if now >= exp]
+        for k in keys_to_delete:
+            del self.cache[k]
+        self.last_cleaned = now
+
+    def get(self, url):
+        """
+        Returns a tuple (cached, resolved_url), where resolved_url is None for dead links.
+        """
+        with self.lock:
+            resolved, exp = self.cache.get(url, (None, 0))
+        if time.time() >= exp:
+            return False, None
+        return True, (None if is_dead_link(resolved) else resolved)
+
+    def set(self, url, resolved):
+        now = time.time()
+        ttl = self.dead_ttl if is_dead_link(resolved) else self.ttl
+        with self.lock:
+            self.cache[url] = (resolved, now + ttl)
+            self.clean(now)
+
+    def resolve(self, url, resolve_func):
+        """
+        Resolve a single URL through resolve_func(url), using the cache.
+        Returns the resolved URL, or None if the link is dead or could not be resolved.
+        """
+        cached, resolved = self.get(url)
+        if cached:
+            debug(f"Using cached resolution for {url}")
+            return resolved
+
+        with self.lock:
+            flight = self.in_flight.get(url)
+            leader = flight is None
+            if leader:
+                flight = {"event": threading.Event(), "result": None}
+                self.in_flight[url] = flight
+
+        if not leader:
+            debug(f"Waiting for concurrent resolution of {url}")
+            flight["event"].wait()
+            return flight["result"]
+
+        try:
+            resolved = resolve_func(url) or None
+            if resolved:
+                self.set(url, resolved)
+                if is_dead_link(resolved):
+                    debug(f"Link {url} is dead ({resolved})")
+                    resolved = None
+            flight["result"] = resolved
+            return resolved
+        finally:
+            with self.lock:
+                self.in_flight.pop(url, None)
+            flight["event"].set()
+
+    def resolve_all(self, urls, resolve_func):
+        """
+        Resolve several URLs concurrently.
+        Returns the resolved URLs (or None) in the order of the given urls.
+        """
+        unique_urls = list(dict.fromkeys(urls))
+        if not unique_urls:
+            return []
+
+        workers = min(self.max_workers, len(unique_urls))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            resolved = dict(
+                zip(
+                    unique_urls,
+                    executor.map(lambda u: self.resolve(u, resolve_func), unique_urls),
+                    strict=True,
+                )
+            )
+        return [resolved[url] for url in urls]
+
+
+redirect_resolver = RedirectResolver()
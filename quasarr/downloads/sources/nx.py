@@ -10,7 +10,10 @@ import requests
 from quasarr.downloads.sources.helpers.abstract_source import AbstractDownloadSource
 from quasarr.providers.hostname_issues import mark_hostname_issue
 from quasarr.providers.log import info
-from quasarr.providers.sessions.nx import retrieve_and_validate_session
+from quasarr.providers.sessions.nx import (
+    invalidate_session,
+    retrieve_and_validate_session,
+)
 
 
 class Source(AbstractDownloadSource):
@@ -61,7 +64,7 @@ class Source(AbstractDownloadSource):
             error_msg = payload.get("err") or payload.get("error")
             info(f"Error decrypting {title!r} URL: {url!r} - {error_msg}")
             mark_hostname_issue(Source.initials, "download", "Download error")
-            shared_state.values["database"]("sessions").delete("nx")
+            invalidate_session(shared_state)
             return {"links": []}
 
         try:
@@ -83,7 +86,7 @@ class Source(AbstractDownloadSource):
             pass
 
         info("Something went wrong decrypting " + str(title) + " URL: " + str(url))
-        shared_state.values["database"]("sessions").delete("nx")
+        invalidate_session(shared_state)
         return {"links": []}
 
 
@@ -9,6 +9,10 @@ import requests
 from bs4 import BeautifulSoup
 
 from quasarr.downloads.sources.helpers.abstract_source import AbstractDownloadSource
+from quasarr.downloads.sources.helpers.redirect_resolver import (
+    is_dead_link,
+    redirect_resolver,
+)
 from quasarr.providers.hostname_issues import mark_hostname_issue
 from quasarr.providers.log import debug, info
 
@@ -25,7 +29,9 @@ class Source(AbstractDownloadSource):
 
         # Handle external redirect URLs
         if url.startswith(f"https://{sf}/external"):
-            resolved_url = _resolve_sf_redirect(url, user_agent)
+            resolved_url = redirect_resolver.resolve(
+                url, lambda u: _resolve_sf_redirect(u, user_agent)
+            )
             if not resolved_url:
                 return {"links": [], "imdb_id": None}
             return {"links": [[resolved_url, "filecrypt"]], "imdb_id": None}
@@ -157,7 +163,10 @@ class Source(AbstractDownloadSource):
                             release_url = next(iter(mirrors_dict["season"].values()))
 
                         if release_url:
-                            real_url = _resolve_sf_redirect(release_url, user_agent)
+                            real_url = redirect_resolver.resolve(
+                                release_url,
+                                lambda u: _resolve_sf_redirect(u, user_agent),
+                            )
                             if real_url:
                                 # Use the mirror name if we have it, otherwise use "filecrypt"
                                 # We don't know exactly which mirror was picked if we just took the first one
@@ -259,7 +268,7 @@ def _is_last_section_integer(url):
 
 
 def _resolve_sf_redirect(url, user_agent):
-    """Follow redirects and return final URL or None if 404."""
+    """Follow redirects and return final URL (a 404 page URL for dead links) or None."""
     try:
         r = requests.get(
             url, allow_redirects=True, timeout=10, headers={"User-Agent": user_agent}
@@ -268,9 +277,8 @@ def _resolve_sf_redirect(url, user_agent):
         if r.history:
             for resp in r.history:
                 debug(f"Redirected from {resp.url} to {r.url}")
-            if "/404.html" in r.url:
+            if is_dead_link(r.url):
                 info(f"Link redirected to 404 page: {r.url}")
-                return None
             return r.url
         else:
             info(
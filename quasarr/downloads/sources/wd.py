@@ -3,17 +3,18 @@
 # Project by https://github.com/rix1337
 
 import re
-import uuid
 from urllib.parse import urljoin
 
 import requests
 from bs4 import BeautifulSoup
 
 from quasarr.downloads.sources.helpers.abstract_source import AbstractDownloadSource
+from quasarr.downloads.sources.helpers.redirect_resolver import redirect_resolver
 from quasarr.providers.cloudflare import (
-    flaresolverr_create_session,
-    flaresolverr_destroy_session,
-    flaresolverr_get,
+    apply_cf_clearance,
+    cf_clearance_store,
+    flaresolverr_session_pool,
+    flaresolverr_solve_get,
     is_cloudflare_challenge,
 )
 from quasarr.providers.hostname_issues import mark_hostname_issue
@@ -37,9 +38,12 @@ class Source(AbstractDownloadSource):
 
         try:
             headers = {"User-Agent": shared_state.values["user_agent"]}
-            r = requests.get(url, headers=headers, timeout=10)
+            headers, cookies, clearance = apply_cf_clearance(url, headers)
+            r = requests.get(url, headers=headers, cookies=cookies, timeout=10)
             # Don't raise for status yet, check for 403/challenge
             if r.status_code == 403 or is_cloudflare_challenge(r.text):
+                if clearance:
+                    cf_clearance_store.reject(url, clearance)
                 raise requests.RequestException("Cloudflare protection detected")
             r.raise_for_status()
             text = r.text
@@ -48,36 +52,34 @@ class Source(AbstractDownloadSource):
             # If blocked or failed, try FlareSolverr
             if is_flaresolverr_available(shared_state):
                 debug("Encountered Cloudflare on download. Trying FlareSolverr...")
-                # Create a temporary FlareSolverr session for this download attempt
-                session_id = str(uuid.uuid4())
-                created_session = flaresolverr_create_session(shared_state, session_id)
-                if not created_session:
+                # Lease a warm FlareSolverr session for this download attempt
+                session_id = flaresolverr_session_pool.acquire(shared_state, url)
+                if not session_id:
                     info(
                         "Could not create FlareSolverr session. Proceeding without session..."
                     )
-                    session_id = None
-                else:
-                    debug(f"Created FlareSolverr session: {session_id}")
 
                 try:
-                    r = flaresolverr_get(shared_state, url, session_id=session_id)
-                    if r.status_code == 403 or is_cloudflare_challenge(r.text):
-                        info(
-                            "Could not bypass Cloudflare protection with FlareSolverr!"
-                        )
-                        mark_hostname_issue(
-                            Source.initials, "download", "Cloudflare challenge failed"
-                        )
-                        if session_id:
-                            flaresolverr_destroy_session(shared_state, session_id)
-                        return {"links": [], "imdb_id": None}
-                    text = r.text
-                    status_code = r.status_code
-                except RuntimeError as fs_err:
+                    r = flaresolverr_solve_get(shared_state, url, session_id=session_id)
+                except Exception as fs_err:
+                    # Any failure must return the leased session, or the pool runs dry
                     info(f"Access failed via FlareSolverr: {fs_err}")
-                    if session_id:
-                        flaresolverr_destroy_session(shared_state, session_id)
+                    flaresolverr_session_pool.release(
+                        shared_state, url, session_id, healthy=False
+                    )
+                    return {"links": [], "imdb_id": None}
+
+                if r.status_code == 403 or is_cloudflare_challenge(r.text):
+                    flaresolverr_session_pool.release(
+                        shared_state, url, session_id, healthy=False
+                    )
+                    info("Could not bypass Cloudflare protection with FlareSolverr!")
+                    mark_hostname_issue(
+                        Source.initials, "download", "Cloudflare challenge failed"
+                    )
                     return {"links": [], "imdb_id": None}
+                text = r.text
+                status_code = r.status_code
             else:
                 info(
                     f"Site has been updated or is protected. "
@@ -124,37 +126,45 @@ class Source(AbstractDownloadSource):
 
             results = []
             try:
+                candidates = []
                 for a in link_tags:
                     raw_href = a["href"]
                     full_link = urljoin(f"https://{wd}", raw_href)
 
-                    # resolve any redirects using the same session (or requests if no session)
-                    resolved = _resolve_wd_redirect(
-                        shared_state, full_link, session_id=session_id
-                    )
+                    # determine hoster
+                    hoster = a.get_text(strip=True) or None
+                    if not hoster:
+                        for cls in a.get("class", []):
+                            if cls.startswith("background-"):
+                                hoster = cls.split("-", 1)[1]
+                                break
+
+                    if mirrors and not any(
+                        m.lower() in hoster.lower() for m in mirrors
+                    ):
+                        debug(
+                            f'Skipping link from "{hoster}" (not in desired mirrors "{mirrors}")!'
+                        )
+                        continue
 
-                    if resolved:
-                        if resolved.endswith("/404.html"):
-                            info(f"Link {resolved} is dead!")
-                            continue
-
-                        # determine hoster
-                        hoster = a.get_text(strip=True) or None
-                        if not hoster:
-                            for cls in a.get("class", []):
-                                if cls.startswith("background-"):
-                                    hoster = cls.split("-", 1)[1]
-                                    break
-
-                        if mirrors and not any(
-                            m.lower() in hoster.lower() for m in mirrors
-                        ):
-                            debug(
-                                f'Skipping link from "{hoster}" (not in desired mirrors "{mirrors}")!'
-                            )
-                            continue
+                    candidates.append((full_link, hoster))
+
+                # Resolve all redirects concurrently with plain requests,
+                # only links that get challenged fall back to the FlareSolverr session
+                resolved_links = redirect_resolver.resolve_all(
+                    [link for link, _ in candidates],
+                    lambda link: _resolve_wd_redirect(
+                        shared_state, link, session_id=session_id
+                    ),
+                )
 
+                for (full_link, hoster), resolved in zip(
+                    candidates, resolved_links, strict=True
+                ):
+                    if resolved:
                         results.append([resolved, hoster])
+                    else:
+                        info(f"Link {full_link} is dead or could not be resolved!")
             except Exception as e:
                 info(
                     "Site has been updated. "
@@ -173,59 +183,58 @@ class Source(AbstractDownloadSource):
             )
             return {"links": [], "imdb_id": None}
         finally:
-            # Always destroy the session if we created one
-            if session_id:
-                debug(f"Destroying FlareSolverr session: {session_id}")
-                flaresolverr_destroy_session(shared_state, session_id)
+            # Always return the leased session to the pool
+            flaresolverr_session_pool.release(shared_state, url, session_id)
 
 
 def _resolve_wd_redirect(shared_state, url, session_id=None):
     """
     Follow redirects for a WD mirror URL and return the final destination.
+    Links are resolved with plain requests and the stored Cloudflare clearance,
+    only challenged links go through FlareSolverr (in session_id, if given).
+    Dead links are returned as their 404 page URL, so they can be cached as dead.
     """
-    # Try FlareSolverr first if available and session_id is provided
-    if session_id and is_flaresolverr_available(shared_state):
-        try:
-            r = flaresolverr_get(shared_state, url, session_id=session_id)
-            if r.status_code == 200:
-                if r.url.endswith("/404.html"):
-                    return None
-                return r.url
-            else:
-                info(f"Blocked attempt to resolve {url}. Status: {r.status_code}")
-        except Exception as e:
-            info(f"FlareSolverr error fetching redirected URL for {url}: {e}")
-            # Fallback to requests if FlareSolverr fails?
-            # For now, let's assume if FS is configured we should rely on it or fail.
-            # But the user asked to reconsider "without cloudflare".
-
-    # Fallback to regular requests if FlareSolverr not used or failed/not configured
     try:
-        user_agent = shared_state.values["user_agent"]
+        headers, cookies, clearance = apply_cf_clearance(
+            url, {"User-Agent": shared_state.values["user_agent"]}
+        )
         r = requests.get(
             url,
             allow_redirects=True,
             timeout=10,
-            headers={"User-Agent": user_agent},
+            headers=headers,
+            cookies=cookies,
         )
-        r.raise_for_status()
-        if r.history:
-            for resp in r.history:
-                debug(f"Redirected from {resp.url} to {r.url}")
-            return r.url
-        else:
-            # If no history, maybe it wasn't a redirect or it blocked us?
-            # WD usually redirects. If we get 200 OK but same URL, it might be a block page or direct link?
-            # The original code assumed if no history -> blocked.
-            # But if it's a direct link, history is empty.
-            # Keep the original behavior: no redirect history is treated as blocked.
-            info(
-                f"Blocked attempt to resolve {url}. "
-                "Your IP may be banned. Try again later."
-            )
+        challenged = r.status_code == 403 or is_cloudflare_challenge(r.text)
+        if not challenged:
+            r.raise_for_status()
     except Exception as e:
         info(f"Error fetching redirected URL for {url}: {e}")
-        mark_hostname_issue(
-            Source.initials, "download", str(e) if "e" in dir() else "Download error"
-        )
+        mark_hostname_issue(Source.initials, "download", str(e))
+        return None
+
+    if challenged:
+        if clearance:
+            cf_clearance_store.reject(url, clearance)
+        if not is_flaresolverr_available(shared_state):
+            info(f"Cloudflare blocked resolving {url}. FlareSolverr is not configured.")
+            return None
+        # Solves are serialized per domain, links waiting for one reuse its clearance
+        try:
+            r = flaresolverr_solve_get(shared_state, url, session_id=session_id)
+        except Exception as e:
+            info(f"FlareSolverr error fetching redirected URL for {url}: {e}")
+            return None
+        if r.status_code == 200 and not is_cloudflare_challenge(r.text):
+            return r.url
+        info(f"Blocked attempt to resolve {url}. Status: {r.status_code}")
+        return None
+
+    if r.history:
+        for resp in r.history:
+            debug(f"Redirected from {resp.url} to {r.url}")
+        return r.url
+
+    # WD mirrors always redirect, a page without redirect is a block page
+    info(f"Blocked attempt to resolve {url}. Your IP may be banned. Try again later.")
     return None
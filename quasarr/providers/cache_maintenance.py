@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+"""
+Background refresh of the XEM and IMDb metadata caches.
+
+Entries that were looked up recently are fetched again shortly before they
+expire, so searches never pay for an inline refetch at the TTL boundary.
+Entries nobody asked for within the hot window are evicted instead.
+The number of refreshes is capped per hour (CACHE_REFRESH_BUDGET).
+"""
+
+import os
+import threading
+import time
+from collections import deque
+
+from quasarr.providers.imdb_metadata import imdb_metadata_cache, refresh_imdb_metadata
+from quasarr.providers.log import debug, info, trace
+from quasarr.providers.xem_metadata import (
+    evict_cold_season_names,
+    expiring_season_names,
+    refresh_season_names,
+    xem_name_index,
+)
+from quasarr.storage.imdb_database import imdb_database
+
+# Entries expiring within this window are refreshed
+REFRESH_AHEAD = 60 * 60
+# Entries looked up within this window are hot, all others are evicted
+HOT_WINDOW = 24 * 60 * 60
+CHECK_INTERVAL = 5 * 60
+SWEEP_INTERVAL = 24 * 60 * 60
+DEFAULT_REFRESH_BUDGET = 60
+
+
+def _refresh_budget():
+    try:
+        return max(
+            0, int(os.environ.get("CACHE_REFRESH_BUDGET", DEFAULT_REFRESH_BUDGET))
+        )
+    except ValueError:
+        return DEFAULT_REFRESH_BUDGET
+
+
+class CacheMaintenance:
+    def __init__(self, budget=None):
+        self.budget = _refresh_budget() if budget is None else budget
+        self.refreshes = deque()  # timestamps of refreshes within the last hour
+        self.last_sweep = 0
+
+    def _take_budget(self):
+        now = time.time()
+        while self.refreshes and self.refreshes[0] <= now - 60 * 60:
+            self.refreshes.popleft()
+        if len(self.refreshes) >= self.budget:
+            return False
+        self.refreshes.append(now)
+        return True
+
+    def run_once(self):
+        """
+        Refresh hot entries close to expiry and evict cold ones.
+        Returns the number of refreshed entries.
+        """
+        refreshed = 0
+        now = time.time()
+
+        # allNames serves every XEM lookup, so it goes first
+        if (
+            xem_name_index.last_access > now - HOT_WINDOW
+            and xem_name_index.ttl < now + REFRESH_AHEAD
+            and self._take_budget()
+        ):
+            trace("Refreshing XEM allNames ahead of expiry")
+            if xem_name_index.refresh() is not None:
+                refreshed += 1
+
+        for tvdb_id in expiring_season_names(REFRESH_AHEAD, HOT_WINDOW):
+            if not self._take_budget():
+                break
+            trace(f"Refreshing XEM season names for {tvdb_id} ahead of expiry")
+            if refresh_season_names(tvdb_id):
+                refreshed += 1
+
+        for imdb_id in imdb_metadata_cache.expiring(REFRESH_AHEAD, HOT_WINDOW):
+            if not self._take_budget():
+                break
+            trace(f"Refreshing IMDb metadata for {imdb_id} ahead of expiry")
+            if refresh_imdb_metadata(imdb_id):
+                refreshed += 1
+
+        evicted = evict_cold_season_names(HOT_WINDOW)
+        evicted += imdb_metadata_cache.evict_cold(HOT_WINDOW)
+
+        if now - self.last_sweep > SWEEP_INTERVAL:
+            imdb_database.sweep()
+            self.last_sweep = now
+
+        if refreshed or evicted:
+            debug(
+                f"Cache maintenance: {refreshed} entries refreshed, {evicted} cold entries evicted"
+            )
+        return refreshed
+
+    def run(self):
+        info(f"Cache maintenance started with {self.budget} refreshes per hour")
+        while True:
+            time.sleep(CHECK_INTERVAL)
+            try:
+                self.run_once()
+            except Exception as e:
+                debug(f"Cache maintenance failed: {e}")
+
+
+def start_cache_maintenance():
+    """
+    Start the maintenance worker in the current process, which has to be the one serving searches.
+    """
+    maintenance = CacheMaintenance()
+    if not maintenance.budget:
+        debug("Cache maintenance disabled, refresh budget is 0")
+        return None
+    thread = threading.Thread(target=maintenance.run, daemon=True)
+    thread.start()
+    return maintenance
@@ -2,7 +2,13 @@
 # Quasarr
 # Project by https://github.com/rix1337
 
+import atexit
+import os
+import threading
+import time
 import urllib.parse
+import uuid
+from contextlib import contextmanager
 
 import requests
 from bs4 import BeautifulSoup
@@ -39,6 +45,110 @@ def is_cloudflare_challenge(html: str) -> bool:
     return False
 
 
+class CloudflareClearanceStore:
+    """
+    Per-domain store of Cloudflare clearances solved by FlareSolverr.
+
+    A clearance holds the cookies of a solution (most importantly cf_clearance)
+    together with the user agent they are bound to. Sources apply a stored
+    clearance to plain requests first and only fall back to FlareSolverr once
+    it is rejected. Concurrent solves for the same domain are coalesced through
+    a per-domain lock, so parallel fetches trigger a single FlareSolverr solve.
+    """
+
+    def __init__(self, default_ttl=30 * 60):
+        self.default_ttl = default_ttl
+        self.clearances = {}
+        self.solve_locks = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def domain(url):
+        host = (urllib.parse.urlparse(url).hostname or url).lower()
+        return host[4:] if host.startswith("www.") else host
+
+    def get(self, url):
+        domain = self.domain(url)
+        with self.lock:
+            clearance = self.clearances.get(domain)
+            if clearance and time.time() >= clearance["expires_at"]:
+                del self.clearances[domain]
+                clearance = None
+        return clearance
+
+    def put(self, url, cookies, user_agent):
+        """
+        Store the clearance from a FlareSolverr solution's cookie list.
+        Returns the stored clearance, or None if the solution holds no cf_clearance cookie.
+        """
+        clearance_cookie = next(
+            (ck for ck in cookies or [] if ck.get("name") == "cf_clearance"), None
+        )
+        if not clearance_cookie or not user_agent:
+            return None
+
+        expires = clearance_cookie.get("expires") or clearance_cookie.get("expiry")
+        if not expires or expires <= time.time():
+            expires = time.time() + self.default_ttl
+
+        clearance = {
+            "cookies": [
+                {
+                    "name": ck.get("name"),
+                    "value": ck.get("value"),
+                    "domain": ck.get("domain"),
+                    "path": ck.get("path", "/"),
+                }
+                for ck in cookies
+            ],
+            "user_agent": user_agent,
+            "expires_at": expires,
+        }
+        with self.lock:
+            self.clearances[self.domain(url)] = clearance
+        return clearance
+
+    def reject(self, url, clearance):
+        """
+        Drop a clearance that was rejected, unless it was already replaced by a newer one.
+        """
+        domain = self.domain(url)
+        with self.lock:
+            if self.clearances.get(domain) is clearance:
+                del self.clearances[domain]
+
+    def solve_lock(self, url):
+        domain = self.domain(url)
+        with self.lock:
+            return self.solve_locks.setdefault(domain, threading.Lock())
+
+
+cf_clearance_store = CloudflareClearanceStore()
+
+
+def apply_cf_clearance(url, headers, session=None):
+    """
+    Look up the stored Cloudflare clearance for the domain of url.
+    Returns (headers, cookies, clearance): headers carry the user agent the clearance is bound to,
+    cookies is a name/value dict for plain requests. If a session is given, the cookies are set on it.
+    """
+    clearance = cf_clearance_store.get(url)
+    if not clearance:
+        return headers, None, None
+
+    cookies = {}
+    for ck in clearance["cookies"]:
+        cookies[ck["name"]] = ck["value"]
+        if session is not None:
+            session.cookies.set(
+                ck["name"], ck["value"], domain=ck["domain"], path=ck["path"]
+            )
+
+    headers = dict(headers or {})
+    headers["User-Agent"] = clearance["user_agent"]
+    return headers, cookies, clearance
+
+
 def update_session_via_flaresolverr(
     info, shared_state, sess, target_url: str, timeout: int = 60
 ):
@@ -85,6 +195,9 @@ def update_session_via_flaresolverr(
         )
 
     solution = fs_json["solution"]
+    cf_clearance_store.put(
+        target_url, solution.get("cookies", []), solution.get("userAgent")
+    )
 
     # Replace our requests.Session cookies with whatever FlareSolverr solved
     sess.cookies.clear()
@@ -101,8 +214,11 @@ def update_session_via_flaresolverr(
 def ensure_session_cf_bypassed(info, shared_state, session, url, headers):
     """
     Performs a GET and, if Cloudflare challenge or 403 is present, tries FlareSolverr.
+    A stored clearance for the domain is applied first; FlareSolverr is only asked
+    once it is missing or rejected, and at most once at a time per domain.
     Returns tuple: (session, headers, response) or (None, None, None) on failure.
     """
+    headers, _, clearance = apply_cf_clearance(url, headers, session)
     try:
         resp = session.get(url, headers=headers, timeout=30)
     except requests.RequestException as e:
@@ -111,6 +227,10 @@ def ensure_session_cf_bypassed(info, shared_state, session, url, headers):
 
     # If page is protected, try FlareSolverr
     if resp.status_code == 403 or is_cloudflare_challenge(resp.text):
+        if clearance:
+            debug("Stored Cloudflare clearance was rejected.")
+            cf_clearance_store.reject(url, clearance)
+
         # Check if FlareSolverr is available before attempting bypass
         if not is_flaresolverr_available(shared_state):
             info(
@@ -119,23 +239,32 @@ def ensure_session_cf_bypassed(info, shared_state, session, url, headers):
             )
             return None, None, None
 
-        debug(
-            "Encountered Cloudflare protection. Solving challenge with FlareSolverr..."
-        )
-        flaresolverr_result = update_session_via_flaresolverr(
-            info, shared_state, session, url
-        )
-        if not flaresolverr_result:
-            info("FlareSolverr did not return a result.")
-            return None, None, None
-
-        # update session and possibly user-agent
-        session = flaresolverr_result.get("session", session)
-        user_agent = flaresolverr_result.get("user_agent")
-        if user_agent and user_agent != shared_state.values.get("user_agent"):
-            info("Updating User-Agent from FlareSolverr solution: " + user_agent)
-            shared_state.update("user_agent", user_agent)
-            headers = {"User-Agent": shared_state.values["user_agent"]}
+        with cf_clearance_store.solve_lock(url):
+            # Another thread may have solved the challenge while we were waiting
+            solved_clearance = cf_clearance_store.get(url)
+            if solved_clearance and solved_clearance is not clearance:
+                debug("Reusing Cloudflare clearance solved by a concurrent request.")
+                headers, _, clearance = apply_cf_clearance(url, headers, session)
+            else:
+                debug(
+                    "Encountered Cloudflare protection. Solving challenge with FlareSolverr..."
+                )
+                flaresolverr_result = update_session_via_flaresolverr(
+                    info, shared_state, session, url
+                )
+                if not flaresolverr_result:
+                    info("FlareSolverr did not return a result.")
+                    return None, None, None
+
+                # update session and possibly user-agent
+                session = flaresolverr_result.get("session", session)
+                user_agent = flaresolverr_result.get("user_agent")
+                if user_agent and user_agent != shared_state.values.get("user_agent"):
+                    info(
+                        "Updating User-Agent from FlareSolverr solution: " + user_agent
+                    )
+                    shared_state.update("user_agent", user_agent)
+                    headers = {"User-Agent": shared_state.values["user_agent"]}
 
         # re-fetch using the new session/headers
         try:
@@ -171,27 +300,14 @@ class FlareSolverrResponse:
             raise requests.HTTPError(f"{self.status_code} Error at {self.url}")
 
 
-def flaresolverr_get(shared_state, url, timeout=30, session_id=None):
+def _flaresolverr_request(shared_state, payload, timeout):
     """
-    Core function for performing a GET request via FlareSolverr only.
-    Used internally by FlareSolverrSession.get()
-
-    Returns None if FlareSolverr is not available.
+    Send a request.get/request.post command to FlareSolverr and wrap its solution.
     """
-    # Check if FlareSolverr is available
-    if not is_flaresolverr_available(shared_state):
-        raise RuntimeError(
-            "FlareSolverr is not configured. Please configure it in the web UI."
-        )
-
     flaresolverr_url = shared_state.values["config"]("FlareSolverr").get("url")
     if not flaresolverr_url:
         raise RuntimeError("FlareSolverr URL not configured in shared_state.")
 
-    payload = {"cmd": "request.get", "url": url, "maxTimeout": timeout * 1000}
-    if session_id:
-        payload["session"] = session_id
-
     try:
         resp = requests.post(
             flaresolverr_url,
@@ -211,7 +327,7 @@ def flaresolverr_get(shared_state, url, timeout=30, session_id=None):
     solution = data.get("solution", {})
     html = solution.get("response", "")
     status_code = solution.get("status", 200)
-    url = solution.get("url", url)
+    url = solution.get("url", payload["url"])
 
     # headers → convert list-of-keyvals to dict
     fs_headers = {h["name"]: h["value"] for h in solution.get("headers", [])}
@@ -221,26 +337,93 @@ def flaresolverr_get(shared_state, url, timeout=30, session_id=None):
     if user_agent and user_agent != shared_state.values.get("user_agent"):
         shared_state.update("user_agent", user_agent)
 
+    # Keep the clearance, so following plain requests to this domain can skip FlareSolverr
+    cf_clearance_store.put(url, solution.get("cookies", []), user_agent)
+
     return FlareSolverrResponse(
         url=url, status_code=status_code, headers=fs_headers, text=html
     )
 
 
+def _flaresolverr_request_with_session(shared_state, payload, timeout, session_id):
+    """
+    Run a FlareSolverr command in the given session, or lease a pooled session
+    for the target host, so no throwaway browser context is created.
+    """
+    if session_id:
+        payload["session"] = session_id
+        payload["session_ttl_minutes"] = flaresolverr_session_pool.session_ttl_minutes
+        return _flaresolverr_request(shared_state, payload, timeout)
+
+    with flaresolverr_session_pool.lease(shared_state, payload["url"]) as pooled_id:
+        if pooled_id:
+            payload["session"] = pooled_id
+            payload["session_ttl_minutes"] = (
+                flaresolverr_session_pool.session_ttl_minutes
+            )
+        return _flaresolverr_request(shared_state, payload, timeout)
+
+
+def flaresolverr_get(shared_state, url, timeout=30, session_id=None):
+    """
+    Core function for performing a GET request via FlareSolverr only.
+    Without a session_id, a pooled session for the target host is leased.
+
+    Raises RuntimeError if FlareSolverr is not available.
+    """
+    # Check if FlareSolverr is available
+    if not is_flaresolverr_available(shared_state):
+        raise RuntimeError(
+            "FlareSolverr is not configured. Please configure it in the web UI."
+        )
+
+    payload = {"cmd": "request.get", "url": url, "maxTimeout": timeout * 1000}
+    return _flaresolverr_request_with_session(
+        shared_state, payload, timeout, session_id
+    )
+
+
+def flaresolverr_solve_get(shared_state, url, timeout=30, session_id=None):
+    """
+    GET a Cloudflare protected url through FlareSolverr, solving at most once at a time per domain.
+    A clearance solved by a concurrent request while waiting is tried with a plain request first,
+    so parallel fetches of one domain share a single solve.
+
+    Raises RuntimeError if FlareSolverr is not available.
+    """
+    with cf_clearance_store.solve_lock(url):
+        headers, cookies, clearance = apply_cf_clearance(
+            url, {"User-Agent": shared_state.values["user_agent"]}
+        )
+        if clearance:
+            try:
+                r = requests.get(url, headers=headers, cookies=cookies, timeout=timeout)
+                if r.status_code != 403 and not is_cloudflare_challenge(r.text):
+                    debug(
+                        "Reusing Cloudflare clearance solved by a concurrent request."
+                    )
+                    return r
+            except requests.RequestException:
+                pass
+            cf_clearance_store.reject(url, clearance)
+
+        return flaresolverr_get(
+            shared_state, url, timeout=timeout, session_id=session_id
+        )
+
+
 def flaresolverr_post(
     shared_state, url, data=None, headers=None, timeout=30, session_id=None
 ):
     """
     Core function for performing a POST request via FlareSolverr only.
+    Without a session_id, a pooled session for the target host is leased.
     """
     if not is_flaresolverr_available(shared_state):
         raise RuntimeError(
             "FlareSolverr is not configured. Please configure it in the web UI."
         )
 
-    flaresolverr_url = shared_state.values["config"]("FlareSolverr").get("url")
-    if not flaresolverr_url:
-        raise RuntimeError("FlareSolverr URL not configured in shared_state.")
-
     if isinstance(data, dict):
         post_data = urllib.parse.urlencode(data)
     else:
@@ -252,41 +435,12 @@ def flaresolverr_post(
         "postData": post_data,
         "maxTimeout": timeout * 1000,
     }
-    if session_id:
-        payload["session"] = session_id
 
     if headers:
         payload["headers"] = headers
 
-    try:
-        resp = requests.post(
-            flaresolverr_url,
-            json=payload,
-            headers={"Content-Type": "application/json"},
-            timeout=timeout + 10,
-        )
-        resp.raise_for_status()
-    except Exception as e:
-        raise RuntimeError(f"Error communicating with FlareSolverr: {e}") from e
-
-    data = resp.json()
-
-    if data.get("status") != "ok":
-        raise RuntimeError(f"FlareSolverr returned error: {data.get('message')}")
-
-    solution = data.get("solution", {})
-    html = solution.get("response", "")
-    status_code = solution.get("status", 200)
-    url = solution.get("url", url)
-
-    fs_headers = {h["name"]: h["value"] for h in solution.get("headers", [])}
-
-    user_agent = solution.get("userAgent")
-    if user_agent and user_agent != shared_state.values.get("user_agent"):
-        shared_state.update("user_agent", user_agent)
-
-    return FlareSolverrResponse(
-        url=url, status_code=status_code, headers=fs_headers, text=html
+    return _flaresolverr_request_with_session(
+        shared_state, payload, timeout, session_id
     )
 
 
@@ -331,3 +485,184 @@ def flaresolverr_destroy_session(shared_state, session_id):
         )
     except Exception:
         pass
+
+
+def flaresolverr_list_sessions(shared_state):
+    """
+    Returns the set of session ids known to FlareSolverr, or None if it could not be queried.
+    """
+    if not is_flaresolverr_available(shared_state):
+        return None
+
+    flaresolverr_url = shared_state.values["config"]("FlareSolverr").get("url")
+    payload = {"cmd": "sessions.list"}
+
+    try:
+        resp = requests.post(
+            flaresolverr_url,
+            json=payload,
+            headers={"Content-Type": "application/json"},
+            timeout=10,
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        if data.get("status") == "ok":
+            return set(data.get("sessions", []))
+    except Exception:
+        pass
+    return None
+
+
+class FlareSolverrSessionPool:
+    """
+    Pool of FlareSolverr sessions per target host.
+
+    Creating a FlareSolverr session starts a headless browser, which is by far the
+    slowest part of a FlareSolverr request. Sessions are therefore leased to one
+    caller at a time and returned to the pool afterwards, keeping their browser and
+    Cloudflare clearance warm for the next request to the same host.
+    Idle sessions expire after idle_timeout and are health-checked against
+    FlareSolverr's session list before reuse once they were idle for a while.
+
+    Expired sessions are destroyed by a reaper thread, and all pooled sessions
+    when the process exits. FlareSolverr only honours session_ttl_minutes on
+    request.get/request.post, so every request sends it and FlareSolverr replaces
+    sessions that outlived a crashed Quasarr on their next use.
+    """
+
+    def __init__(
+        self,
+        max_idle_per_host=2,
+        idle_timeout=10 * 60,
+        check_after=60,
+        session_ttl_minutes=30,
+        reap_interval=60,
+    ):
+        self.max_idle_per_host = max_idle_per_host
+        self.idle_timeout = idle_timeout
+        self.check_after = check_after
+        self.session_ttl_minutes = session_ttl_minutes
+        self.reap_interval = reap_interval
+        self.idle = {}  # host -> list of (session_id, last_used)
+        self.lock = threading.Lock()
+        self.sessions_created = 0
+        self.shared_state = None
+        self.pid = None
+        self.closed = False
+
+    @staticmethod
+    def _host(url):
+        return urllib.parse.urlparse(url).netloc.lower() or url
+
+    def _expire_idle(self, shared_state, now):
+        expired = []
+        with self.lock:
+            for host, sessions in self.idle.items():
+                keep = []
+                for session_id, last_used in sessions:
+                    if now - last_used >= self.idle_timeout:
+                        expired.append(session_id)
+                    else:
+                        keep.append((session_id, last_used))
+                self.idle[host] = keep
+        for session_id in expired:
+            debug(f"Destroying idle FlareSolverr session: {session_id}")
+            flaresolverr_destroy_session(shared_state, session_id)
+
+    def _reap(self):
+        while True:
+            time.sleep(self.reap_interval)
+            try:
+                self._expire_idle(self.shared_state, time.time())
+            except Exception as e:
+                debug(f"Failed to destroy idle FlareSolverr sessions: {e}")
+
+    def _start(self, shared_state):
+        """
+        Start the reaper and exit handler once per process.
+        """
+        with self.lock:
+            self.shared_state = shared_state
+            if self.pid == os.getpid():
+                return
+            # Sessions inherited from the parent process are still leased by it
+            self.idle = {}
+            self.pid = os.getpid()
+        threading.Thread(target=self._reap, daemon=True).start()
+        atexit.register(self.close)
+
+    def close(self):
+        """
+        Destroy all idle sessions. Sessions leased at this point are destroyed on release.
+        """
+        with self.lock:
+            self.closed = True
+            sessions = [
+                session_id
+                for host_sessions in self.idle.values()
+                for session_id, _ in host_sessions
+            ]
+            self.idle = {}
+        for session_id in sessions:
+            debug(f"Destroying FlareSolverr session on exit: {session_id}")
+            flaresolverr_destroy_session(self.shared_state, session_id)
+
+    def acquire(self, shared_state, url):
+        """
+        Lease a session for the host of url, creating one if none is idle.
+        Returns the session id, or None if no session could be created.
+        """
+        self._start(shared_state)
+        now = time.time()
+        self._expire_idle(shared_state, now)
+
+        host = self._host(url)
+        while True:
+            with self.lock:
+                sessions = self.idle.get(host)
+                session_id, last_used = sessions.pop() if sessions else (None, 0)
+            if not session_id:
+                break
+            if now - last_used < self.check_after:
+                return session_id
+            known_sessions = flaresolverr_list_sessions(shared_state)
+            if known_sessions is None or session_id in known_sessions:
+                return session_id
+            debug(f"Discarding stale FlareSolverr session: {session_id}")
+
+        session_id = flaresolverr_create_session(shared_state, str(uuid.uuid4()))
+        if session_id:
+            with self.lock:
+                self.sessions_created += 1
+            debug(f"Created FlareSolverr session for {host}: {session_id}")
+        return session_id
+
+    def release(self, shared_state, url, session_id, healthy=True):
+        """
+        Return a leased session to the pool, or destroy it if it failed or the pool is full.
+        """
+        if not session_id:
+            return
+
+        host = self._host(url)
+        with self.lock:
+            sessions = self.idle.setdefault(host, [])
+            if healthy and not self.closed and len(sessions) < self.max_idle_per_host:
+                sessions.append((session_id, time.time()))
+                return
+
+        debug(f"Destroying FlareSolverr session: {session_id}")
+        flaresolverr_destroy_session(shared_state, session_id)
+
+    @contextmanager
+    def lease(self, shared_state, url):
+        session_id = self.acquire(shared_state, url)
+        healthy = False
+        try:
+            yield session_id
+            healthy = True
+        finally:
+            self.release(shared_state, url, session_id, healthy=healthy)
+
+
+flaresolverr_session_pool = FlareSolverrSessionPool()
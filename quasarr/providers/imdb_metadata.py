@@ -4,6 +4,9 @@
 
 import html
 import re
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from json import dumps, loads
 from urllib.parse import quote
@@ -12,6 +15,8 @@ import requests
 from bs4 import BeautifulSoup
 
 from quasarr.providers.log import debug, info
+from quasarr.storage.imdb_database import imdb_database
+from quasarr.storage.imdb_dataset import imdb_dataset
 
 
 def _get_db(table_name):
@@ -217,6 +222,32 @@ class IMDbFlareSolverr:
 
     _WEB_URL = "https://www.imdb.com"
 
+    @staticmethod
+    def _request_with_clearance(url):
+        """
+        Plain request with a stored Cloudflare clearance for IMDb, if there is one.
+        """
+        # Lazy import to avoid circular dependency
+        from quasarr.providers.cloudflare import (
+            apply_cf_clearance,
+            cf_clearance_store,
+            is_cloudflare_challenge,
+        )
+
+        headers, cookies, clearance = apply_cf_clearance(url, None)
+        if not clearance:
+            return None
+        try:
+            response = requests.get(url, headers=headers, cookies=cookies, timeout=10)
+            if response.status_code == 200 and not is_cloudflare_challenge(
+                response.text
+            ):
+                return response.text
+        except Exception as e:
+            debug(f"Request with Cloudflare clearance failed for {url}: {e}")
+        cf_clearance_store.reject(url, clearance)
+        return None
+
     @staticmethod
     def _request(url):
         flaresolverr_url = _get_config("FlareSolverr").get("url")
@@ -225,6 +256,10 @@ class IMDbFlareSolverr:
         if not flaresolverr_url or flaresolverr_skipped:
             return None
 
+        html_content = IMDbFlareSolverr._request_with_clearance(url)
+        if html_content:
+            return html_content
+
         try:
             post_data = {
                 "cmd": "request.get",
@@ -241,7 +276,16 @@ class IMDbFlareSolverr:
             if response.status_code == 200:
                 json_response = response.json()
                 if json_response.get("status") == "ok":
-                    return json_response.get("solution", {}).get("response", "")
+                    solution = json_response.get("solution", {})
+                    # Lazy import to avoid circular dependency
+                    from quasarr.providers.cloudflare import cf_clearance_store
+
+                    cf_clearance_store.put(
+                        solution.get("url", url),
+                        solution.get("cookies", []),
+                        solution.get("userAgent"),
+                    )
+                    return solution.get("response", "")
         except Exception as e:
             debug(f"FlareSolverr request failed for {url}: {e}")
 
@@ -377,39 +421,227 @@ class IMDbFlareSolverr:
         return []
 
 
+class IMDbMetadataCache:
+    """
+    In-process LRU in front of the imdb_metadata table.
+
+    Concurrent lookups of the same IMDb id are coalesced, so all source threads
+    of one search share a single database read and, on a cold cache, a single
+    API fetch.
+    """
+
+    def __init__(self, max_size=512):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.in_flight = {}
+        self.accessed = {}  # imdb_id -> time of last lookup
+        self.lock = threading.Lock()
+        # Stats tracking
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get_stats(self):
+        """Return cache statistics string."""
+        lookups = self.hits + self.misses + self.coalesced
+        hit_rate = (self.hits + self.coalesced) / lookups * 100 if lookups else 0
+        return (
+            f"{hit_rate:.0f}% hit rate | {self.hits} hits, {self.coalesced} coalesced, "
+            f"{self.misses} misses | {len(self.entries)} entries cached"
+        )
+
+    def get(self, imdb_id):
+        """
+        Return cached metadata that has not yet reached its TTL, else None.
+        """
+        now = datetime.now().timestamp()
+        with self.lock:
+            metadata = self.entries.get(imdb_id)
+            if metadata and metadata.get("ttl", 0) > now:
+                self.entries.move_to_end(imdb_id)
+                return metadata
+        return None
+
+    def set(self, imdb_id, metadata):
+        with self.lock:
+            self.entries[imdb_id] = metadata
+            self.entries.move_to_end(imdb_id)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def load(self, imdb_id, loader):
+        """
+        Return metadata for imdb_id from the LRU, or through loader(imdb_id).
+        Callers that arrive while a load for the same id is running wait for its result.
+        """
+        with self.lock:
+            self.accessed[imdb_id] = time.time()
+
+        metadata = self.get(imdb_id)
+        if metadata:
+            with self.lock:
+                self.hits += 1
+            return metadata
+
+        with self.lock:
+            flight = self.in_flight.get(imdb_id)
+            leader = flight is None
+            if leader:
+                self.misses += 1
+                flight = {"event": threading.Event(), "result": None}
+                self.in_flight[imdb_id] = flight
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight["event"].wait()
+            return flight["result"]
+
+        try:
+            flight["result"] = loader(imdb_id)
+            if flight["result"] and flight["result"].get("ttl"):
+                self.set(imdb_id, flight["result"])
+            return flight["result"]
+        finally:
+            with self.lock:
+                self.in_flight.pop(imdb_id, None)
+            flight["event"].set()
+
+    def expiring(self, ahead, hot_window):
+        """
+        Return ids looked up within hot_window seconds whose entry expires within ahead seconds,
+        most recently used first.
+        """
+        now = time.time()
+        with self.lock:
+            hot = [
+                (last_access, imdb_id)
+                for imdb_id, last_access in self.accessed.items()
+                if last_access > now - hot_window
+                and imdb_id in self.entries
+                and self.entries[imdb_id].get("ttl", 0) < now + ahead
+            ]
+        return [imdb_id for _, imdb_id in sorted(hot, reverse=True)]
+
+    def evict_cold(self, hot_window):
+        """
+        Drop entries that were not looked up within hot_window seconds. Returns the number of evicted entries.
+        """
+        cutoff = time.time() - hot_window
+        with self.lock:
+            cold = [k for k, last in self.accessed.items() if last <= cutoff]
+            for imdb_id in cold:
+                del self.accessed[imdb_id]
+                self.entries.pop(imdb_id, None)
+        return len(cold)
+
+
+imdb_metadata_cache = IMDbMetadataCache()
+
+
+class IMDbTitleIndex:
+    """
+    Process-local index of all titles known to the metadata cache, by sanitized title.
+
+    Release titles are resolved to IMDb ids locally (cache and offline dataset)
+    only on an exact title match with the release year, so partial matches and
+    misses go to the network.
+    """
+
+    def __init__(self, refresh_interval=10 * 60):
+        self.refresh_interval = refresh_interval
+        self.built_at = 0
+        self.titles = {}  # sanitized title -> {imdb_id: year}
+        self.lock = threading.Lock()
+
+    def _add(self, titles, imdb_id, title, year):
+        from quasarr.providers.utils import sanitize_string
+
+        sanitized_title = sanitize_string(title)
+        if not sanitized_title:
+            return
+        entry = titles.setdefault(sanitized_title, {})
+        # A title stored without year must not drop the year known from the database
+        if year or imdb_id not in entry:
+            entry[imdb_id] = year
+
+    def _refresh(self):
+        if time.time() - self.built_at < self.refresh_interval:
+            return
+        titles = {}
+        try:
+            for imdb_id, title, year in imdb_database.all_titles():
+                self._add(titles, imdb_id, title, year)
+        except Exception as e:
+            debug(f"Error building IMDb title index: {e}")
+        with self.lock:
+            self.titles = titles
+            self.built_at = time.time()
+
+    def add(self, imdb_id, title, year=None):
+        with self.lock:
+            self._add(self.titles, imdb_id, title, year)
+
+    def _candidates(self, search_title):
+        with self.lock:
+            return dict(self.titles.get(search_title) or {})
+
+    def lookup(self, title, ttype_api, year=None):
+        """
+        Return the IMDb id for a cleaned release title, or None if it is unknown or ambiguous.
+        """
+        from quasarr.providers.utils import sanitize_string
+
+        search_title = sanitize_string(title)
+        # Cleaned release titles still end with the year
+        if year and search_title.endswith(f" {year}"):
+            search_title = search_title[: -len(str(year)) - 1]
+        if not search_title:
+            return None
+        self._refresh()
+
+        candidates = {}
+        dataset_types = (
+            ["tvSeries", "tvMiniSeries"]
+            if ttype_api == "TV_SERIES"
+            else ["movie", "tvMovie"]
+        )
+        for imdb_id, title_type, found_year in imdb_dataset.find_titles(search_title):
+            if title_type in dataset_types:
+                candidates[imdb_id] = found_year
+        if not candidates:
+            candidates = self._candidates(search_title)
+
+        # A title without the release year is a different title, or cannot be confirmed
+        if year:
+            candidates = {
+                imdb_id: found_year
+                for imdb_id, found_year in candidates.items()
+                if str(found_year) == str(year)
+            }
+        if len(candidates) == 1:
+            return next(iter(candidates))
+        return None
+
+
+imdb_title_index = IMDbTitleIndex()
+
+
 # =============================================================================
 # Main Functions (Chain of Responsibility)
 # =============================================================================
 
 
 def _update_cache(imdb_id, key, value, language=None):
-    db = _get_db("imdb_metadata")
+    expires = datetime.now().timestamp() + timedelta(hours=24).total_seconds()
     try:
-        cached_data = db.retrieve(imdb_id)
-        if cached_data:
-            metadata = loads(cached_data)
-        else:
-            metadata = {
-                "title": None,
-                "year": None,
-                "poster_link": None,
-                "localized": {},
-                "ttl": 0,
-            }
-
         if key == "localized" and language:
-            if "localized" not in metadata or not isinstance(
-                metadata["localized"], dict
-            ):
-                metadata["localized"] = {}
-            metadata["localized"][language] = value
+            imdb_database.update_localized_title(imdb_id, language, value, expires)
         else:
-            metadata[key] = value
-
-        now = datetime.now().timestamp()
-        metadata["ttl"] = now + timedelta(hours=24).total_seconds()
-
-        db.update_store(imdb_id, dumps(metadata))
+            imdb_database.update_fields(imdb_id, {key: value}, expires)
+        imdb_metadata_cache.set(imdb_id, imdb_database.retrieve(imdb_id))
+        if key in ("title", "localized"):
+            imdb_title_index.add(imdb_id, value)
     except Exception as e:
         debug(f"Error updating IMDb metadata cache for {imdb_id}: {e}")
 
@@ -446,6 +678,12 @@ def get_localized_title(shared_state, imdb_id, language="de"):
         if language == "en" and imdb_metadata.get("title"):
             return imdb_metadata.get("title")
 
+    title = imdb_dataset.get_localized_title(imdb_id, language)
+    if title:
+        sanitized_title = TitleCleaner.sanitize(title)
+        _update_cache(imdb_id, "localized", sanitized_title, language)
+        return sanitized_title
+
     user_agent = shared_state.values["user_agent"]
 
     if language == "en":
@@ -473,20 +711,56 @@ def get_localized_title(shared_state, imdb_id, language="de"):
 
 
 def get_imdb_metadata(imdb_id):
-    db = _get_db("imdb_metadata")
+    return imdb_metadata_cache.load(imdb_id, _load_imdb_metadata)
+
+
+def _store_metadata(imdb_id, imdb_metadata):
+    try:
+        # Only fields that were found are written, others keep their own expiry
+        imdb_database.update_fields(
+            imdb_id,
+            {
+                key: imdb_metadata[key]
+                for key in ("title", "year", "poster_link")
+                if imdb_metadata[key]
+            },
+            imdb_metadata["ttl"],
+        )
+        for language, title in imdb_metadata["localized"].items():
+            imdb_database.update_localized_title(
+                imdb_id, language, title, imdb_metadata["ttl"]
+            )
+            imdb_title_index.add(imdb_id, title, imdb_metadata["year"])
+        if imdb_metadata["title"]:
+            imdb_title_index.add(imdb_id, imdb_metadata["title"], imdb_metadata["year"])
+        return imdb_database.retrieve(imdb_id) or imdb_metadata
+    except Exception as e:
+        debug(f"Error storing IMDb metadata for {imdb_id}: {e}")
+    return imdb_metadata
+
+
+def refresh_imdb_metadata(imdb_id):
+    """
+    Fetch metadata for imdb_id ahead of its expiry, ignoring the cached record.
+    Returns True if fresh metadata was stored.
+    """
+    metadata = _load_imdb_metadata(imdb_id, refresh=True)
+    if metadata and metadata.get("ttl", 0) > datetime.now().timestamp():
+        imdb_metadata_cache.set(imdb_id, metadata)
+        return True
+    return False
+
+
+def _load_imdb_metadata(imdb_id, refresh=False):
     now = datetime.now().timestamp()
-    cached_metadata = None
 
     # 0. Check Cache
     try:
-        cached_data = db.retrieve(imdb_id)
-        if cached_data:
-            cached_metadata = loads(cached_data)
-            if cached_metadata.get("ttl") and cached_metadata["ttl"] > now:
-                return cached_metadata
+        cached_metadata = imdb_database.retrieve(imdb_id)
+        if not refresh and cached_metadata and cached_metadata["ttl"] > now:
+            return cached_metadata
     except Exception as e:
         debug(f"Error retrieving IMDb metadata from DB for {imdb_id}: {e}")
-        cached_metadata = None
 
     imdb_metadata = {
         "title": None,
@@ -496,7 +770,18 @@ def get_imdb_metadata(imdb_id):
         "ttl": 0,
     }
 
-    # 1. Try API
+    # 1. Try offline dataset
+    dataset_title = imdb_dataset.get_title(imdb_id)
+    if dataset_title:
+        imdb_metadata["title"] = TitleCleaner.sanitize(dataset_title[0])
+        imdb_metadata["year"] = dataset_title[1]
+        imdb_metadata["ttl"] = now + timedelta(days=7).total_seconds()
+        localized = imdb_dataset.get_localized_title(imdb_id, "de")
+        if localized:
+            imdb_metadata["localized"]["de"] = TitleCleaner.sanitize(localized)
+        return _store_metadata(imdb_id, imdb_metadata)
+
+    # 2. Try API
     response_json = IMDbAPI.get_title(imdb_id)
 
     if response_json:
@@ -524,14 +809,17 @@ def get_imdb_metadata(imdb_id):
                     )
                     break
 
-        db.update_store(imdb_id, dumps(imdb_metadata))
-        return imdb_metadata
+        return _store_metadata(imdb_id, imdb_metadata)
 
     # API Failed. If we have stale cache, return it.
-    if cached_metadata:
-        return cached_metadata
+    try:
+        stale_metadata = imdb_database.retrieve(imdb_id, include_expired=True)
+        if stale_metadata:
+            return stale_metadata
+    except Exception as e:
+        debug(f"Error retrieving IMDb metadata from DB for {imdb_id}: {e}")
 
-    # 2. Fallback: Try CDN for basic info (English title, Year, Poster)
+    # 3. Fallback: Try CDN for basic info (English title, Year, Poster)
     # We can't get localized titles from CDN, but we can get the rest.
     # We need a user agent, but this function doesn't receive shared_state.
     # We'll skip CDN fallback here to avoid circular deps or complexity,
@@ -551,6 +839,9 @@ def get_imdb_id_from_title(shared_state, title, language="de"):
         ttype_api = "MOVIE"
         ttype_web = "ft"
 
+    year_match = re.search(r"[.\s(]((?:19|20)\d{2})(?:[.\s)]|$)", title)
+    year = year_match.group(1) if year_match else None
+
     title = TitleCleaner.clean(title)
 
     # 0. Check Search Cache
@@ -568,14 +859,20 @@ def get_imdb_id_from_title(shared_state, title, language="de"):
 
     user_agent = shared_state.values["user_agent"]
 
-    # 1. Try API
-    search_results = IMDbAPI.search_titles(title)
-    if search_results:
-        imdb_id = _match_result(
-            shared_state, title, search_results, ttype_api, is_api=True
-        )
+    # 1. Try local title index
+    imdb_id = imdb_title_index.lookup(title, ttype_api, year)
+    if imdb_id:
+        debug(f"Resolved {title} to {imdb_id} from local title index")
+
+    # 2. Try API
+    if not imdb_id:
+        search_results = IMDbAPI.search_titles(title)
+        if search_results:
+            imdb_id = _match_result(
+                shared_state, title, search_results, ttype_api, is_api=True
+            )
 
-    # 2. Try CDN (Fallback)
+    # 3. Try CDN (Fallback)
     if not imdb_id:
         search_results = IMDbCDN.search_titles(title, ttype_web, language, user_agent)
         if search_results:
@@ -583,7 +880,7 @@ def get_imdb_id_from_title(shared_state, title, language="de"):
                 shared_state, title, search_results, ttype_api, is_api=False
             )
 
-    # 3. Try FlareSolverr (Last Resort)
+    # 4. Try FlareSolverr (Last Resort)
     if not imdb_id:
         search_results = IMDbFlareSolverr.search_titles(title, ttype_web)
         if search_results:
@@ -2,14 +2,73 @@
 # Quasarr
 # Project by https://github.com/rix1337
 
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
 from quasarr.constants import ARCHIVE_EXTENSIONS
 from quasarr.providers.log import trace
 from quasarr.providers.myjd_api import (
+    ARCHIVE_DETECTION,
+    AUTO_START,
+    HISTORY_VIEW,
+    QUEUE_VIEW,
     MYJDException,
     RequestTimeoutException,
     TokenExpiredException,
+    query_params,
 )
 
+# Everything get_packages() reads from the lists
+PACKAGE_LIST_PROFILES = (QUEUE_VIEW, HISTORY_VIEW, ARCHIVE_DETECTION, AUTO_START)
+
+
+def index_links_by_package(links):
+    """Group links by their packageUUID, so per-package lookups don't scan all links."""
+    links_by_package = defaultdict(list)
+    for link in links or []:
+        links_by_package[link.get("packageUUID")].append(link)
+    return dict(links_by_package)
+
+
+class ArchiveClassificationCache:
+    """
+    Remembers across requests whether a downloader package is an archive.
+
+    Entries are keyed by package UUID and only valid while the package's
+    fingerprint (link count, finished state) is unchanged. Only results of a
+    successful getArchiveInfo call are stored, so the conservative fallback of
+    a failed call is repeated until the API answers.
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(package):
+        return package.get("childCount"), bool(package.get("finished"))
+
+    def get(self, package):
+        with self.lock:
+            entry = self.entries.get(package.get("uuid"))
+        if entry and entry[0] == self.fingerprint(package):
+            return entry[1]
+        return None
+
+    def put(self, package, is_archive):
+        with self.lock:
+            self.entries[package.get("uuid")] = (self.fingerprint(package), is_archive)
+
+    def prune(self, package_uuids):
+        """Forget packages that are no longer in the downloader list."""
+        with self.lock:
+            for package_uuid in set(self.entries) - set(package_uuids):
+                del self.entries[package_uuid]
+
+
+archive_classification_cache = ArchiveClassificationCache()
+
 
 class JDPackageCache:
     """
@@ -22,20 +81,39 @@ class JDPackageCache:
 
     This reduces redundant API calls within a single operation where the same
     data (e.g., linkgrabber_links) is needed multiple times.
+
+    Lists are queried with only the fields of the given projection profiles
+    (see myjd_api.query_params), which keeps payloads of large lists small.
     """
 
-    def __init__(self, device):
+    def __init__(self, device, profiles=PACKAGE_LIST_PROFILES):
         trace("Initializing new cache instance")
         self._device = device
+        self._profiles = profiles
         self._linkgrabber_packages = None
         self._linkgrabber_links = None
         self._downloader_packages = None
         self._downloader_links = None
+        self._linkgrabber_links_by_package = None
+        self._downloader_links_by_package = None
         self._archive_cache = {}  # package_uuid -> bool (is_archive)
+        self._bulk_archive_result = None  # (package_uuids, confirmed, api_succeeded)
         self._is_collecting = None
+        # Set if any list could not be read, so its contents are incomplete
+        self.query_failed = False
         # Stats tracking
         self._api_calls = 0
         self._cache_hits = 0
+        self._stats_lock = threading.Lock()
+
+    def _count_api_call(self):
+        # prefetch() runs the queries from several threads
+        with self._stats_lock:
+            self._api_calls += 1
+
+    def _count_cache_hit(self):
+        with self._stats_lock:
+            self._cache_hits += 1
 
     def get_stats(self):
         """Return cache statistics string."""
@@ -47,21 +125,56 @@ class JDPackageCache:
         )
         return f"{self._api_calls} API calls | {pkg_count} packages, {link_count} links cached"
 
+    def prefetch(self):
+        """
+        Fetch all lists get_packages() needs concurrently, so they cost one round trip instead of one each.
+
+        The bulk archive detection depends on the downloader packages and is chained
+        right behind them, overlapping with the remaining queries.
+        """
+        trace("Prefetching linkgrabber and downloader lists")
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            futures = [
+                executor.submit(getattr, self, name)
+                for name in (
+                    "linkgrabber_packages",
+                    "linkgrabber_links",
+                    "downloader_links",
+                    "is_collecting",
+                )
+            ]
+            futures.append(executor.submit(self._prefetch_archives))
+            for future in futures:
+                future.result()
+
+    def _prefetch_archives(self):
+        package_uuids = {
+            p.get("uuid")
+            for p in self.downloader_packages
+            if p.get("uuid") and archive_classification_cache.get(p) is None
+        }
+        if package_uuids:
+            confirmed, api_succeeded = self._bulk_detect_archives(package_uuids)
+            self._bulk_archive_result = (package_uuids, confirmed, api_succeeded)
+
     @property
     def linkgrabber_packages(self):
         if self._linkgrabber_packages is None:
             trace("Fetching linkgrabber_packages from API")
-            self._api_calls += 1
+            self._count_api_call()
             try:
-                self._linkgrabber_packages = self._device.linkgrabber.query_packages()
+                self._linkgrabber_packages = self._device.linkgrabber.query_packages(
+                    query_params("linkgrabber_packages", *self._profiles)
+                )
                 trace(
                     f"Retrieved {len(self._linkgrabber_packages)} linkgrabber packages"
                 )
             except (TokenExpiredException, RequestTimeoutException, MYJDException) as e:
                 trace(f"Failed to fetch linkgrabber_packages: {e}")
+                self.query_failed = True
                 self._linkgrabber_packages = []
         else:
-            self._cache_hits += 1
+            self._count_cache_hit()
             trace(
                 f"Using cached linkgrabber_packages ({len(self._linkgrabber_packages)} packages)"
             )
@@ -71,15 +184,18 @@ class JDPackageCache:
     def linkgrabber_links(self):
         if self._linkgrabber_links is None:
             trace("Fetching linkgrabber_links from API")
-            self._api_calls += 1
+            self._count_api_call()
             try:
-                self._linkgrabber_links = self._device.linkgrabber.query_links()
+                self._linkgrabber_links = self._device.linkgrabber.query_links(
+                    query_params("linkgrabber_links", *self._profiles)
+                )
                 trace(f"Retrieved {len(self._linkgrabber_links)} linkgrabber links")
             except (TokenExpiredException, RequestTimeoutException, MYJDException) as e:
                 trace(f"Failed to fetch linkgrabber_links: {e}")
+                self.query_failed = True
                 self._linkgrabber_links = []
         else:
-            self._cache_hits += 1
+            self._count_cache_hit()
             trace(
                 f"Using cached linkgrabber_links ({len(self._linkgrabber_links)} links)"
             )
@@ -89,15 +205,18 @@ class JDPackageCache:
     def downloader_packages(self):
         if self._downloader_packages is None:
             trace("Fetching downloader_packages from API")
-            self._api_calls += 1
+            self._count_api_call()
             try:
-                self._downloader_packages = self._device.downloads.query_packages()
+                self._downloader_packages = self._device.downloads.query_packages(
+                    query_params("downloader_packages", *self._profiles)
+                )
                 trace(f"Retrieved {len(self._downloader_packages)} downloader packages")
             except (TokenExpiredException, RequestTimeoutException, MYJDException) as e:
                 trace(f"Failed to fetch downloader_packages: {e}")
+                self.query_failed = True
                 self._downloader_packages = []
         else:
-            self._cache_hits += 1
+            self._count_cache_hit()
             trace(
                 f"Using cached downloader_packages ({len(self._downloader_packages)} packages)"
             )
@@ -107,25 +226,51 @@ class JDPackageCache:
     def downloader_links(self):
         if self._downloader_links is None:
             trace("Fetching downloader_links from API")
-            self._api_calls += 1
+            self._count_api_call()
             try:
-                self._downloader_links = self._device.downloads.query_links()
+                self._downloader_links = self._device.downloads.query_links(
+                    query_params("downloader_links", *self._profiles)
+                )
                 trace(f"Retrieved {len(self._downloader_links)} downloader links")
             except (TokenExpiredException, RequestTimeoutException, MYJDException) as e:
                 trace(f"Failed to fetch downloader_links: {e}")
+                self.query_failed = True
                 self._downloader_links = []
         else:
-            self._cache_hits += 1
+            self._count_cache_hit()
             trace(
                 f"Using cached downloader_links ({len(self._downloader_links)} links)"
             )
         return self._downloader_links
 
+    @property
+    def linkgrabber_links_by_package(self):
+        if self._linkgrabber_links_by_package is None:
+            self._linkgrabber_links_by_package = index_links_by_package(
+                self.linkgrabber_links
+            )
+        return self._linkgrabber_links_by_package
+
+    @property
+    def downloader_links_by_package(self):
+        if self._downloader_links_by_package is None:
+            self._downloader_links_by_package = index_links_by_package(
+                self.downloader_links
+            )
+        return self._downloader_links_by_package
+
+    def _links_by_package(self, links):
+        if links is self._downloader_links:
+            return self.downloader_links_by_package
+        if links is self._linkgrabber_links:
+            return self.linkgrabber_links_by_package
+        return index_links_by_package(links)
+
     @property
     def is_collecting(self):
         if self._is_collecting is None:
             trace("Checking is_collecting from API")
-            self._api_calls += 1
+            self._count_api_call()
             try:
                 self._is_collecting = self._device.linkgrabber.is_collecting()
                 trace(f"is_collecting = {self._is_collecting}")
@@ -133,15 +278,13 @@ class JDPackageCache:
                 trace(f"Failed to check is_collecting: {e}")
                 self._is_collecting = False
         else:
-            self._cache_hits += 1
+            self._count_cache_hit()
             trace(f"Using cached is_collecting = {self._is_collecting}")
         return self._is_collecting
 
     def _has_archive_extension(self, package_uuid, links):
         """Check if any link in the package has an archive file extension."""
-        for link in links:
-            if link.get("packageUUID") != package_uuid:
-                continue
+        for link in self._links_by_package(links).get(package_uuid, []):
             name = link.get("name", "")
             name_lower = name.lower()
             for ext in ARCHIVE_EXTENSIONS:
@@ -171,7 +314,7 @@ class JDPackageCache:
         trace(f"Bulk archive detection for {len(package_list)} packages")
 
         try:
-            self._api_calls += 1
+            self._count_api_call()
             archive_infos = self._device.extraction.get_archive_info([], package_list)
             trace(
                 f"get_archive_info returned {len(archive_infos) if archive_infos else 0} results"
@@ -207,8 +350,9 @@ class JDPackageCache:
         """
         Detect archives for all packages efficiently.
 
-        Uses ONE bulk API call, then applies safety fallbacks for packages
-        where detection was uncertain.
+        Packages classified in an earlier request are taken from the
+        archive_classification_cache. All others are checked with ONE bulk API
+        call, then safety fallbacks are applied where detection was uncertain.
 
         Args:
             packages: List of downloader packages
@@ -224,16 +368,38 @@ class JDPackageCache:
         all_package_uuids = {p.get("uuid") for p in packages if p.get("uuid")}
         trace(f"detect_all_archives for {len(all_package_uuids)} packages")
 
-        # ONE bulk API call for all packages
-        confirmed_archives, api_succeeded = self._bulk_detect_archives(
-            all_package_uuids
+        archive_classification_cache.prune(all_package_uuids)
+        cached_archives = set()
+        unknown_packages = {}
+        for package in packages:
+            pkg_uuid = package.get("uuid")
+            if not pkg_uuid:
+                continue
+            cached = archive_classification_cache.get(package)
+            if cached is None:
+                unknown_packages[pkg_uuid] = package
+            elif cached:
+                cached_archives.add(pkg_uuid)
+        unknown_uuids = set(unknown_packages)
+        trace(
+            f"{len(all_package_uuids) - len(unknown_uuids)} packages classified in earlier requests"
         )
+
+        # ONE bulk API call for all unknown packages, unless prefetch() already made it
+        if self._bulk_archive_result and self._bulk_archive_result[0] == unknown_uuids:
+            _, confirmed, api_succeeded = self._bulk_archive_result
+            confirmed_archives = set(confirmed)
+            self._count_cache_hit()
+        else:
+            confirmed_archives, api_succeeded = self._bulk_detect_archives(
+                unknown_uuids
+            )
         trace(
             f"Bulk API succeeded={api_succeeded}, confirmed={len(confirmed_archives)} archives"
         )
 
         # For packages NOT confirmed as archives, apply safety fallbacks
-        unconfirmed = all_package_uuids - confirmed_archives
+        unconfirmed = unknown_uuids - confirmed_archives
         trace(f"{len(unconfirmed)} packages need fallback checking")
 
         for pkg_uuid in unconfirmed:
@@ -252,6 +418,14 @@ class JDPackageCache:
                     f"Package {pkg_uuid} confirmed as NON-archive (API worked, no extension match)"
                 )
 
+        # Only answers of a working API are final
+        if api_succeeded:
+            for pkg_uuid, package in unknown_packages.items():
+                archive_classification_cache.put(
+                    package, pkg_uuid in confirmed_archives
+                )
+        confirmed_archives |= cached_archives
+
         # Cache results for is_package_archive() lookups
         for pkg_uuid in all_package_uuids:
             self._archive_cache[pkg_uuid] = pkg_uuid in confirmed_archives
@@ -276,7 +450,7 @@ class JDPackageCache:
             return False
 
         if package_uuid in self._archive_cache:
-            self._cache_hits += 1
+            self._count_cache_hit()
             cached = self._archive_cache[package_uuid]
             trace(f"is_package_archive({package_uuid}) = {cached} (cached)")
             return cached
@@ -288,7 +462,7 @@ class JDPackageCache:
         api_failed = False
 
         try:
-            self._api_calls += 1
+            self._count_api_call()
             archive_info = self._device.extraction.get_archive_info([], [package_uuid])
             trace(f"Single get_archive_info returned: {archive_info}")
             # Original logic: is_archive = True if archive_info and archive_info[0] else False
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+"""
+Incremental package/link model of a JDownloader list.
+
+Instead of pulling the full lists for every change, the model is loaded once
+and then patched from My.JDownloader events (LINK_UPDATE.* / PACKAGE_UPDATE.*).
+Events that change the structure of the list, or that refer to unknown
+packages or links, mark the model stale, so it is loaded again in full.
+
+This module is a library only: get_packages() and the package snapshots still
+read the full lists through JDPackageCache, nothing subscribes to events yet.
+"""
+
+import threading
+
+from quasarr.providers.log import debug, trace
+from quasarr.providers.myjd_api import (
+    MYJDException,
+    RequestTimeoutException,
+    TokenExpiredException,
+)
+
+# Direct connections time out after 3 seconds, so listen() must return before that
+POLL_TIMEOUT = 2000
+# The subscription is dropped by JDownloader if it is not polled within this time
+MAX_KEEPALIVE = 60000
+
+
+class PackageModel:
+    """
+    Packages and links of one JDownloader list, keyed by uuid.
+    """
+
+    def __init__(self, publisher="downloads"):
+        self.publisher = publisher
+        self.packages = {}
+        self.links = {}
+        self.stale = True
+        self.lock = threading.Lock()
+
+    def load(self, packages, links):
+        with self.lock:
+            self.packages = {p["uuid"]: dict(p) for p in packages if p.get("uuid")}
+            self.links = {
+                link["uuid"]: dict(link) for link in links if link.get("uuid")
+            }
+            self.stale = False
+
+    def _patch(self, entries, data, field):
+        entry = entries.get(data.get("uuid"))
+        if entry is None:
+            return False
+        patch = {key: value for key, value in data.items() if key != "uuid"}
+        # Some events only carry the new value of the field named in the event id
+        if field and field not in patch and "data" in patch:
+            patch = {field: patch["data"]}
+        entry.update(patch)
+        return True
+
+    def apply(self, events):
+        """
+        Patch the model from a list of events. Returns the number of applied events.
+        """
+        applied = 0
+        with self.lock:
+            for event in events or []:
+                if event.get("publisher") != self.publisher:
+                    continue
+                kind, _, field = str(event.get("eventid", "")).partition(".")
+                data = event.get("eventData") or {}
+                if not isinstance(data, dict):
+                    data = {}
+
+                if kind == "LINK_UPDATE":
+                    patched = self._patch(self.links, data, field)
+                elif kind == "PACKAGE_UPDATE":
+                    patched = self._patch(self.packages, data, field)
+                else:
+                    # Added, removed or moved content cannot be patched reliably
+                    patched = False
+
+                if patched:
+                    applied += 1
+                else:
+                    trace(f"Event {event.get('eventid')} requires a full reload")
+                    self.stale = True
+        return applied
+
+    def snapshot(self):
+        """
+        Return copies of the current (packages, links) lists.
+        """
+        with self.lock:
+            return (
+                [dict(p) for p in self.packages.values()],
+                [dict(link) for link in self.links.values()],
+            )
+
+
+class EventSubscription:
+    """
+    Keeps a PackageModel current through an event subscription of one device.
+
+    loader is called without arguments and must return the full (packages, links)
+    lists, it is used for the initial load and whenever the model became stale.
+    """
+
+    def __init__(self, device, model, loader):
+        self.device = device
+        self.model = model
+        self.loader = loader
+        self.subscription_id = None
+
+    def _subscribe(self):
+        subscription = self.device.events.subscribe([self.model.publisher])
+        if not subscription:
+            raise MYJDException("Event subscription failed")
+        self.subscription_id = subscription["subscriptionid"]
+        self.device.events.change_timeouts(
+            self.subscription_id, POLL_TIMEOUT, MAX_KEEPALIVE
+        )
+        debug(f"Subscribed to {self.model.publisher} events")
+        # Changes before the subscription was in place are unknown
+        self.model.stale = True
+
+    def _reload(self):
+        packages, links = self.loader()
+        self.model.load(packages, links)
+
+    def poll(self):
+        """
+        Wait up to POLL_TIMEOUT for events and apply them. Returns the number of applied events.
+        """
+        try:
+            if self.subscription_id is None:
+                self._subscribe()
+            if self.model.stale:
+                self._reload()
+
+            events = self.device.events.listen(self.subscription_id)
+            if events is False:
+                # Most likely the subscription expired
+                self.subscription_id = None
+                self.model.stale = True
+                return 0
+
+            applied = self.model.apply(events)
+            if self.model.stale:
+                self._reload()
+            return applied
+        except (TokenExpiredException, RequestTimeoutException, MYJDException) as e:
+            debug(f"Polling {self.model.publisher} events failed: {e}")
+            self.subscription_id = None
+            self.model.stale = True
+            return 0
+
+    def close(self):
+        if self.subscription_id is None:
+            return
+        try:
+            self.device.events.unsubscribe(self.subscription_id)
+        except (TokenExpiredException, RequestTimeoutException, MYJDException):
+            pass
+        self.subscription_id = None
@@ -65,11 +65,15 @@ _context_replace = {
     "filecrypt": "🛡️",  # /quasarr/linkcrypters/filecrypt.py
     "hide": "👻",  # /quasarr/linkcrypters/hide.py
     "packages": "📦",  # /quasarr/api/packages/*
+    "snapshot": "📸",  # /quasarr/downloads/packages/snapshot.py
+    "history_archive": "🗃️",  # /quasarr/downloads/packages/history_archive.py
     "providers": "🔌",  # /quasarr/providers/*
     "html_templates": "🎨",  # /quasarr/providers/html_templates.py
     "imdb_metadata": "🎬",  # /quasarr/providers/imdb_metadata.py
     "xem_metadata": "📚",  # /quasarr/providers/xem_metadata.py
+    "cache_maintenance": "♻️",  # /quasarr/providers/cache_maintenance.py
     "jd_cache": "📇",  # /quasarr/providers/jd_cache.py
+    "jd_events": "📡",  # /quasarr/providers/jd_events.py
     "log": "📝",  # /quasarr/providers/log.py
     "myjd_api": "🔑",  # /quasarr/providers/myjd_api.py
     "notifications": "🔔",  # /quasarr/providers/notifications.py
@@ -80,7 +84,10 @@ _context_replace = {
     "categories": "🔠",  # /quasarr/storage/categories.py
     "setup": "🛠️",  # /quasarr/storage/setup.py
     "sqlite_database": "🗃️",  # /quasarr/storage/sqlite_database.py
+    "imdb_database": "🎞️",  # /quasarr/storage/imdb_database.py
+    "imdb_dataset": "🗂️",  # /quasarr/storage/imdb_dataset.py
     "sources": "🧲",  # /quasarr/*/sources/*
+    "redirect_resolver": "↪️",  # /quasarr/downloads/sources/helpers/redirect_resolver.py
     "utils": "🧰",  # /quasarr/providers/utils.py
 }
 
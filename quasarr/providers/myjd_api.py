@@ -31,12 +31,15 @@ import base64
 import hashlib
 import hmac
 import json
+import os
+import threading
 import time
 from urllib.parse import quote
 
 import requests
 import urllib3
 from Cryptodome.Cipher import AES
+from requests.adapters import HTTPAdapter
 
 from quasarr.providers.log import debug, info
 from quasarr.providers.version import get_version
@@ -44,6 +47,108 @@ from quasarr.providers.version import get_version
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 _BS = 16
 
+# Concurrent API calls per endpoint that can each keep a connection alive
+_POOL_MAXSIZE = 10
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+_sessions_pid = None
+
+_request_id_lock = threading.Lock()
+_last_request_id = 0
+# Guards the order of direct connections when device actions run concurrently
+_direct_connection_lock = threading.Lock()
+
+
+# Field projections for queryPackages/queryLinks, listing what each use actually reads.
+# name, uuid and packageUUID are always returned, every other field only on request.
+QUEUE_VIEW = {
+    "linkgrabber_packages": ("bytesTotal", "comment", "saveTo"),
+    "linkgrabber_links": ("availability", "comment", "status", "url"),
+    "downloader_packages": ("bytesLoaded", "bytesTotal", "comment", "eta", "saveTo"),
+    "downloader_links": (
+        "comment",
+        "eta",
+        "extractionStatus",
+        "finished",
+        "status",
+        "url",
+    ),
+}
+HISTORY_VIEW = {
+    "linkgrabber_packages": ("bytesTotal", "comment", "saveTo"),
+    "linkgrabber_links": ("availability", "comment", "status", "url"),
+    "downloader_packages": ("bytesLoaded", "bytesTotal", "comment", "saveTo"),
+    "downloader_links": (
+        "comment",
+        "extractionStatus",
+        "finished",
+        "status",
+        "url",
+    ),
+}
+ARCHIVE_DETECTION = {
+    "downloader_packages": ("childCount", "finished"),
+    "downloader_links": ("extractionStatus",),
+}
+AUTO_START = {"linkgrabber_links": ("comment",)}
+PACKAGE_IDS = {}
+PACKAGE_COMMENTS = {
+    "linkgrabber_packages": ("comment",),
+    "linkgrabber_links": ("comment",),
+    "downloader_packages": ("comment",),
+    "downloader_links": ("comment",),
+}
+
+
+def query_params(query, *profiles):
+    """
+    Build the params of a queryPackages/queryLinks call from projection profiles.
+
+    :param query: One of linkgrabber_packages, linkgrabber_links, downloader_packages, downloader_links
+    :param profiles: Profiles whose fields are combined, e.g. QUEUE_VIEW, AUTO_START
+    """
+    params = {"maxResults": -1, "startAt": 0, "uuid": True}
+    for profile in profiles:
+        params.update(dict.fromkeys(profile.get(query, ()), True))
+    return [params]
+
+
+def _next_request_id():
+    """
+    Return a unique, increasing request id, so concurrent calls can each match their own response.
+
+    Concurrent calls may reach My.JDownloader out of order. The server only echoes
+    the rid: the previous client sent a millisecond rid first, then second-based
+    rids that were lower and repeated within a second, and was accepted throughout.
+    """
+    global _last_request_id
+    with _request_id_lock:
+        _last_request_id = max(_last_request_id + 1, int(time.time() * 1000))
+        return _last_request_id
+
+
+def _get_session(api):
+    """
+    Return the keep-alive session for an API endpoint (My.JDownloader or a direct connection).
+    Sessions are kept per process and not on Myjdapi, since devices are passed between
+    processes through the shared state and would lose their connections on every copy.
+    """
+    global _sessions_pid
+    with _sessions_lock:
+        # Pooled sockets must not be shared with forked processes
+        if _sessions_pid != os.getpid():
+            _sessions.clear()
+            _sessions_pid = os.getpid()
+        session = _sessions.get(api)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=_POOL_MAXSIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[api] = session
+        return session
+
 
 class MYJDException(BaseException):
     pass
@@ -466,6 +571,58 @@ class Extraction:
         return resp
 
 
+class Events:
+    """
+    Class that represents the event subscriptions of a Device
+    """
+
+    def __init__(self, device):
+        self.device = device
+        self.url = "/events"
+
+    def subscribe(self, subscriptions, exclusions=None):
+        """
+        Subscribe to events of the given publishers, e.g. ["downloads"].
+
+        :param subscriptions: Regular expressions of the event ids to receive.
+        :type: list of strings
+        :param exclusions: Regular expressions of event ids to skip.
+        :type: list of strings
+        :return: Subscription dictionary including the "subscriptionid".
+        """
+        if exclusions is None:
+            exclusions = []
+        params = [subscriptions, exclusions]
+        resp = self.device.action(self.url + "/subscribe", params)
+        return resp
+
+    def change_timeouts(self, subscription_id, poll_timeout, max_keepalive):
+        """
+        Set how long listen() waits for events and how long the subscription survives without a listen() call.
+
+        :param poll_timeout: Milliseconds.
+        :param max_keepalive: Milliseconds.
+        """
+        params = [subscription_id, poll_timeout, max_keepalive]
+        resp = self.device.action(self.url + "/changesubscriptiontimeouts", params)
+        return resp
+
+    def listen(self, subscription_id):
+        """
+        Wait up to the poll timeout for events.
+
+        :return: List of event dictionaries with "publisher", "eventid" and "eventData".
+        """
+        params = [subscription_id]
+        resp = self.device.action(self.url + "/listen", params)
+        return resp
+
+    def unsubscribe(self, subscription_id):
+        params = [subscription_id]
+        resp = self.device.action(self.url + "/unsubscribe", params)
+        return resp
+
+
 class Jddevice:
     """
     Class that represents a JDownloader device and it's functions
@@ -485,6 +642,7 @@ class Jddevice:
         self.linkgrabber = Linkgrabber(self)
         self.downloads = Downloads(self)
         self.extraction = Extraction(self)
+        self.events = Events(self)
         self.downloadcontroller = DownloadController(self)
         self.update = Update(self)
         self.__direct_connection_info = None
@@ -604,15 +762,19 @@ class Jddevice:
                         response = None
                     if response is not None:
                         # This connection worked so we push it to the top of the list.
-                        self.__direct_connection_info.remove(conn)
-                        self.__direct_connection_info.insert(0, conn)
+                        with _direct_connection_lock:
+                            if conn in self.__direct_connection_info:
+                                self.__direct_connection_info.remove(conn)
+                                self.__direct_connection_info.insert(0, conn)
                         self.__direct_connection_consecutive_failures = 0
                         return response["data"]
                     else:
                         # We don't try to use this connection for an hour.
                         conn["cooldown"] = time.time() + 3600
-                        self.__direct_connection_info.remove(conn)
-                        self.__direct_connection_info.append(conn)
+                        with _direct_connection_lock:
+                            if conn in self.__direct_connection_info:
+                                self.__direct_connection_info.remove(conn)
+                                self.__direct_connection_info.append(conn)
             # None of the direct connections worked, we set a cooldown for direct connections
             self.__direct_connection_consecutive_failures += 1
             self.__direct_connection_cooldown = time.time() + (
@@ -768,7 +930,7 @@ class Myjdapi:
         """
         Updates Request_Id
         """
-        self.__request_id = int(time.time())
+        self.__request_id = _next_request_id()
 
     def connect(self, email, password):
         """Establish connection to api
@@ -888,6 +1050,9 @@ class Myjdapi:
         """
         if not api:
             api = self.__api_url
+        # Every call uses its own id, so concurrent calls never mix up their responses
+        request_id = _next_request_id()
+        self.__request_id = request_id
         data = None
         if not self.is_connected() and path != "/my/connect":
             raise (MYJDException("No connection established\n"))
@@ -899,7 +1064,7 @@ class Myjdapi:
                         query += [f"{param[0]}={quote(param[1])}"]
                     else:
                         query += [f"&{param[0]}={param[1]}"]
-            query += ["rid=" + str(self.__request_id)]
+            query += ["rid=" + str(request_id)]
             if self.__server_encryption_token is None:
                 query += [
                     "signature="
@@ -922,15 +1087,16 @@ class Myjdapi:
             query = query[0] + "&".join(query[1:])
 
             headers = {"User-Agent": f"Quasarr/{get_version()}"}
+            session = _get_session(api)
             try:
-                encrypted_response = requests.get(
+                encrypted_response = session.get(
                     api + query, timeout=timeout, headers=headers
                 )
             except requests.exceptions.ConnectionError:
                 return None
             except Exception:
                 try:
-                    encrypted_response = requests.get(
+                    encrypted_response = session.get(
                         api + query, timeout=timeout, headers=headers, verify=False
                     )
                     debug(
@@ -952,7 +1118,7 @@ class Myjdapi:
                 "apiVer": self.__api_version,
                 "url": path,
                 "params": params_request,
-                "rid": self.__request_id,
+                "rid": request_id,
             }
             data = json.dumps(params_request)
             # Removing quotes around null elements.
@@ -963,8 +1129,9 @@ class Myjdapi:
                 request_url = api + action + path
             else:
                 request_url = api + path
+            session = _get_session(api)
             try:
-                encrypted_response = requests.post(
+                encrypted_response = session.post(
                     request_url,
                     headers={
                         "Content-Type": "application/aesjson-jd; charset=utf-8",
@@ -977,7 +1144,7 @@ class Myjdapi:
                 return None
             except Exception:
                 try:
-                    encrypted_response = requests.post(
+                    encrypted_response = session.post(
                         request_url,
                         headers={
                             "Content-Type": "application/aesjson-jd; charset=utf-8",
@@ -1039,8 +1206,6 @@ class Myjdapi:
                 self.__device_encryption_token, encrypted_response.text
             )
         jsondata = json.loads(response.decode("utf-8"))
-        if jsondata["rid"] != self.__request_id:
-            self.update_request_id()
+        if jsondata["rid"] != request_id:
             return None
-        self.update_request_id()
         return jsondata
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+"""
+Process-local registry for the requests.Session objects of login-based sites.
+
+Live sessions are kept in memory, so hot searches and downloads reuse warm
+connection pools instead of restoring a fresh Session for every call.
+The "sessions" table only stores cookie jars and headers as compact JSON,
+and is written only when the cookies actually changed.
+"""
+
+import base64
+import json
+import pickle
+import threading
+import time
+
+import requests
+
+from quasarr.providers.log import debug
+
+
+class SessionRegistry:
+    def __init__(self):
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def get(self, hostname):
+        """
+        Returns (session, created_at) for a live and unexpired session, else (None, 0).
+        """
+        with self.lock:
+            entry = self.entries.get(hostname)
+            if not entry:
+                return None, 0
+            if entry["expires_at"] and time.time() >= entry["expires_at"]:
+                del self.entries[hostname]
+                debug(f"Session for {hostname} expired in registry")
+                return None, 0
+            return entry["session"], entry["created_at"]
+
+    def put(self, hostname, sess, created_at, max_age=None, fingerprint=None):
+        with self.lock:
+            self.entries[hostname] = {
+                "session": sess,
+                "created_at": created_at,
+                "expires_at": created_at + max_age if max_age else 0,
+                "fingerprint": fingerprint,
+            }
+
+    def swap_fingerprint(self, hostname, fingerprint):
+        """
+        Store the new cookie fingerprint and return True if it differs from the previous one.
+        Returns False if the session is not registered, e.g. after it was dropped.
+        """
+        with self.lock:
+            entry = self.entries.get(hostname)
+            if not entry:
+                return False
+            changed = entry["fingerprint"] != fingerprint
+            entry["fingerprint"] = fingerprint
+            return changed
+
+    def invalidate(self, hostname):
+        with self.lock:
+            self.entries.pop(hostname, None)
+
+
+session_registry = SessionRegistry()
+
+
+def _cookie_fingerprint(sess):
+    return tuple(sorted((ck.name, ck.value, ck.domain, ck.path) for ck in sess.cookies))
+
+
+def _serialize_session(sess, created_at):
+    return json.dumps(
+        {
+            "cookies": [list(ck) for ck in _cookie_fingerprint(sess)],
+            "user_agent": sess.headers.get("User-Agent"),
+            "created_at": created_at,
+        },
+        separators=(",", ":"),
+    )
+
+
+def _deserialize_session(stored):
+    """
+    Restore a requests.Session from the compact cookie format.
+    Legacy pickled sessions (plain base64 or AL's JSON wrapped token) are still accepted.
+    Returns (session, created_at).
+    """
+    try:
+        data = json.loads(stored)
+    except (json.JSONDecodeError, TypeError):
+        data = None
+
+    if isinstance(data, dict) and "cookies" in data:
+        sess = requests.Session()
+        for name, value, domain, path in data["cookies"]:
+            sess.cookies.set(name, value, domain=domain, path=path or "/")
+        if data.get("user_agent"):
+            sess.headers.update({"User-Agent": data["user_agent"]})
+        return sess, data.get("created_at", 0)
+
+    if isinstance(data, dict):
+        token = data.get("token")
+        created_at = data.get("created_at", 0)
+    else:
+        token = stored
+        created_at = 0
+
+    sess = pickle.loads(base64.b64decode(token.encode("utf-8")))
+    if not isinstance(sess, requests.Session):
+        raise ValueError("Retrieved object is not a valid requests.Session instance.")
+    return sess, created_at
+
+
+def register_session(shared_state, hostname, sess, max_age=None):
+    """
+    Register a freshly created session and persist its cookies.
+    """
+    created_at = time.time()
+    fingerprint = _cookie_fingerprint(sess)
+    session_registry.put(hostname, sess, created_at, max_age, fingerprint)
+    shared_state.values["database"]("sessions").update_store(
+        hostname, _serialize_session(sess, created_at)
+    )
+
+
+def get_registered_session(shared_state, hostname, max_age=None):
+    """
+    Return the live session for hostname, restoring it from the database once per process.
+    Returns None if no valid session is available, in which case a new one must be created.
+    """
+    sess, _ = session_registry.get(hostname)
+    if sess:
+        return sess
+
+    stored = shared_state.values["database"]("sessions").retrieve(hostname)
+    if not stored:
+        return None
+
+    sess, created_at = _deserialize_session(stored)
+
+    if max_age:
+        age = time.time() - created_at
+        if age > max_age:
+            debug(f"Session expired (age: {age / 3600:.1f} hours)")
+            return None
+
+    session_registry.put(hostname, sess, created_at, max_age)
+    # Rewrite legacy formats and refresh the fingerprint in one go
+    persist_session_cookies(shared_state, hostname, sess)
+    return sess
+
+
+def persist_session_cookies(shared_state, hostname, sess):
+    """
+    Persist the cookies of a registered session, but only if they changed since the last write.
+    Sessions that are not registered in this process, or were dropped meanwhile, are never written,
+    so a late write cannot bring back an invalidated session or restart its max_age.
+    """
+    if not session_registry.swap_fingerprint(hostname, _cookie_fingerprint(sess)):
+        return False
+
+    registered, created_at = session_registry.get(hostname)
+    if registered is None:
+        return False
+    shared_state.values["database"]("sessions").update_store(
+        hostname, _serialize_session(sess, created_at)
+    )
+    return True
+
+
+def drop_session(shared_state, hostname):
+    """
+    Remove a session from the registry and the database.
+    """
+    session_registry.invalidate(hostname)
+    shared_state.values["database"]("sessions").delete(hostname)
@@ -2,10 +2,7 @@
 # Quasarr
 # Project by https://github.com/rix1337
 
-import base64
 import json
-import pickle
-import time
 import urllib.parse
 
 import requests
@@ -13,8 +10,19 @@ from bs4 import BeautifulSoup
 from requests.exceptions import RequestException, Timeout
 
 from quasarr.constants import SESSION_MAX_AGE_SECONDS
+from quasarr.providers.cloudflare import (
+    apply_cf_clearance,
+    cf_clearance_store,
+    is_cloudflare_challenge,
+)
 from quasarr.providers.hostname_issues import clear_hostname_issue, mark_hostname_issue
 from quasarr.providers.log import debug, info, trace
+from quasarr.providers.sessions import (
+    drop_session,
+    get_registered_session,
+    persist_session_cookies,
+    register_session,
+)
 from quasarr.providers.utils import is_flaresolverr_available, is_site_usable
 
 
@@ -33,34 +41,19 @@ class FlareSolverrNotAvailableError(Exception):
 hostname = "al"
 
 
-def create_and_persist_session(shared_state):
-    # AL requires FlareSolverr - check availability first
-    if not is_flaresolverr_available(shared_state):
-        info(
-            "FlareSolverr is not configured, configure FlareSolverr in the web UI to use this site."
-        )
-        mark_hostname_issue(
-            hostname, "session", "FlareSolverr required but not configured"
-        )
-        return None
-
-    cfg = shared_state.values["config"]("Hostnames")
-    host = cfg.get(hostname)
-    credentials_cfg = shared_state.values["config"](hostname.upper())
-    user = credentials_cfg.get("user")
-    pw = credentials_cfg.get("password")
-
+def _prime_via_flaresolverr(shared_state, sess, site_url):
+    """
+    Solve the Cloudflare challenge of site_url and copy its cookies and user agent into sess.
+    The solution is stored, so other sources and later sessions can reuse it.
+    """
     flaresolverr_url = shared_state.values["config"]("FlareSolverr").get("url")
 
-    sess = requests.Session()
-
-    # Prime cookies via FlareSolverr
     try:
         debug("Priming session via FlareSolverr...")
         fs_headers = {"Content-Type": "application/json"}
         fs_payload = {
             "cmd": "request.get",
-            "url": f"https://www.{host}/",
+            "url": site_url,
             "maxTimeout": 60000,
         }
 
@@ -72,12 +65,12 @@ def create_and_persist_session(shared_state):
         except Timeout:
             info("FlareSolverr request timed out")
             mark_hostname_issue(hostname, "session", "FlareSolverr request timed out")
-            return None
+            return False
         except RequestException as e:
             # This covers HTTP errors and connection issues *other than* timeout
             info(f"FlareSolverr server error: {e}")
             mark_hostname_issue(hostname, "session", str(e))
-            return None
+            return False
 
         fs_json = fs_resp.json()
         # Check if FlareSolverr actually solved the challenge
@@ -86,7 +79,7 @@ def create_and_persist_session(shared_state):
             mark_hostname_issue(
                 hostname, "session", "FlareSolverr did not return a valid solution"
             )
-            return None
+            return False
 
         solution = fs_json["solution"]
         # store FlareSolverr's UA into our requests.Session
@@ -103,11 +96,44 @@ def create_and_persist_session(shared_state):
             # Set cookie on the session (ignoring expires/secure/httpOnly)
             sess.cookies.set(name, value, domain=domain, path=path)
 
+        cf_clearance_store.put(site_url, solution.get("cookies", []), fl_ua)
+        return True
+
     except Exception as e:
         debug(f"Could not prime session via FlareSolverr: {e}")
         mark_hostname_issue(hostname, "session", str(e))
+        return False
+
+
+def create_and_persist_session(shared_state):
+    # AL requires FlareSolverr - check availability first
+    if not is_flaresolverr_available(shared_state):
+        info(
+            "FlareSolverr is not configured, configure FlareSolverr in the web UI to use this site."
+        )
+        mark_hostname_issue(
+            hostname, "session", "FlareSolverr required but not configured"
+        )
         return None
 
+    cfg = shared_state.values["config"]("Hostnames")
+    host = cfg.get(hostname)
+    credentials_cfg = shared_state.values["config"](hostname.upper())
+    user = credentials_cfg.get("user")
+    pw = credentials_cfg.get("password")
+
+    sess = requests.Session()
+    site_url = f"https://www.{host}/"
+
+    # Prime cookies from a stored clearance, or via FlareSolverr once per domain at a time
+    with cf_clearance_store.solve_lock(site_url):
+        headers, _, clearance = apply_cf_clearance(site_url, None, sess)
+        if clearance:
+            debug("Priming session from stored Cloudflare clearance...")
+            sess.headers.update(headers)
+        elif not _prime_via_flaresolverr(shared_state, sess, site_url):
+            return None
+
     if user and pw:
         data = {"identity": user, "password": pw, "remember": "1"}
         encoded_data = urllib.parse.urlencode(data)
@@ -121,6 +147,10 @@ def create_and_persist_session(shared_state):
             timeout=30,
         )
 
+        if clearance and (r.status_code == 403 or is_cloudflare_challenge(r.text)):
+            # The next attempt solves the challenge again
+            cf_clearance_store.reject(site_url, clearance)
+
         if r.status_code != 200 or "invalid" in r.text.lower():
             info(f"Login failed: {r.status_code} - {r.text}")
             mark_hostname_issue(hostname, "session", "Login failed")
@@ -131,7 +161,7 @@ def create_and_persist_session(shared_state):
         mark_hostname_issue(hostname, "session", "Missing credentials")
         return None
 
-    _persist_session_to_db(shared_state, sess)
+    register_session(shared_state, hostname, sess, max_age=SESSION_MAX_AGE_SECONDS)
     clear_hostname_issue(hostname)
     return sess
 
@@ -146,61 +176,27 @@ def retrieve_and_validate_session(shared_state):
         mark_hostname_issue(hostname, "session", "FlareSolverr required")
         return None
 
-    db = shared_state.values["database"]("sessions")
-    stored = db.retrieve(hostname)
-    if not stored:
-        return create_and_persist_session(shared_state)
-
-    try:
-        # Try to parse as JSON (new format with timestamp)
-        session_data = json.loads(stored)
-        token = session_data.get("token")
-        created_at = session_data.get("created_at", 0)
-
-        # Check if session is older than 24 hours
-        age = time.time() - created_at
-        if age > SESSION_MAX_AGE_SECONDS:
-            debug(f"Session expired (age: {age / 3600:.1f} hours)")
-            invalidate_session(shared_state)
-            return create_and_persist_session(shared_state)
-        else:
-            trace(f"Session valid (age: {age / 3600:.1f} hours)")
-    except (json.JSONDecodeError, TypeError):
-        # Legacy format: plain base64 token without timestamp
-        # Treat as expired and recreate
-        debug("Legacy session format detected, recreating")
-        invalidate_session(shared_state)
-        return create_and_persist_session(shared_state)
-
     try:
-        blob = base64.b64decode(token.encode("utf-8"))
-        sess = pickle.loads(blob)
-        if not isinstance(sess, requests.Session):
-            raise ValueError("Not a Session")
+        # Sessions older than 24 hours are not returned and get recreated
+        sess = get_registered_session(
+            shared_state, hostname, max_age=SESSION_MAX_AGE_SECONDS
+        )
     except Exception as e:
         debug(f"Session load failed: {e}")
+        sess = None
+
+    if not sess:
         return create_and_persist_session(shared_state)
 
+    trace("Session valid")
     return sess
 
 
 def invalidate_session(shared_state):
-    db = shared_state.values["database"]("sessions")
-    db.delete(hostname)
+    drop_session(shared_state, hostname)
     debug("Session marked as invalid!")
 
 
-def _persist_session_to_db(shared_state, sess):
-    """
-    Serialize & store the given requests.Session into the database under `hostname`.
-    Includes creation timestamp for expiration checking.
-    """
-    blob = pickle.dumps(sess)
-    token = base64.b64encode(blob).decode("utf-8")
-    session_data = json.dumps({"token": token, "created_at": time.time()})
-    shared_state.values["database"]("sessions").update_store(hostname, session_data)
-
-
 def _load_session_cookies_for_flaresolverr(sess):
     """
     Convert a requests.Session's cookies into FlareSolverr-style list of dicts.
@@ -339,18 +335,20 @@ def fetch_via_flaresolverr(
     except ValueError:
         parsed_json = None
 
-    # Replace our requests.Session cookies with whatever FlareSolverr solved
-    sess.cookies.clear()
+    # Replace our requests.Session cookies with whatever FlareSolverr solved.
+    # The session is shared between threads, so the new jar is swapped in at once.
+    solved_cookies = requests.cookies.RequestsCookieJar()
     for ck in solution.get("cookies", []):
-        sess.cookies.set(
+        solved_cookies.set(
             ck.get("name"),
             ck.get("value"),
             domain=ck.get("domain"),
             path=ck.get("path", "/"),
         )
+    sess.cookies = solved_cookies
 
-    # Persist the updated Session back into your DB
-    _persist_session_to_db(shared_state, sess)
+    # Persist the updated cookies back into the DB
+    persist_session_cookies(shared_state, hostname, sess)
 
     # Return a small dict containing status, headers, parsed JSON, and cookie list
     return {
@@ -381,22 +379,26 @@ def fetch_via_requests_session(
             f"Site '{hostname}' not usable (login skipped or no credentials)"
         )
 
+    # The session is shared between threads, so the year filter is sent per request
+    request_cookies = None
     if year:
-        sess.cookies["filter"] = f'{{"year":{{"from":{year},"to":{year}}}}}'
+        request_cookies = {"filter": f'{{"year":{{"from":{year},"to":{year}}}}}'}
         trace(f"Added year filter cookie for year {year}")
-    elif "filter" in sess.cookies:
+    if "filter" in sess.cookies:
         del sess.cookies["filter"]
         trace("Removed year filter cookie")
 
     # Execute request
     if method.upper() == "GET":
-        r = sess.get(target_url, timeout=timeout)
+        r = sess.get(target_url, cookies=request_cookies, timeout=timeout)
     else:  # POST
-        r = sess.post(target_url, data=post_data, timeout=timeout)
+        r = sess.post(
+            target_url, data=post_data, cookies=request_cookies, timeout=timeout
+        )
 
     r.raise_for_status()
 
-    # Re-persist cookies, since the site might have modified them during the request
-    _persist_session_to_db(shared_state, sess)
+    # Re-persist cookies if the site modified them during the request
+    persist_session_cookies(shared_state, hostname, sess)
 
     return r
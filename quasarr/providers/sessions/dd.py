@@ -2,13 +2,15 @@
 # Quasarr
 # Project by https://github.com/rix1337
 
-import base64
-import pickle
-
 import requests
 
 from quasarr.providers.hostname_issues import clear_hostname_issue, mark_hostname_issue
 from quasarr.providers.log import debug, info
+from quasarr.providers.sessions import (
+    drop_session,
+    get_registered_session,
+    register_session,
+)
 from quasarr.providers.utils import is_site_usable
 
 hostname = "dd"
@@ -65,9 +67,7 @@ def create_and_persist_session(shared_state):
             shared_state.values["config"]("DD").save("password", "")
             return None
 
-        serialized_session = pickle.dumps(dd_session)
-        session_string = base64.b64encode(serialized_session).decode("utf-8")
-        shared_state.values["database"]("sessions").update_store("dd", session_string)
+        register_session(shared_state, hostname, dd_session)
         clear_hostname_issue(hostname)
         return dd_session
     else:
@@ -81,20 +81,19 @@ def retrieve_and_validate_session(shared_state):
         debug("Site not usable (login skipped or no credentials)")
         return None
 
-    session_string = shared_state.values["database"]("sessions").retrieve("dd")
-    if not session_string:
+    try:
+        dd_session = get_registered_session(shared_state, hostname)
+    except Exception as e:
+        info(f"Session retrieval failed: {e}")
+        mark_hostname_issue(hostname, "session", str(e))
+        dd_session = None
+
+    if not dd_session:
         dd_session = create_and_persist_session(shared_state)
-    else:
-        try:
-            serialized_session = base64.b64decode(session_string.encode("utf-8"))
-            dd_session = pickle.loads(serialized_session)
-            if not isinstance(dd_session, requests.Session):
-                raise ValueError(
-                    "Retrieved object is not a valid requests.Session instance."
-                )
-        except Exception as e:
-            info(f"Session retrieval failed: {e}")
-            mark_hostname_issue(hostname, "session", str(e))
-            dd_session = create_and_persist_session(shared_state)
 
     return dd_session
+
+
+def invalidate_session(shared_state):
+    drop_session(shared_state, hostname)
+    debug("Session marked as invalid!")
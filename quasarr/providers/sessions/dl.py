@@ -2,14 +2,17 @@
 # Quasarr
 # Project by https://github.com/rix1337
 
-import base64
-import pickle
-
 import requests
 from bs4 import BeautifulSoup
 
 from quasarr.providers.hostname_issues import clear_hostname_issue, mark_hostname_issue
 from quasarr.providers.log import debug, info
+from quasarr.providers.sessions import (
+    drop_session,
+    get_registered_session,
+    persist_session_cookies,
+    register_session,
+)
 from quasarr.providers.utils import is_site_usable
 
 
@@ -97,10 +100,8 @@ def create_and_persist_session(shared_state):
         mark_hostname_issue(hostname, "session", str(e))
         return None
 
-    # Persist session to database
-    blob = pickle.dumps(sess)
-    token = base64.b64encode(blob).decode("utf-8")
-    shared_state.values["database"]("sessions").update_store(hostname, token)
+    # Keep session alive in-process and persist its cookies
+    register_session(shared_state, hostname, sess)
 
     clear_hostname_issue(hostname)
     return sess
@@ -108,7 +109,7 @@ def create_and_persist_session(shared_state):
 
 def retrieve_and_validate_session(shared_state):
     """
-    Retrieve session from database or create a new one.
+    Retrieve the live session from the registry (or database) or create a new one.
 
     Args:
         shared_state: Shared state object
@@ -119,18 +120,13 @@ def retrieve_and_validate_session(shared_state):
     if not is_site_usable(shared_state, hostname):
         return None
 
-    db = shared_state.values["database"]("sessions")
-    token = db.retrieve(hostname)
-    if not token:
-        return create_and_persist_session(shared_state)
-
     try:
-        blob = base64.b64decode(token.encode("utf-8"))
-        sess = pickle.loads(blob)
-        if not isinstance(sess, requests.Session):
-            raise ValueError("Not a Session")
+        sess = get_registered_session(shared_state, hostname)
     except Exception as e:
         debug(f"Session load failed: {e}")
+        sess = None
+
+    if not sess:
         return create_and_persist_session(shared_state)
 
     return sess
@@ -143,24 +139,10 @@ def invalidate_session(shared_state):
     Args:
         shared_state: Shared state object
     """
-    db = shared_state.values["database"]("sessions")
-    db.delete(hostname)
+    drop_session(shared_state, hostname)
     debug("Session marked as invalid!")
 
 
-def _persist_session_to_db(shared_state, sess):
-    """
-    Serialize & store the given requests.Session into the database under `hostname`.
-
-    Args:
-        shared_state: Shared state object
-        sess: requests.Session to persist
-    """
-    blob = pickle.dumps(sess)
-    token = base64.b64encode(blob).decode("utf-8")
-    shared_state.values["database"]("sessions").update_store(hostname, token)
-
-
 def fetch_via_requests_session(
     shared_state,
     method: str,
@@ -197,7 +179,7 @@ def fetch_via_requests_session(
 
     r.raise_for_status()
 
-    # Re-persist cookies, since the site might have modified them during the request
-    _persist_session_to_db(shared_state, sess)
+    # Re-persist cookies if the site modified them during the request
+    persist_session_cookies(shared_state, hostname, sess)
 
     return r
@@ -54,6 +54,7 @@ def set_connection_info(internal_address, external_address, port):
 def set_files(config_path):
     update("configfile", os.path.join(config_path, "Quasarr.ini"))
     update("dbfile", os.path.join(config_path, "Quasarr.db"))
+    update("imdb_dataset_dbfile", os.path.join(config_path, "IMDb.db"))
 
 
 def generate_api_key():
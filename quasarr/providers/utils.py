@@ -1197,6 +1197,14 @@ def download_package(links, title, password, package_id, shared_state):
             }
         ]
     )
+
+    # Lazy import to avoid circular dependency
+    from quasarr.downloads.packages.package_ids import remember_package_id
+    from quasarr.downloads.packages.snapshot import invalidate_package_snapshot
+
+    if downloaded:
+        remember_package_id(shared_state, package_id)
+    invalidate_package_snapshot(shared_state)
     return downloaded
 
 
@@ -2,6 +2,8 @@
 # Quasarr
 # Project by https://github.com/rix1337
 
+import re
+import threading
 from datetime import datetime, timedelta
 from json import dumps, loads
 
@@ -10,7 +12,7 @@ import requests
 from quasarr.providers import shared_state
 from quasarr.providers.imdb_metadata import TitleCleaner
 from quasarr.providers.log import debug, error, trace, warn
-from quasarr.providers.utils import search_string_in_sanitized_title
+from quasarr.providers.utils import sanitize_string
 
 
 def _get_db(table_name):
@@ -23,17 +25,119 @@ def _get_db(table_name):
 _BASE_URL = "https://thexem.info"
 
 
-def _fetch_all_names():
-    """Fetch all names from TheXEM, cached for 24 hours."""
+def _build_name_index(all_names):
+    """
+    Build the name index from the allNames data.
+
+    "shows" lists tvdb ids with their sanitized names in allNames order,
+    "tokens" maps every name token to the positions of the shows using it.
+    """
+    shows = []
+    tokens = {}
+    for tvdb_id, names_list in all_names.items():
+        names = []
+        for entry in names_list:
+            if isinstance(entry, str):
+                names.append(entry)
+            elif isinstance(entry, dict):
+                names.extend(entry.keys())
+
+        sanitized_names = list(dict.fromkeys(sanitize_string(name) for name in names))
+        position = len(shows)
+        shows.append([tvdb_id, sanitized_names])
+        for name in sanitized_names:
+            for token in name.split():
+                positions = tokens.setdefault(token, [])
+                if not positions or positions[-1] != position:
+                    positions.append(position)
+
+    return {"shows": shows, "tokens": tokens}
+
+
+class XEMNameIndex:
+    """
+    Process-local copy of the persisted allNames index, so title lookups
+    neither decode the cache row nor scan every show on each call.
+    """
+
+    def __init__(self):
+        self.index = None
+        self.ttl = 0
+        self.last_access = 0
+        self.lock = threading.Lock()
+
+    def get(self):
+        now = datetime.now().timestamp()
+        with self.lock:
+            self.last_access = now
+            if self.index is not None and self.ttl > now:
+                return self.index
+
+        return self.refresh(force=False)
+
+    def refresh(self, force=True):
+        """
+        Load the index from the cache, or from TheXEM if force is set or the cache expired.
+        """
+        index, ttl = _fetch_name_index(force=force)
+        if index is not None:
+            with self.lock:
+                self.index = index
+                self.ttl = ttl
+        return index
+
+    def search(self, title):
+        """Search for a title in the allNames index. Returns TVDB ID or None."""
+        index = self.get()
+        if not index:
+            return None
+
+        search_tokens = sanitize_string(TitleCleaner.sanitize(title)).split()
+        if not search_tokens:
+            return None
+
+        # Shows that use every word of the title in any of their names
+        postings = [index["tokens"].get(token) for token in search_tokens]
+        if not all(postings):
+            return None
+        candidates = set(postings[0]).intersection(*postings[1:])
+
+        # Words must appear in order, like in search_string_in_sanitized_title
+        pattern = re.compile(
+            r"\b" + r"\b.+\b".join(re.escape(t) for t in search_tokens) + r"\b"
+        )
+        for position in sorted(candidates):
+            tvdb_id, names = index["shows"][position]
+            if any(pattern.search(name) for name in names):
+                return tvdb_id
+        return None
+
+
+xem_name_index = XEMNameIndex()
+
+
+def _fetch_name_index(force=False):
+    """
+    Fetch the allNames index, cached for 24 hours.
+    The index is rebuilt only when allNames is fetched from TheXEM.
+    Returns a tuple (index, ttl), or (None, 0) on failure.
+    """
     db = _get_db("xem_all_names")
     now = datetime.now().timestamp()
 
     try:
-        cached_data = db.retrieve("allnames")
+        cached_data = None if force else db.retrieve("allnames")
         if cached_data:
             cached = loads(cached_data)
             if cached.get("ttl") and cached["ttl"] > now:
-                return cached.get("data")
+                if "index" in cached:
+                    return cached["index"], cached["ttl"]
+                # Rows written before the index existed hold the raw data
+                index = _build_name_index(cached.get("data") or {})
+                db.update_store(
+                    "allnames", dumps({"index": index, "ttl": cached["ttl"]})
+                )
+                return index, cached["ttl"]
     except Exception as e:
         trace(f"Error retrieving XEM allNames from cache: {e}")
 
@@ -53,50 +157,44 @@ def _fetch_all_names():
 
         if result.get("result") != "success":
             warn(f"TheXEM allNames returned non-success: {result.get('message', '')}")
-            return None
+            return None, 0
 
-        data = result.get("data")
+        index = _build_name_index(result.get("data") or {})
         ttl = now + timedelta(hours=24).total_seconds()
-        db.update_store("allnames", dumps({"data": data, "ttl": ttl}))
+        db.update_store("allnames", dumps({"index": index, "ttl": ttl}))
 
-        return data
+        return index, ttl
     except Exception as e:
         error(f"TheXEM allNames fetch failed: {e}")
-        return None
-
-
-def _search_in_names(all_names, title):
-    """Search for a title in the allNames data. Returns TVDB ID or None."""
-    sanitized_title = TitleCleaner.sanitize(title)
+        return None, 0
 
-    for tvdb_id, names_list in all_names.items():
-        for entry in names_list:
-            if isinstance(entry, str):
-                name = entry
-            elif isinstance(entry, dict):
-                for name in entry.keys():
-                    if search_string_in_sanitized_title(sanitized_title, name):
-                        return tvdb_id
-                continue
-            else:
-                continue
-
-            if search_string_in_sanitized_title(sanitized_title, name):
-                return tvdb_id
 
-    return None
+# Decoded per-show season names of this process: tvdb_id -> (data, ttl)
+_season_names_cache = {}
+# tvdb_id -> time of last lookup
+_season_names_accessed = {}
+# Guards both dicts, request threads write them while cache maintenance iterates them
+_season_names_lock = threading.Lock()
 
 
-def _fetch_season_names(tvdb_id):
+def _fetch_season_names(tvdb_id, force=False):
     """Fetch per-season names for a specific show from TheXEM, cached for 24 hours."""
-    db = _get_db("xem_season_names")
     now = datetime.now().timestamp()
+    if not force:
+        with _season_names_lock:
+            _season_names_accessed[tvdb_id] = now
+            data, ttl = _season_names_cache.get(tvdb_id, (None, 0))
+        if data is not None and ttl > now:
+            return data
 
+    db = _get_db("xem_season_names")
     try:
-        cached_data = db.retrieve(tvdb_id)
+        cached_data = None if force else db.retrieve(tvdb_id)
         if cached_data:
             cached = loads(cached_data)
             if cached.get("ttl") and cached["ttl"] > now:
+                with _season_names_lock:
+                    _season_names_cache[tvdb_id] = (cached.get("data"), cached["ttl"])
                 return cached.get("data")
     except Exception as e:
         trace(f"Error retrieving XEM season names from cache for {tvdb_id}: {e}")
@@ -125,6 +223,8 @@ def _fetch_season_names(tvdb_id):
         data = result.get("data", {})
         ttl = now + timedelta(hours=24).total_seconds()
         db.update_store(tvdb_id, dumps({"data": data, "ttl": ttl}))
+        with _season_names_lock:
+            _season_names_cache[tvdb_id] = (data, ttl)
 
         return data
     except Exception as e:
@@ -132,6 +232,45 @@ def _fetch_season_names(tvdb_id):
         return None
 
 
+def expiring_season_names(ahead, hot_window):
+    """
+    Return tvdb ids looked up within hot_window seconds whose season names expire within ahead seconds,
+    most recently used first.
+    """
+    now = datetime.now().timestamp()
+    with _season_names_lock:
+        hot = [
+            (last_access, tvdb_id)
+            for tvdb_id, last_access in _season_names_accessed.items()
+            if last_access > now - hot_window
+            and _season_names_cache.get(tvdb_id, (None, 0))[1] < now + ahead
+        ]
+    return [tvdb_id for _, tvdb_id in sorted(hot, reverse=True)]
+
+
+def refresh_season_names(tvdb_id):
+    """Fetch season names for tvdb_id from TheXEM ahead of their expiry."""
+    return _fetch_season_names(tvdb_id, force=True) is not None
+
+
+def evict_cold_season_names(hot_window):
+    """
+    Drop season names that were not looked up within hot_window seconds from memory and cache.
+    Returns the number of evicted shows.
+    """
+    cutoff = datetime.now().timestamp() - hot_window
+    with _season_names_lock:
+        cold = [k for k, last in _season_names_accessed.items() if last <= cutoff]
+        for tvdb_id in cold:
+            del _season_names_accessed[tvdb_id]
+            _season_names_cache.pop(tvdb_id, None)
+    if cold:
+        db = _get_db("xem_season_names")
+        for tvdb_id in cold:
+            db.delete(tvdb_id)
+    return len(cold)
+
+
 def get_season_name(title, season, lang="jp"):
     """
     Get season-specific name for a title and season from TheXEM.
@@ -182,12 +321,8 @@ def get_all_season_names(title):
     Search TheXEM for a title and return per-season names.
     """
 
-    # 1. Fetch allNames and search
-    all_names = _fetch_all_names()
-    if not all_names:
-        return None
-
-    tvdb_id = _search_in_names(all_names, title)
+    # 1. Search the allNames index
+    tvdb_id = xem_name_index.search(title)
     if not tvdb_id:
         return None
 
@@ -13,9 +13,10 @@ from quasarr.constants import (
     SEARCH_CAT_MUSIC,
     SEARCH_CAT_SHOWS,
 )
-from quasarr.providers.imdb_metadata import get_imdb_metadata
+from quasarr.providers.imdb_metadata import imdb_metadata_cache
 from quasarr.providers.log import debug, get_logger, info, trace, warn
 from quasarr.search.sources import get_sources
+from quasarr.search.sources.helpers.search_context import SearchContext
 from quasarr.search.sources.helpers.search_source import AbstractSearchSource
 from quasarr.storage.categories import get_search_category_sources
 
@@ -44,9 +45,6 @@ def get_search_results(
     if imdb_id and not imdb_id.startswith("tt"):
         imdb_id = f"tt{imdb_id}"
 
-    if imdb_id:
-        get_imdb_metadata(imdb_id)
-
     # Determine search category if not provided
     if not search_category:
         search_category = determine_search_category(request_from)
@@ -91,6 +89,8 @@ def get_search_results(
         if base_search_category in [SEARCH_CAT_MOVIES, SEARCH_CAT_SHOWS]:
             args = (shared_state, start_time, behavior_search_category)
             kwargs = {"search_string": imdb_id, "season": season, "episode": episode}
+            # Resolve IMDb metadata once, all sources share the same titles
+            context = SearchContext(shared_state, imdb_id)
             for source in sources.values():
                 url = config.get(source.initials)
                 if (
@@ -108,6 +108,7 @@ def get_search_results(
                         kwargs,
                         use_cache=True,
                         cache_category=cache_key_category,
+                        context=context,
                     )
         else:
             warn(
@@ -119,6 +120,7 @@ def get_search_results(
         if base_search_category in [SEARCH_CAT_BOOKS, SEARCH_CAT_MUSIC]:
             args = (shared_state, start_time, behavior_search_category)
             kwargs = {"search_string": search_phrase}
+            context = SearchContext(shared_state, search_phrase)
             for source in sources.values():
                 url = config.get(source.initials)
                 if (
@@ -136,6 +138,7 @@ def get_search_results(
                         kwargs,
                         use_cache=True,
                         cache_category=cache_key_category,
+                        context=context,
                     )
         else:
             warn(
@@ -227,6 +230,8 @@ def get_search_results(
         f"Providing releases <g>{log_start}-{log_end}</g> of <g>{total_count}</g> to <d>{request_from}</d> "
         f"for {stype}{status_bar} <blue>{time_info}</blue>"
     )
+    if imdb_id:
+        trace(f"IMDb metadata cache: {imdb_metadata_cache.get_stats()}")
 
     return sliced_results
 
@@ -244,6 +249,7 @@ class SearchExecutor:
         ttl=300,
         action="search",
         cache_category=None,
+        context=None,
     ):
         key_args = list(args)
         key_args[1] = None
@@ -251,6 +257,9 @@ class SearchExecutor:
             key_args[2] = cache_category
         key_args = tuple(key_args)
         key = hash((source.initials, action, key_args, frozenset(kwargs.items())))
+        # The context is derived from the arguments, so it is kept out of the cache key
+        if context is not None:
+            kwargs = {**kwargs, "context": context}
         self.searches.append(
             (
                 key,
@@ -20,7 +20,6 @@ from quasarr.downloads.sources.al import (
 )
 from quasarr.providers import shared_state
 from quasarr.providers.hostname_issues import clear_hostname_issue, mark_hostname_issue
-from quasarr.providers.imdb_metadata import get_localized_title, get_year
 from quasarr.providers.log import debug, error, info, trace, warn
 from quasarr.providers.sessions.al import fetch_via_requests_session, invalidate_session
 from quasarr.providers.utils import (
@@ -28,10 +27,10 @@ from quasarr.providers.utils import (
     generate_download_link,
     get_base_search_category_id,
     get_recently_searched,
-    is_imdb_id,
     sanitize_string,
 )
 from quasarr.providers.xem_metadata import get_season_name
+from quasarr.search.sources.helpers.search_context import SearchContext
 from quasarr.search.sources.helpers.search_release import SearchRelease
 from quasarr.search.sources.helpers.search_source import AbstractSearchSource
 
@@ -193,6 +192,7 @@ class Source(AbstractSearchSource):
         search_string: str = "",
         season: int = None,
         episode: int = None,
+        context: SearchContext = None,
     ) -> list[SearchRelease]:
         releases = []
 
@@ -208,9 +208,10 @@ class Source(AbstractSearchSource):
             warn(f"Unknown search category: {search_category}")
             return releases
 
-        imdb_id = is_imdb_id(search_string)
+        context = context or SearchContext(shared_state, search_string)
+        imdb_id = context.imdb_id
         if imdb_id:
-            title = get_localized_title(shared_state, imdb_id, "de")
+            title = context.localized_title("de")
             if not title:
                 info(f"No title for IMDb {imdb_id}")
                 return releases
@@ -238,7 +239,7 @@ class Source(AbstractSearchSource):
             encoded_search_string = quote_plus(variant)
             year = None
             if imdb_id is not None and variant == search_string:
-                year = get_year(imdb_id)
+                year = context.year
 
             try:
                 url = f"https://www.{host}/search?q={encoded_search_string}"
@@ -22,15 +22,14 @@ from quasarr.constants import (
 )
 from quasarr.providers import shared_state
 from quasarr.providers.hostname_issues import clear_hostname_issue, mark_hostname_issue
-from quasarr.providers.imdb_metadata import get_localized_title, get_year
 from quasarr.providers.log import debug, error, info, warn
 from quasarr.providers.utils import (
     generate_download_link,
     get_base_search_category_id,
-    is_imdb_id,
     is_valid_release,
     normalize_magazine_title,
 )
+from quasarr.search.sources.helpers.search_context import SearchContext
 from quasarr.search.sources.helpers.search_release import SearchRelease
 from quasarr.search.sources.helpers.search_source import AbstractSearchSource
 
@@ -100,19 +99,21 @@ class Source(AbstractSearchSource):
         search_string: str = "",
         season: int = None,
         episode: int = None,
+        context: SearchContext = None,
     ) -> list[SearchRelease]:
         by = shared_state.values["config"]("Hostnames").get(self.initials)
         password = by
 
-        imdb_id = is_imdb_id(search_string)
+        context = context or SearchContext(shared_state, search_string)
+        imdb_id = context.imdb_id
         if imdb_id:
-            title = get_localized_title(shared_state, imdb_id, "de")
+            title = context.localized_title("de")
             if not title:
                 info(f"Could not extract title from IMDb-ID {imdb_id}")
                 return []
             search_string = html.unescape(title)
             if not season:
-                if year := get_year(imdb_id):
+                if year := context.year:
                     search_string += f" {year}"
 
         base_url = f"https://{by}"
@@ -13,7 +13,6 @@ from quasarr.constants import (
 )
 from quasarr.providers import shared_state
 from quasarr.providers.hostname_issues import clear_hostname_issue, mark_hostname_issue
-from quasarr.providers.imdb_metadata import get_localized_title, get_year
 from quasarr.providers.log import debug, error, info, warn
 from quasarr.providers.sessions.dd import (
     create_and_persist_session,
@@ -22,9 +21,9 @@ from quasarr.providers.sessions.dd import (
 from quasarr.providers.utils import (
     convert_to_mb,
     generate_download_link,
-    is_imdb_id,
     is_valid_release,
 )
+from quasarr.search.sources.helpers.search_context import SearchContext
 from quasarr.search.sources.helpers.search_release import SearchRelease
 from quasarr.search.sources.helpers.search_source import AbstractSearchSource
 
@@ -49,6 +48,7 @@ class Source(AbstractSearchSource):
         search_string: str = "",
         season: int = None,
         episode: int = None,
+        context: SearchContext = None,
     ) -> list[SearchRelease]:
         releases = []
         dd = shared_state.values["config"]("Hostnames").get(self.initials)
@@ -64,9 +64,10 @@ class Source(AbstractSearchSource):
             info(f"Could not retrieve valid session for {dd}")
             return releases
 
-        imdb_id = is_imdb_id(search_string)
+        context = context or SearchContext(shared_state, search_string)
+        imdb_id = context.imdb_id
         if imdb_id:
-            search_string = get_localized_title(shared_state, imdb_id, "en")
+            search_string = context.localized_title("en")
             if not search_string:
                 info(f"Could not extract title from IMDb-ID {imdb_id}")
                 return releases
@@ -76,7 +77,7 @@ class Source(AbstractSearchSource):
                 if episode:
                     search_string += f"E{int(episode):02d}"
             else:
-                if year := get_year(imdb_id):
+                if year := context.year:
                     search_string += f" {year}"
 
         if not search_string:
@@ -4,6 +4,8 @@
 
 import re
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from html import unescape
 
@@ -20,7 +22,6 @@ from quasarr.constants import (
 )
 from quasarr.providers import shared_state
 from quasarr.providers.hostname_issues import clear_hostname_issue, mark_hostname_issue
-from quasarr.providers.imdb_metadata import get_localized_title, get_year
 from quasarr.providers.log import debug, info, trace, warn
 from quasarr.providers.sessions.dl import (
     fetch_via_requests_session,
@@ -30,13 +31,16 @@ from quasarr.providers.sessions.dl import (
 from quasarr.providers.utils import (
     generate_download_link,
     get_base_search_category_id,
-    is_imdb_id,
     is_valid_release,
     replace_umlauts,
 )
+from quasarr.search.sources.helpers.search_context import SearchContext
 from quasarr.search.sources.helpers.search_release import SearchRelease
 from quasarr.search.sources.helpers.search_source import AbstractSearchSource
 
+# Number of result pages requested concurrently once the search ID is known
+MAX_PARALLEL_PAGES = 3
+
 
 class Source(AbstractSearchSource):
     initials = "dl"
@@ -186,7 +190,8 @@ class Source(AbstractSearchSource):
         episode,
     ):
         """
-        Search a single page. This method is called sequentially for each page.
+        Search a single page. Follow-up pages may be fetched concurrently,
+        so this method must not rely on state from other pages.
         """
         page_releases = []
 
@@ -334,30 +339,36 @@ class Source(AbstractSearchSource):
         search_string: str = "",
         season: int = None,
         episode: int = None,
+        context: SearchContext = None,
     ) -> list[SearchRelease]:
         """
-        Search with sequential pagination to find best quality releases.
-        Stops searching if a page returns 0 results or 10 seconds have elapsed.
+        Search with pipelined pagination to find best quality releases.
+        The first page is fetched on its own to obtain the search ID, after which
+        up to MAX_PARALLEL_PAGES follow-up pages are kept in flight at once.
+        Pages are consumed strictly in order, so the search stops at the same page
+        as a sequential walk would: on a page with 0 results, on a duplicate page,
+        or once the search duration budget is used up.
         """
         releases = []
         host = shared_state.values["config"]("Hostnames").get(self.initials)
 
-        imdb_id = is_imdb_id(search_string)
+        context = context or SearchContext(shared_state, search_string)
+        imdb_id = context.imdb_id
         if imdb_id:
-            title = get_localized_title(shared_state, imdb_id, "de")
+            title = context.localized_title("de")
             if not title:
                 info(f"no title for IMDb {imdb_id}")
                 return releases
             search_string = title
             if not season:
-                if year := get_year(imdb_id):
+                if year := context.year:
                     search_string += f" {year}"
 
         search_string = unescape(search_string)
         max_search_duration = 7
 
         trace(
-            f"Starting sequential paginated search for '{search_string}' (Season: {season}, Episode: {episode}) - max {max_search_duration}s"
+            f"Starting pipelined paginated search for '{search_string}' (Season: {season}, Episode: {episode}) - max {max_search_duration}s, {MAX_PARALLEL_PAGES} pages in flight"
         )
 
         try:
@@ -366,16 +377,11 @@ class Source(AbstractSearchSource):
                 warn(f"Could not retrieve valid session for {host}")
                 return releases
 
-            search_id = None
-            page_num = 0
             search_start_time = time.time()
             release_titles_per_page = set()
 
-            # Sequential search through pages until timeout or no results
-            while (time.time() - search_start_time) < max_search_duration:
-                page_num += 1
-
-                page_releases, extracted_search_id = self._search_single_page(
+            def fetch_page(page_num, search_id):
+                return self._search_single_page(
                     shared_state,
                     host,
                     search_string,
@@ -387,21 +393,19 @@ class Source(AbstractSearchSource):
                     episode,
                 )
 
+            def consume_page(page_num, page_releases):
+                """
+                Apply the stop conditions to a page in page order.
+                Returns False once pagination has to stop.
+                """
                 page_release_titles = tuple(
                     pr["details"]["title"] for pr in page_releases
                 )
                 if page_release_titles in release_titles_per_page:
                     trace(f"[Page {page_num}] duplicate page detected, stopping")
-                    break
+                    return False
                 release_titles_per_page.add(page_release_titles)
 
-                # Update search_id from first page
-                if page_num == 1:
-                    search_id = extracted_search_id
-                    if not search_id:
-                        trace("Could not extract search ID, stopping pagination")
-                        break
-
                 # Add releases from this page
                 releases.extend(page_releases)
                 trace(
@@ -411,7 +415,43 @@ class Source(AbstractSearchSource):
                 # Stop if this page returned 0 results
                 if len(page_releases) == 0:
                     trace(f"[Page {page_num}] returned 0 results, stopping pagination")
-                    break
+                    return False
+                return True
+
+            # The first page yields the search ID that all following page URLs depend on
+            page_releases, search_id = fetch_page(1, None)
+            if not search_id:
+                trace("Could not extract search ID, stopping pagination")
+            elif consume_page(1, page_releases):
+                executor = ThreadPoolExecutor(max_workers=MAX_PARALLEL_PAGES)
+                try:
+                    in_flight = deque()
+                    next_page = 2
+
+                    def fill_pipeline():
+                        nonlocal next_page
+                        while (
+                            len(in_flight) < MAX_PARALLEL_PAGES
+                            and (time.time() - search_start_time) < max_search_duration
+                        ):
+                            in_flight.append(
+                                (
+                                    next_page,
+                                    executor.submit(fetch_page, next_page, search_id),
+                                )
+                            )
+                            next_page += 1
+
+                    fill_pipeline()
+                    while in_flight:
+                        page_num, future = in_flight.popleft()
+                        page_releases, _ = future.result()
+                        if not consume_page(page_num, page_releases):
+                            break
+                        fill_pipeline()
+                finally:
+                    # Pages beyond the stop condition are discarded
+                    executor.shutdown(wait=False, cancel_futures=True)
 
         except Exception as e:
             info(f"search error: {e}")
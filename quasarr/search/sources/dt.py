@@ -14,7 +14,6 @@ from bs4 import BeautifulSoup
 
 from quasarr.providers import shared_state
 from quasarr.providers.hostname_issues import clear_hostname_issue, mark_hostname_issue
-from quasarr.providers.imdb_metadata import get_localized_title
 from quasarr.providers.log import debug, error, info, warn
 from quasarr.providers.utils import (
     SEARCH_CAT_BOOKS,
@@ -24,10 +23,10 @@ from quasarr.providers.utils import (
     convert_to_mb,
     generate_download_link,
     get_base_search_category_id,
-    is_imdb_id,
     is_valid_release,
     normalize_magazine_title,
 )
+from quasarr.search.sources.helpers.search_context import SearchContext
 from quasarr.search.sources.helpers.search_release import SearchRelease
 from quasarr.search.sources.helpers.search_source import AbstractSearchSource
 
@@ -166,6 +165,7 @@ class Source(AbstractSearchSource):
         search_string: str = "",
         season: int = None,
         episode: int = None,
+        context: SearchContext = None,
     ) -> list[SearchRelease]:
         releases = []
         dt = shared_state.values["config"]("Hostnames").get(self.initials)
@@ -186,9 +186,10 @@ class Source(AbstractSearchSource):
             return releases
 
         try:
-            imdb_id = is_imdb_id(search_string)
+            context = context or SearchContext(shared_state, search_string)
+            imdb_id = context.imdb_id
             if imdb_id:
-                search_string = get_localized_title(shared_state, imdb_id, "en")
+                search_string = context.localized_title("en")
                 if not search_string:
                     info(f"Could not extract title from IMDb-ID {imdb_id}")
                     return releases
@@ -25,6 +25,7 @@ from quasarr.providers.utils import (
     is_imdb_id,
     is_valid_release,
 )
+from quasarr.search.sources.helpers.search_context import SearchContext
 from quasarr.search.sources.helpers.search_release import SearchRelease
 from quasarr.search.sources.helpers.search_source import AbstractSearchSource
 
@@ -136,6 +137,7 @@ class Source(AbstractSearchSource):
         search_string: str = "",
         season: int = None,
         episode: int = None,
+        context: SearchContext = None,
     ) -> list[SearchRelease]:
         releases = []
         dw = shared_state.values["config"]("Hostnames").get(self.initials)
@@ -169,7 +171,7 @@ class Source(AbstractSearchSource):
             )
             return releases
 
-        imdb_id = is_imdb_id(search_string)
+        imdb_id = context.imdb_id if context else is_imdb_id(search_string)
 
         if results:
             for result in results:
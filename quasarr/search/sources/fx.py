@@ -22,6 +22,7 @@ from quasarr.providers.utils import (
     is_valid_release,
     sanitize_title,
 )
+from quasarr.search.sources.helpers.search_context import SearchContext
 from quasarr.search.sources.helpers.search_release import SearchRelease
 from quasarr.search.sources.helpers.search_source import AbstractSearchSource
 
@@ -149,12 +150,15 @@ class Source(AbstractSearchSource):
         search_string: str = "",
         season: int = None,
         episode: int = None,
+        context: SearchContext = None,
     ) -> list[SearchRelease]:
         releases = []
         fx = shared_state.values["config"]("Hostnames").get(self.initials)
         password = fx.split(".")[0]
 
-        if search_string != "":
+        if context:
+            imdb_id = context.imdb_id
+        elif search_string != "":
             imdb_id = is_imdb_id(search_string)
         else:
             imdb_id = None
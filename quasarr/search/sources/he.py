@@ -17,15 +17,14 @@ from quasarr.constants import (
 )
 from quasarr.providers import shared_state
 from quasarr.providers.hostname_issues import clear_hostname_issue, mark_hostname_issue
-from quasarr.providers.imdb_metadata import get_localized_title, get_year
 from quasarr.providers.log import debug, info, trace, warn
 from quasarr.providers.utils import (
     convert_to_mb,
     generate_download_link,
     get_base_search_category_id,
-    is_imdb_id,
     is_valid_release,
 )
+from quasarr.search.sources.helpers.search_context import SearchContext
 from quasarr.search.sources.helpers.search_release import SearchRelease
 from quasarr.search.sources.helpers.search_source import AbstractSearchSource
 
@@ -49,6 +48,7 @@ class Source(AbstractSearchSource):
         search_string: str = "",
         season: int = None,
         episode: int = None,
+        context: SearchContext = None,
     ) -> list[SearchRelease]:
         releases = []
         host = shared_state.values["config"]("Hostnames").get(self.initials)
@@ -65,14 +65,15 @@ class Source(AbstractSearchSource):
 
         source_search = ""
         if search_string != "":
-            imdb_id = is_imdb_id(search_string)
+            context = context or SearchContext(shared_state, search_string)
+            imdb_id = context.imdb_id
             if imdb_id:
-                local_title = get_localized_title(shared_state, imdb_id, "en")
+                local_title = context.localized_title("en")
                 if not local_title:
                     info(f"No title for IMDb {imdb_id}")
                     return releases
                 if not season:
-                    year = get_year(imdb_id)
+                    year = context.year
                     if year:
                         local_title += f" {year}"
                 source_search = local_title
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Number of daily release feeds (today and the previous days) merged into one feed
+FEED_DAYS = 4
+# Feeds of past days rarely change, so they are kept much longer than today's feed
+PAST_DAY_FEED_TTL = 30 * 60
+
+_session = None
+_session_lock = threading.Lock()
+_feed_cache = {}
+_feed_cache_lock = threading.Lock()
+
+
+def _get_session():
+    """
+    Return the pooled session shared by all daily feed requests.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=FEED_DAYS * 2)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+
+def _fetch_day(host, user_agent, days):
+    # The API counts days relative to today, so past days are keyed by their date
+    cache_key = (host, date.today() - timedelta(days=days))
+    if days > 0:
+        with _feed_cache_lock:
+            data, expiry = _feed_cache.get(cache_key, (None, 0))
+        if data is not None and time.time() < expiry:
+            return data
+
+    url = f"https://{host}/api/releases/latest/{days}"
+    r = _get_session().get(url, headers={"User-Agent": user_agent}, timeout=30)
+    r.raise_for_status()
+    data = json.loads(r.content)
+
+    if days > 0:
+        now = time.time()
+        with _feed_cache_lock:
+            _feed_cache[cache_key] = (data, now + PAST_DAY_FEED_TTL)
+            for key in [k for k, (_, exp) in _feed_cache.items() if now >= exp]:
+                del _feed_cache[key]
+    return data
+
+
+def fetch_latest_releases(host, user_agent, days=FEED_DAYS):
+    """
+    Fetch the daily release feeds of a junkies site concurrently.
+
+    Returns a list of (days, data, error) tuples ordered from today backwards,
+    where exactly one of data and error is set for each day.
+    """
+    with ThreadPoolExecutor(max_workers=days) as executor:
+        futures = [
+            executor.submit(_fetch_day, host, user_agent, day) for day in range(days)
+        ]
+
+        results = []
+        for day, future in enumerate(futures):
+            try:
+                results.append((day, future.result(), None))
+            except Exception as e:
+                results.append((day, None, e))
+        return results
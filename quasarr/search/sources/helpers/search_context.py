@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+from quasarr.providers.imdb_metadata import get_imdb_metadata, get_localized_title
+
+# Languages of the localized titles that sources search for
+LANGUAGES = ("de", "en")
+
+
+class SearchContext:
+    """
+    Everything sources need to know about one search request, resolved once before fan-out.
+
+    For IMDb searches the year and the localized titles are resolved up front,
+    so every source searches for the same title without waiting on the others.
+    """
+
+    def __init__(self, shared_state, search_string="", languages=LANGUAGES):
+        # Lazy import to avoid circular dependency
+        from quasarr.providers.utils import is_imdb_id
+
+        self.search_string = search_string or ""
+        self.imdb_id = is_imdb_id(self.search_string)
+        self.year = None
+        self.localized_titles = {}
+
+        if self.imdb_id:
+            imdb_metadata = get_imdb_metadata(self.imdb_id)
+            if imdb_metadata:
+                self.year = imdb_metadata.get("year")
+            for language in languages:
+                self.localized_titles[language] = get_localized_title(
+                    shared_state, self.imdb_id, language
+                )
+
+    def localized_title(self, language="de"):
+        """
+        Return the title of the IMDb id in the given language, or None if it could not be resolved.
+        """
+        return self.localized_titles.get(language)
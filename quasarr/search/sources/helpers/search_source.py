@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 
 from quasarr.providers import shared_state
+from quasarr.search.sources.helpers.search_context import SearchContext
 from quasarr.search.sources.helpers.search_release import SearchRelease
 
 
@@ -38,7 +39,12 @@ class AbstractSearchSource(ABC):
         search_string: str = "",
         season: int = None,
         episode: int = None,
+        context: SearchContext = None,
     ) -> list[SearchRelease]:
+        """
+        context is the SearchContext resolved once per request before fan-out.
+        Sources build their own from search_string if it is missing.
+        """
         pass
 
     @abstractmethod
@@ -28,6 +28,7 @@ from quasarr.providers.utils import (
     is_imdb_id,
     is_valid_release,
 )
+from quasarr.search.sources.helpers.search_context import SearchContext
 from quasarr.search.sources.helpers.search_release import SearchRelease
 from quasarr.search.sources.helpers.search_source import AbstractSearchSource
 
@@ -142,6 +143,7 @@ class Source(AbstractSearchSource):
         search_string: str = "",
         season: int = None,
         episode: int = None,
+        context: SearchContext = None,
     ) -> list[SearchRelease]:
         """Search HS for releases by IMDb ID"""
         releases = []
@@ -149,7 +151,7 @@ class Source(AbstractSearchSource):
         password = hs
 
         # HS supports direct IMDb ID search
-        imdb_id = is_imdb_id(search_string)
+        imdb_id = context.imdb_id if context else is_imdb_id(search_string)
         if not imdb_id:
             debug(f"Only supports IMDb ID search, got: {search_string}")
             return releases
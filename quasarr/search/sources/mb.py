@@ -29,6 +29,7 @@ from quasarr.providers.utils import (
     is_imdb_id,
     is_valid_release,
 )
+from quasarr.search.sources.helpers.search_context import SearchContext
 from quasarr.search.sources.helpers.search_release import SearchRelease
 from quasarr.search.sources.helpers.search_source import AbstractSearchSource
 
@@ -195,11 +196,12 @@ class Source(AbstractSearchSource):
         search_string: str = "",
         season: int = None,
         episode: int = None,
+        context: SearchContext = None,
     ) -> list[SearchRelease]:
         mb = shared_state.values["config"]("Hostnames").get(self.initials)
 
         password = mb
-        imdb_id = is_imdb_id(search_string)
+        imdb_id = context.imdb_id if context else is_imdb_id(search_string)
         if imdb_id:
             search_string = imdb_id
 
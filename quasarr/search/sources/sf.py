@@ -13,16 +13,15 @@ from bs4 import BeautifulSoup
 from quasarr.constants import SEARCH_CAT_SHOWS, SEARCH_CAT_SHOWS_ANIME
 from quasarr.providers import shared_state
 from quasarr.providers.hostname_issues import clear_hostname_issue, mark_hostname_issue
-from quasarr.providers.imdb_metadata import get_localized_title
 from quasarr.providers.log import debug, info, trace, warn
 from quasarr.providers.utils import (
     convert_to_mb,
     generate_download_link,
     get_recently_searched,
-    is_imdb_id,
     is_valid_release,
     sanitize_string,
 )
+from quasarr.search.sources.helpers.search_context import SearchContext
 from quasarr.search.sources.helpers.search_release import SearchRelease
 from quasarr.search.sources.helpers.search_source import AbstractSearchSource
 
@@ -139,14 +138,16 @@ class Source(AbstractSearchSource):
         search_string: str = "",
         season: int = None,
         episode: int = None,
+        context: SearchContext = None,
     ) -> list[SearchRelease]:
         releases = []
         sf = shared_state.values["config"]("Hostnames").get(self.initials)
         password = check(sf)
 
-        imdb_id_in_search = is_imdb_id(search_string)
+        context = context or SearchContext(shared_state, search_string)
+        imdb_id_in_search = context.imdb_id
         if imdb_id_in_search:
-            search_string = get_localized_title(shared_state, imdb_id_in_search, "de")
+            search_string = context.localized_title("de")
             if not search_string:
                 info(f"Could not extract title from IMDb-ID {imdb_id_in_search}")
                 return releases
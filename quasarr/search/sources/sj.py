@@ -13,14 +13,14 @@ from bs4 import BeautifulSoup
 from quasarr.constants import SEARCH_CAT_SHOWS, SEARCH_CAT_SHOWS_ANIME
 from quasarr.providers import shared_state
 from quasarr.providers.hostname_issues import clear_hostname_issue, mark_hostname_issue
-from quasarr.providers.imdb_metadata import get_localized_title
 from quasarr.providers.log import debug, info, trace
 from quasarr.providers.utils import (
     generate_download_link,
-    is_imdb_id,
     is_valid_release,
     sanitize_string,
 )
+from quasarr.search.sources.helpers.junkies import fetch_latest_releases
+from quasarr.search.sources.helpers.search_context import SearchContext
 from quasarr.search.sources.helpers.search_release import SearchRelease
 from quasarr.search.sources.helpers.search_source import AbstractSearchSource
 
@@ -40,21 +40,13 @@ class Source(AbstractSearchSource):
         sj_host = shared_state.values["config"]("Hostnames").get(self.initials)
         password = sj_host
 
-        headers = {"User-Agent": shared_state.values["user_agent"]}
-
-        for days in range(4):
-            url = f"https://{sj_host}/api/releases/latest/{days}"
+        # Day feeds are fetched concurrently and merged from today backwards
+        day_feeds = fetch_latest_releases(sj_host, shared_state.values["user_agent"])
 
-            try:
-                r = requests.get(url, headers=headers, timeout=30)
-                r.raise_for_status()
-                data = json.loads(r.content)
-            except Exception as e:
-                info(f"feed load error: {e}")
-                mark_hostname_issue(
-                    self.initials, "feed", str(e) if "e" in dir() else "Error occurred"
-                )
-                return releases
+        for days, data, feed_error in day_feeds:
+            if feed_error:
+                info(f"feed load error (day {days}): {feed_error}")
+                continue
 
             for release in data:
                 try:
@@ -106,12 +98,13 @@ class Source(AbstractSearchSource):
                     debug(f"feed parse error: {e}")
                     continue
 
-            if releases:
-                break
-
         debug(f"Time taken: {time.time() - start_time:.2f}s")
 
-        if releases:
+        # A single failed day is skipped, the hostname only has an issue if every day failed
+        feed_errors = [feed_error for _, _, feed_error in day_feeds if feed_error]
+        if len(feed_errors) == len(day_feeds):
+            mark_hostname_issue(self.initials, "feed", str(feed_errors[0]))
+        elif releases:
             clear_hostname_issue(self.initials)
         return releases
 
@@ -123,17 +116,19 @@ class Source(AbstractSearchSource):
         search_string: str = "",
         season: int = None,
         episode: int = None,
+        context: SearchContext = None,
     ) -> list[SearchRelease]:
         releases = []
 
         sj_host = shared_state.values["config"]("Hostnames").get(self.initials)
         password = sj_host
 
-        imdb_id = is_imdb_id(search_string)
+        context = context or SearchContext(shared_state, search_string)
+        imdb_id = context.imdb_id
         if not imdb_id:
             return releases
 
-        localized_title = get_localized_title(shared_state, imdb_id, "de")
+        localized_title = context.localized_title("de")
         if not localized_title:
             info(f"no localized title for IMDb {imdb_id}")
             return releases
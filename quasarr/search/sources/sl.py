@@ -23,16 +23,15 @@ from quasarr.constants import (
 from quasarr.providers import shared_state
 from quasarr.providers.cloudflare import ensure_session_cf_bypassed
 from quasarr.providers.hostname_issues import clear_hostname_issue, mark_hostname_issue
-from quasarr.providers.imdb_metadata import get_localized_title
 from quasarr.providers.log import debug, info, warn
 from quasarr.providers.utils import (
     convert_to_mb,
     generate_download_link,
     get_base_search_category_id,
-    is_imdb_id,
     is_valid_release,
     normalize_magazine_title,
 )
+from quasarr.search.sources.helpers.search_context import SearchContext
 from quasarr.search.sources.helpers.search_release import SearchRelease
 from quasarr.search.sources.helpers.search_source import AbstractSearchSource
 
@@ -168,6 +167,7 @@ class Source(AbstractSearchSource):
         search_string: str = "",
         season: int = None,
         episode: int = None,
+        context: SearchContext = None,
     ) -> list[SearchRelease]:
         releases = []
 
@@ -189,9 +189,10 @@ class Source(AbstractSearchSource):
             return releases
 
         try:
-            imdb_id = is_imdb_id(search_string)
+            context = context or SearchContext(shared_state, search_string)
+            imdb_id = context.imdb_id
             if imdb_id:
-                search_string = get_localized_title(shared_state, imdb_id, "en") or ""
+                search_string = context.localized_title("en") or ""
                 search_string = html.unescape(search_string)
                 if not search_string:
                     info(f"Could not extract title from IMDb-ID {imdb_id}")
@@ -21,19 +21,23 @@ from quasarr.constants import (
     XXX_REGEX,
 )
 from quasarr.providers import shared_state
-from quasarr.providers.cloudflare import flaresolverr_get, is_cloudflare_challenge
+from quasarr.providers.cloudflare import (
+    apply_cf_clearance,
+    cf_clearance_store,
+    flaresolverr_solve_get,
+    is_cloudflare_challenge,
+)
 from quasarr.providers.hostname_issues import clear_hostname_issue, mark_hostname_issue
-from quasarr.providers.imdb_metadata import get_localized_title, get_year
 from quasarr.providers.log import debug, error, info, warn
 from quasarr.providers.utils import (
     convert_to_mb,
     generate_download_link,
     get_base_search_category_id,
     is_flaresolverr_available,
-    is_imdb_id,
     is_valid_release,
     normalize_magazine_title,
 )
+from quasarr.search.sources.helpers.search_context import SearchContext
 from quasarr.search.sources.helpers.search_release import SearchRelease
 from quasarr.search.sources.helpers.search_source import AbstractSearchSource
 
@@ -73,17 +77,20 @@ class Source(AbstractSearchSource):
         headers = {"User-Agent": shared_state.values["user_agent"]}
 
         try:
-            # Try normal request first
+            # Try normal request first, reusing a stored Cloudflare clearance
+            headers, cookies, clearance = apply_cf_clearance(url, headers)
             try:
-                r = requests.get(url, headers=headers, timeout=30)
+                r = requests.get(url, headers=headers, cookies=cookies, timeout=30)
             except requests.RequestException:
                 r = None
 
             # If blocked or failed, try FlareSolverr
             if r is None or r.status_code == 403 or is_cloudflare_challenge(r.text):
+                if clearance:
+                    cf_clearance_store.reject(url, clearance)
                 if is_flaresolverr_available(shared_state):
                     debug("Encountered Cloudflare on feed. Trying FlareSolverr...")
-                    r = flaresolverr_get(shared_state, url)
+                    r = flaresolverr_solve_get(shared_state, url)
                 elif r is None:
                     raise requests.RequestException(
                         "Connection failed and FlareSolverr not available"
@@ -122,20 +129,22 @@ class Source(AbstractSearchSource):
         search_string: str = "",
         season: int = None,
         episode: int = None,
+        context: SearchContext = None,
     ) -> list[SearchRelease]:
         releases = []
         wd = shared_state.values["config"]("Hostnames").get(self.initials)
         password = wd
 
-        imdb_id = is_imdb_id(search_string)
+        context = context or SearchContext(shared_state, search_string)
+        imdb_id = context.imdb_id
         if imdb_id:
-            search_string = get_localized_title(shared_state, imdb_id, "de")
+            search_string = context.localized_title("de")
             if not search_string:
                 info(f"Could not extract title from IMDb-ID {imdb_id}")
                 return releases
             search_string = html.unescape(search_string)
             if not season:
-                if year := get_year(imdb_id):
+                if year := context.year:
                     search_string += f" {year}"
 
         q = quote_plus(search_string)
@@ -143,17 +152,20 @@ class Source(AbstractSearchSource):
         headers = {"User-Agent": shared_state.values["user_agent"]}
 
         try:
-            # Try normal request first
+            # Try normal request first, reusing a stored Cloudflare clearance
+            headers, cookies, clearance = apply_cf_clearance(url, headers)
             try:
-                r = requests.get(url, headers=headers, timeout=30)
+                r = requests.get(url, headers=headers, cookies=cookies, timeout=30)
             except requests.RequestException:
                 r = None
 
             # If blocked or failed, try FlareSolverr
             if r is None or r.status_code == 403 or is_cloudflare_challenge(r.text):
+                if clearance:
+                    cf_clearance_store.reject(url, clearance)
                 if is_flaresolverr_available(shared_state):
                     debug("Encountered Cloudflare on search. Trying FlareSolverr...")
-                    r = flaresolverr_get(shared_state, url)
+                    r = flaresolverr_solve_get(shared_state, url)
                 elif r is None:
                     raise requests.RequestException(
                         "Connection failed and FlareSolverr not available"
@@ -18,14 +18,13 @@ from quasarr.constants import (
 )
 from quasarr.providers import shared_state
 from quasarr.providers.hostname_issues import clear_hostname_issue, mark_hostname_issue
-from quasarr.providers.imdb_metadata import get_localized_title, get_year
 from quasarr.providers.log import debug, error, trace, warn
 from quasarr.providers.utils import (
     generate_download_link,
     get_base_search_category_id,
-    is_imdb_id,
     is_valid_release,
 )
+from quasarr.search.sources.helpers.search_context import SearchContext
 from quasarr.search.sources.helpers.search_release import SearchRelease
 from quasarr.search.sources.helpers.search_source import AbstractSearchSource
 
@@ -161,6 +160,7 @@ class Source(AbstractSearchSource):
         search_string: str = "",
         season: int = None,
         episode: int = None,
+        context: SearchContext = None,
     ) -> list[SearchRelease]:
         """
         Search using internal API.
@@ -171,10 +171,11 @@ class Source(AbstractSearchSource):
 
         base_search_category = get_base_search_category_id(search_category)
 
-        imdb_id = is_imdb_id(search_string)
+        context = context or SearchContext(shared_state, search_string)
+        imdb_id = context.imdb_id
         if imdb_id:
             debug(f"Received IMDb ID: <y>{imdb_id}</y>")
-            title = get_localized_title(shared_state, imdb_id, "de")
+            title = context.localized_title("de")
             if not title:
                 error(f"No title found for IMDb '{imdb_id}'")
                 return releases
@@ -199,7 +200,7 @@ class Source(AbstractSearchSource):
             "selectedGenres": "",
             "types": "movie,series,anime",
             "genres": "",
-            "years": year if (year := get_year(imdb_id)) else "",
+            "years": context.year or "",
             "ratings": "",
             "page": 1,
             "sortBy": "latest",
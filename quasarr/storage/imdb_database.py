@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+"""
+Normalized storage for IMDb metadata.
+
+One row per IMDb id holds title, year and poster, each with its own expiry,
+and one row per (IMDb id, language) holds a localized title. Fields are
+updated with atomic upserts, so writing a poster or a localized title never
+rewrites the rest of the record.
+
+The key/value DataBase class cannot express typed columns, upserts or joins,
+so these tables keep their own process-local connection to Quasarr.db.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from json import loads
+
+from quasarr.providers.log import debug, info
+
+# Expired rows are kept this long as stale fallback before the sweep removes them
+STALE_GRACE = 30 * 24 * 60 * 60
+
+_FIELDS = {
+    "title": "title_expires",
+    "year": "year_expires",
+    "poster_link": "poster_expires",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS imdb_titles (
+    imdb_id TEXT PRIMARY KEY,
+    title TEXT,
+    title_expires REAL DEFAULT 0,
+    year INTEGER,
+    year_expires REAL DEFAULT 0,
+    poster_link TEXT,
+    poster_expires REAL DEFAULT 0,
+    expires REAL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS imdb_titles_expires ON imdb_titles (expires);
+CREATE TABLE IF NOT EXISTS imdb_localized_titles (
+    imdb_id TEXT NOT NULL,
+    language TEXT NOT NULL,
+    title TEXT,
+    expires REAL DEFAULT 0,
+    PRIMARY KEY (imdb_id, language)
+);
+CREATE INDEX IF NOT EXISTS imdb_localized_titles_expires ON imdb_localized_titles (expires);
+"""
+
+
+class IMDbDatabase:
+    """
+    Process-local connection to the IMDb tables in Quasarr.db.
+    """
+
+    def __init__(self):
+        self._conn = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        # Import shared_state inside the method to avoid circular import
+        from quasarr.providers import shared_state
+
+        conn = sqlite3.connect(
+            shared_state.values["dbfile"], check_same_thread=False, timeout=10
+        )
+        conn.executescript(_SCHEMA)
+        self._migrate_legacy_table(conn)
+        conn.commit()
+        self._sweep(conn, STALE_GRACE)
+        return conn
+
+    @staticmethod
+    def _migrate_legacy_table(conn):
+        """
+        Move records of the former key/value "imdb_metadata" table into the normalized tables.
+        """
+        if not conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'imdb_metadata'"
+        ).fetchall():
+            return
+
+        migrated = 0
+        for imdb_id, value in conn.execute("SELECT key, value FROM imdb_metadata"):
+            try:
+                metadata = loads(value)
+            except (TypeError, ValueError):
+                continue
+            expires = metadata.get("ttl") or 0
+            conn.execute(
+                "INSERT OR REPLACE INTO imdb_titles VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    imdb_id,
+                    metadata.get("title"),
+                    expires,
+                    metadata.get("year"),
+                    expires,
+                    metadata.get("poster_link"),
+                    expires,
+                    expires,
+                ),
+            )
+            localized = metadata.get("localized")
+            if isinstance(localized, dict):
+                conn.executemany(
+                    "INSERT OR REPLACE INTO imdb_localized_titles VALUES (?, ?, ?, ?)",
+                    [
+                        (imdb_id, language, title, expires)
+                        for language, title in localized.items()
+                        if title
+                    ],
+                )
+            migrated += 1
+
+        conn.execute("DROP TABLE imdb_metadata")
+        info(f"Migrated {migrated} IMDb metadata records to the normalized tables")
+
+    def _ensure_connection(self):
+        # Connections must not be shared with forked processes
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = self._connect()
+            self._pid = os.getpid()
+
+    def _execute(self, query, params=(), commit=False):
+        with self._lock:
+            self._ensure_connection()
+            cursor = self._conn.execute(query, params)
+            rows = cursor.fetchall()
+            if commit:
+                self._conn.commit()
+            return rows
+
+    def _execute_transaction(self, statements):
+        """
+        Run a list of (query, params) in one transaction, which is rolled back if any of them fails.
+        """
+        with self._lock:
+            self._ensure_connection()
+            with self._conn:
+                for query, params in statements:
+                    self._conn.execute(query, params)
+
+    def retrieve(self, imdb_id, include_expired=False):
+        """
+        Return the metadata of imdb_id as dict, or None if nothing is stored.
+        Expired fields are returned as None unless include_expired is set.
+        """
+        rows = self._execute(
+            "SELECT t.title, t.title_expires, t.year, t.year_expires, t.poster_link, "
+            "t.poster_expires, t.expires, l.language, l.title, l.expires "
+            "FROM imdb_titles t LEFT JOIN imdb_localized_titles l ON l.imdb_id = t.imdb_id "
+            "WHERE t.imdb_id = ?",
+            (imdb_id,),
+        )
+        if not rows:
+            return None
+
+        now = time.time()
+
+        def valid(value, expires):
+            return value if include_expired or (expires or 0) > now else None
+
+        first = rows[0]
+        metadata = {
+            "title": valid(first[0], first[1]),
+            "year": valid(first[2], first[3]),
+            "poster_link": valid(first[4], first[5]),
+            "localized": {},
+            "ttl": first[6] or 0,
+        }
+        for row in rows:
+            language, title = row[7], valid(row[8], row[9])
+            if language and title:
+                metadata["localized"][language] = title
+        return metadata
+
+    def update_fields(self, imdb_id, fields, expires, record_expires=None):
+        """
+        Atomically set the given fields (title, year, poster_link) with a shared expiry.
+        The record expiry is only ever extended, never shortened.
+        """
+        columns = [name for name in fields if name in _FIELDS]
+        assignments = [f"{name}, {_FIELDS[name]}" for name in columns]
+        values = []
+        for name in columns:
+            values.extend((fields[name], expires))
+
+        record_expires = record_expires or expires
+        column_list = ", ".join(["imdb_id", *assignments, "expires"])
+        placeholders = ", ".join("?" * (len(values) + 2))
+        updates = ", ".join(
+            [f"{name} = excluded.{name}" for name in columns]
+            + [f"{_FIELDS[name]} = excluded.{_FIELDS[name]}" for name in columns]
+            + ["expires = MAX(imdb_titles.expires, excluded.expires)"]
+        )
+        self._execute(
+            f"INSERT INTO imdb_titles ({column_list}) VALUES ({placeholders}) "
+            f"ON CONFLICT(imdb_id) DO UPDATE SET {updates}",
+            (imdb_id, *values, record_expires),
+            commit=True,
+        )
+
+    def update_localized_title(self, imdb_id, language, title, expires):
+        # The localized title needs its parent record, both are written together or not at all
+        self._execute_transaction(
+            [
+                (
+                    "INSERT INTO imdb_titles (imdb_id, expires) VALUES (?, ?) "
+                    "ON CONFLICT(imdb_id) DO UPDATE SET "
+                    "expires = MAX(imdb_titles.expires, excluded.expires)",
+                    (imdb_id, expires),
+                ),
+                (
+                    "INSERT INTO imdb_localized_titles VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(imdb_id, language) DO UPDATE SET "
+                    "title = excluded.title, expires = excluded.expires",
+                    (imdb_id, language, title, expires),
+                ),
+            ]
+        )
+
+    def all_titles(self):
+        """
+        Return (imdb_id, title, year) for every stored title and localized title.
+        """
+        return self._execute(
+            "SELECT imdb_id, title, year FROM imdb_titles WHERE title IS NOT NULL "
+            "UNION SELECT l.imdb_id, l.title, t.year FROM imdb_localized_titles l "
+            "JOIN imdb_titles t ON t.imdb_id = l.imdb_id WHERE l.title IS NOT NULL"
+        )
+
+    @staticmethod
+    def _sweep(conn, grace):
+        cutoff = time.time() - grace
+        localized = conn.execute(
+            "DELETE FROM imdb_localized_titles WHERE expires < ?", (cutoff,)
+        ).rowcount
+        titles = conn.execute(
+            "DELETE FROM imdb_titles WHERE expires < ? AND imdb_id NOT IN "
+            "(SELECT imdb_id FROM imdb_localized_titles)",
+            (cutoff,),
+        ).rowcount
+        conn.commit()
+        if localized or titles:
+            debug(
+                f"Swept {titles} expired IMDb records and {localized} localized titles"
+            )
+        return titles, localized
+
+    def sweep(self, grace=STALE_GRACE):
+        """
+        Delete records and localized titles that expired longer than grace seconds ago.
+        Returns the number of deleted records and localized titles.
+        """
+        with self._lock:
+            self._ensure_connection()
+            return self._sweep(self._conn, grace)
+
+    def get_stats(self):
+        """
+        Return counts of cached records and of records with title, poster and localized titles.
+        """
+        total, with_title, with_poster = self._execute(
+            "SELECT COUNT(*), COUNT(title), COUNT(poster_link) FROM imdb_titles"
+        )[0]
+        with_localized = self._execute(
+            "SELECT COUNT(DISTINCT imdb_id) FROM imdb_localized_titles WHERE title IS NOT NULL"
+        )[0][0]
+        return {
+            "imdb_total_cached": total,
+            "imdb_with_title": with_title,
+            "imdb_with_poster": with_poster,
+            "imdb_with_localized": with_localized,
+        }
+
+
+imdb_database = IMDbDatabase()
@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+"""
+Optional offline copy of IMDb's public title.basics / title.akas datasets.
+
+If the IMDB_DATASET variable points to a directory holding title.basics.tsv.gz
+and title.akas.tsv.gz, both dumps are streamed into IMDb.db next to Quasarr.db.
+Titles and years can then be resolved without any network request.
+The import runs in chunks into staging tables that replace the live tables
+once complete, so lookups never see a partial import.
+"""
+
+import csv
+import gzip
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+from quasarr.providers.log import debug, error, info
+
+BASICS_FILE = "title.basics.tsv.gz"
+AKAS_FILE = "title.akas.tsv.gz"
+CHUNK_SIZE = 10000
+# Part of the import signature, so a changed table layout triggers a new import
+SCHEMA_VERSION = 2
+
+# Only titles that can be searched by Radarr/Sonarr are imported
+TITLE_TYPES = {"movie", "tvMovie", "tvSeries", "tvMiniSeries"}
+# Localized titles are imported for these regions, stored under the lowercase region code
+AKA_REGIONS = {"DE"}
+
+_NULL = "\\N"
+
+
+def _dataset_dir():
+    return os.environ.get("IMDB_DATASET", "")
+
+
+def _read_tsv(path):
+    # Field sizes of some akas rows exceed the csv default
+    csv.field_size_limit(min(sys.maxsize, 2**31 - 1))
+    with gzip.open(path, "rt", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE)
+        header = next(reader, None)
+        if not header:
+            return
+        columns = {name: i for i, name in enumerate(header)}
+        for row in reader:
+            if len(row) == len(header):
+                yield columns, row
+
+
+def _insert_chunked(conn, query, rows):
+    chunk = []
+    count = 0
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= CHUNK_SIZE:
+            conn.executemany(query, chunk)
+            conn.commit()
+            count += len(chunk)
+            chunk.clear()
+    if chunk:
+        conn.executemany(query, chunk)
+        conn.commit()
+        count += len(chunk)
+    return count
+
+
+def _basics_rows(path):
+    from quasarr.providers.utils import sanitize_string
+
+    for c, row in _read_tsv(path):
+        if row[c["titleType"]] not in TITLE_TYPES:
+            continue
+        year = row[c["startYear"]]
+        yield (
+            row[c["tconst"]],
+            row[c["titleType"]],
+            row[c["primaryTitle"]],
+            int(year) if year.isdigit() else None,
+            sanitize_string(row[c["primaryTitle"]]),
+        )
+
+
+def _akas_rows(path):
+    from quasarr.providers.utils import sanitize_string
+
+    for c, row in _read_tsv(path):
+        region = row[c["region"]]
+        # Same rule as the API tier: country specific titles without explicit language
+        if region not in AKA_REGIONS or row[c["language"]] != _NULL:
+            continue
+        preferred = 1 if "imdbDisplay" in row[c["types"]] else 0
+        yield (
+            row[c["titleId"]],
+            region.lower(),
+            row[c["title"]],
+            preferred,
+            sanitize_string(row[c["title"]]),
+        )
+
+
+def _file_signature(path):
+    stat = os.stat(path)
+    return f"{stat.st_size}:{int(stat.st_mtime)}"
+
+
+def import_imdb_dataset(dbfile, dataset_dir):
+    """
+    Import the dataset dumps from dataset_dir into dbfile, unless the same files were imported before.
+    Returns True if an import took place.
+    """
+    basics_path = os.path.join(dataset_dir, BASICS_FILE)
+    akas_path = os.path.join(dataset_dir, AKAS_FILE)
+    if not os.path.isfile(basics_path):
+        error(f'IMDb dataset "{basics_path}" not found')
+        return False
+    has_akas = os.path.isfile(akas_path)
+    signature = f"{SCHEMA_VERSION}|{_file_signature(basics_path)}" + (
+        f"|{_file_signature(akas_path)}" if has_akas else ""
+    )
+
+    conn = sqlite3.connect(dbfile, timeout=30)
+    try:
+        conn.execute("CREATE TABLE IF NOT EXISTS dataset_meta (key PRIMARY KEY, value)")
+        imported = conn.execute(
+            "SELECT value FROM dataset_meta WHERE key = 'signature'"
+        ).fetchone()
+        if imported and imported[0] == signature:
+            debug("IMDb dataset is up to date")
+            return False
+
+        start_time = time.time()
+        info("Importing IMDb dataset. This may take a few minutes...")
+        conn.executescript("""
+            DROP TABLE IF EXISTS titles_import;
+            DROP TABLE IF EXISTS akas_import;
+            CREATE TABLE titles_import (
+                imdb_id TEXT PRIMARY KEY,
+                title_type TEXT,
+                title TEXT,
+                year INTEGER,
+                search_title TEXT
+            );
+            CREATE TABLE akas_import (
+                imdb_id TEXT NOT NULL,
+                language TEXT NOT NULL,
+                title TEXT,
+                preferred INTEGER,
+                search_title TEXT,
+                PRIMARY KEY (imdb_id, language)
+            );
+        """)
+
+        title_count = _insert_chunked(
+            conn,
+            "INSERT OR REPLACE INTO titles_import VALUES (?, ?, ?, ?, ?)",
+            _basics_rows(basics_path),
+        )
+        aka_count = 0
+        if has_akas:
+            # The first title per language wins, unless a later one is IMDb's display title
+            aka_count = _insert_chunked(
+                conn,
+                "INSERT INTO akas_import VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(imdb_id, language) DO UPDATE SET "
+                "title = excluded.title, preferred = excluded.preferred, "
+                "search_title = excluded.search_title "
+                "WHERE excluded.preferred > akas_import.preferred",
+                _akas_rows(akas_path),
+            )
+
+        # Indexes are created after loading, which is much faster than maintaining them.
+        # Index names survive the rename, so they are created once the old tables are gone.
+        conn.executescript(f"""
+            BEGIN;
+            DROP TABLE IF EXISTS titles;
+            DROP TABLE IF EXISTS akas;
+            CREATE INDEX titles_search ON titles_import (search_title);
+            CREATE INDEX akas_search ON akas_import (search_title);
+            ALTER TABLE titles_import RENAME TO titles;
+            ALTER TABLE akas_import RENAME TO akas;
+            INSERT OR REPLACE INTO dataset_meta VALUES ('signature', '{signature}');
+            COMMIT;
+        """)
+        info(
+            f"Imported {title_count} IMDb titles and {aka_count} localized titles "
+            f"in {time.time() - start_time:.0f} seconds"
+        )
+        return True
+    finally:
+        conn.close()
+
+
+def imdb_dataset_importer(shared_state_dict, shared_state_lock):
+    """
+    Process entry point, imports the dataset configured through IMDB_DATASET.
+    """
+    from quasarr.providers import shared_state
+
+    try:
+        shared_state.set_state(shared_state_dict, shared_state_lock)
+        import_imdb_dataset(shared_state.values["imdb_dataset_dbfile"], _dataset_dir())
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        error(f"IMDb dataset import failed: {e}")
+
+
+class IMDbDataset:
+    """
+    Read access to the imported dataset. Lookups return None if no dataset was imported.
+    """
+
+    def __init__(self):
+        self._conn = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _query(self, query, params):
+        # Import shared_state inside the method to avoid circular import
+        from quasarr.providers import shared_state
+
+        if not _dataset_dir():
+            return None
+
+        with self._lock:
+            # Connections must not be shared with forked processes
+            if self._conn is None or self._pid != os.getpid():
+                dbfile = shared_state.values.get("imdb_dataset_dbfile")
+                if not dbfile or not os.path.isfile(dbfile):
+                    return None
+                self._conn = sqlite3.connect(
+                    f"file:{dbfile}?mode=ro", uri=True, check_same_thread=False
+                )
+                self._pid = os.getpid()
+            try:
+                return self._conn.execute(query, params).fetchall()
+            except sqlite3.OperationalError:
+                # Tables do not exist until the first import completed
+                return None
+
+    def get_title(self, imdb_id):
+        """
+        Returns a tuple (title, year) or None.
+        """
+        rows = self._query(
+            "SELECT title, year FROM titles WHERE imdb_id = ?", (imdb_id,)
+        )
+        return rows[0] if rows else None
+
+    def get_localized_title(self, imdb_id, language):
+        rows = self._query(
+            "SELECT title FROM akas WHERE imdb_id = ? AND language = ?",
+            (imdb_id, language),
+        )
+        return rows[0][0] if rows else None
+
+    def find_titles(self, search_title):
+        """
+        Return (imdb_id, title_type, year) of all titles whose sanitized title or
+        localized title equals search_title (see sanitize_string).
+        """
+        return (
+            self._query(
+                "SELECT imdb_id, title_type, year FROM titles WHERE search_title = ? "
+                "UNION SELECT t.imdb_id, t.title_type, t.year FROM akas a "
+                "JOIN titles t ON t.imdb_id = a.imdb_id WHERE a.search_title = ?",
+                (search_title, search_title),
+            )
+            or []
+        )
+
+
+imdb_dataset = IMDbDataset()
@@ -82,6 +82,23 @@ class DataBase(object):
         self._conn.commit()
         return True
 
+    def delete_many(self, keys, also_from=()):
+        """
+        Delete all keys from this table and the tables in also_from in one transaction.
+        """
+        params = [(key,) for key in keys]
+        with self._conn:
+            for table in [self._table, *also_from]:
+                self._conn.executemany(f"DELETE FROM {table} WHERE key=?", params)
+        return True
+
+    def create_index(self):
+        self._conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {self._table}_key ON {self._table} (key)"
+        )
+        self._conn.commit()
+        return True
+
     def reset(self):
         self._conn.execute(f"DROP TABLE IF EXISTS {self._table}")
         self._conn.commit()
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from quasarr.providers import shared_state
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def load_fixture(name):
+    with open(FIXTURES / name, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture(autouse=True)
+def state(tmp_path):
+    """
+    Fresh shared state for every test, with Quasarr.db in a temporary directory.
+    """
+    previous = shared_state.values, shared_state.lock
+    shared_state.set_state({"dbfile": str(tmp_path / "Quasarr.db")}, threading.Lock())
+    yield shared_state
+    shared_state.set_state(*previous)
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from quasarr.providers import cache_maintenance, xem_metadata
+from quasarr.providers.cache_maintenance import (
+    HOT_WINDOW,
+    REFRESH_AHEAD,
+    CacheMaintenance,
+)
+from quasarr.providers.imdb_metadata import IMDbMetadataCache
+
+
+@pytest.fixture
+def caches(monkeypatch, state):
+    """
+    Fresh XEM and IMDb caches, with TheXEM and IMDb refreshes recorded instead of fetched.
+    """
+    state.values["user_agent"] = "Quasarr tests"
+    fetched = SimpleNamespace(xem=[], imdb=[], sweeps=0)
+
+    class Response:
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return {"result": "success", "data": {"1": "Season One"}}
+
+    def get(url, params=None, **kwargs):
+        fetched.xem.append(params["id"])
+        return Response()
+
+    def refresh_imdb_metadata(imdb_id):
+        fetched.imdb.append(imdb_id)
+        return True
+
+    def sweep():
+        fetched.sweeps += 1
+
+    monkeypatch.setattr(xem_metadata, "_season_names_cache", {})
+    monkeypatch.setattr(xem_metadata, "_season_names_accessed", {})
+    monkeypatch.setattr(xem_metadata.requests, "get", get)
+    # allNames was never looked up, so it is cold
+    monkeypatch.setattr(
+        cache_maintenance,
+        "xem_name_index",
+        SimpleNamespace(last_access=0, ttl=0, refresh=lambda: None),
+    )
+    monkeypatch.setattr(cache_maintenance, "imdb_metadata_cache", IMDbMetadataCache())
+    monkeypatch.setattr(
+        cache_maintenance, "refresh_imdb_metadata", refresh_imdb_metadata
+    )
+    monkeypatch.setattr(
+        cache_maintenance, "imdb_database", SimpleNamespace(sweep=sweep)
+    )
+    return fetched
+
+
+def look_up_season_names(tvdb_id, accessed_ago, expires_in):
+    """
+    Look up the season names of tvdb_id, then age the lookup and the cached entry.
+    """
+    xem_metadata._fetch_season_names(tvdb_id)
+    now = time.time()
+    xem_metadata._season_names_accessed[tvdb_id] = now - accessed_ago
+    data, _ = xem_metadata._season_names_cache[tvdb_id]
+    xem_metadata._season_names_cache[tvdb_id] = (data, now + expires_in)
+
+
+def look_up_imdb_metadata(imdb_id, accessed_ago, expires_in):
+    now = time.time()
+    imdb_cache = cache_maintenance.imdb_metadata_cache
+    imdb_cache.set(imdb_id, {"title": imdb_id, "ttl": now + expires_in})
+    imdb_cache.accessed[imdb_id] = now - accessed_ago
+
+
+def persisted_season_names(tvdb_id):
+    return xem_metadata._get_db("xem_season_names").retrieve(tvdb_id)
+
+
+def test_hot_entries_are_refreshed_ahead_of_expiry(caches):
+    look_up_season_names("hot", accessed_ago=60, expires_in=60)
+    look_up_season_names("fresh", accessed_ago=60, expires_in=2 * REFRESH_AHEAD)
+    look_up_season_names("cold", accessed_ago=HOT_WINDOW + 60, expires_in=60)
+    look_up_imdb_metadata("tt1", accessed_ago=60, expires_in=60)
+    look_up_imdb_metadata("tt2", accessed_ago=HOT_WINDOW + 60, expires_in=60)
+    caches.xem.clear()
+
+    assert CacheMaintenance(budget=10).run_once() == 2
+
+    assert caches.xem == ["hot"]
+    assert caches.imdb == ["tt1"]
+    assert xem_metadata._season_names_cache["hot"][1] > time.time() + REFRESH_AHEAD
+    # Cold entries are evicted from memory and from the persisted cache
+    assert set(xem_metadata._season_names_accessed) == {"hot", "fresh"}
+    assert "cold" not in xem_metadata._season_names_cache
+    assert persisted_season_names("cold") is None
+    assert list(cache_maintenance.imdb_metadata_cache.accessed) == ["tt1"]
+
+
+def test_refreshes_are_capped_by_budget(caches):
+    for tvdb_id in ("a", "b", "c"):
+        look_up_season_names(tvdb_id, accessed_ago=60, expires_in=60)
+    caches.xem.clear()
+
+    maintenance = CacheMaintenance(budget=2)
+    assert maintenance.run_once() == 2
+    assert maintenance.run_once() == 0
+    assert len(caches.xem) == 2
+
+
+def test_database_is_swept_once_per_interval(caches):
+    maintenance = CacheMaintenance(budget=10)
+    maintenance.run_once()
+    maintenance.run_once()
+    assert caches.sweeps == 1
+
+    maintenance.last_sweep -= cache_maintenance.SWEEP_INTERVAL
+    maintenance.run_once()
+    assert caches.sweeps == 2
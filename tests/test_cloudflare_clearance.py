@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from quasarr.providers import cloudflare
+from quasarr.providers.cloudflare import (
+    CloudflareClearanceStore,
+    FlareSolverrResponse,
+    flaresolverr_solve_get,
+)
+
+URL = "https://wd.example/Movies"
+CHALLENGE = "<html><head><title>Just a moment...</title></head></html>"
+
+
+@pytest.fixture
+def site(state, monkeypatch):
+    """
+    A Cloudflare protected site, that lets plain requests through once FlareSolverr solved it.
+    """
+    state.values["user_agent"] = "Quasarr tests"
+    store = CloudflareClearanceStore()
+    monkeypatch.setattr(cloudflare, "cf_clearance_store", store)
+    site = SimpleNamespace(solves=0, plain_requests=0)
+
+    def flaresolverr_get(shared_state, url, timeout=30, session_id=None):
+        site.solves += 1
+        # Give the other thread time to queue up behind the solve
+        time.sleep(0.2)
+        store.put(
+            url,
+            [{"name": "cf_clearance", "value": f"solve{site.solves}", "path": "/"}],
+            "FlareSolverr UA",
+        )
+        return FlareSolverrResponse(url, 200, {}, "<html>solved</html>")
+
+    def get(url, headers=None, cookies=None, timeout=None):
+        site.plain_requests += 1
+        cleared = (cookies or {}).get("cf_clearance") and headers["User-Agent"] == (
+            "FlareSolverr UA"
+        )
+        return SimpleNamespace(
+            url=url,
+            status_code=200 if cleared else 403,
+            text="<html>plain</html>" if cleared else CHALLENGE,
+        )
+
+    monkeypatch.setattr(cloudflare, "flaresolverr_get", flaresolverr_get)
+    monkeypatch.setattr(cloudflare.requests, "get", get)
+    return site
+
+
+def test_concurrent_requests_share_one_solve(site, state):
+    barrier = threading.Barrier(2)
+    responses = []
+
+    def fetch():
+        barrier.wait()
+        responses.append(flaresolverr_solve_get(state, URL).text)
+
+    threads = [threading.Thread(target=fetch) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert site.solves == 1
+    assert sorted(responses) == ["<html>plain</html>", "<html>solved</html>"]
+
+
+def test_rejected_clearance_is_solved_again(site, state):
+    flaresolverr_solve_get(state, URL)
+    # Cloudflare no longer accepts the stored clearance
+    cloudflare.cf_clearance_store.clearances["wd.example"]["user_agent"] = "Other UA"
+
+    assert flaresolverr_solve_get(state, URL).text == "<html>solved</html>"
+    assert site.solves == 2
+    assert site.plain_requests == 1
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+"""
+Replays recorded DL search pages against the pipelined and the sequential page walk.
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from conftest import load_fixture
+
+from quasarr.search.sources import dl
+
+HOST = "dl.example"
+SEARCH_STRING = "Foo Bar"
+SEARCH_CATEGORY = 2000
+
+
+@pytest.fixture
+def replay(monkeypatch, state):
+    """
+    Serve a recorded page sequence, each page with a small delay.
+    Returns the requested page numbers and the peak number of page fetches in flight.
+    gate, if given, is called with the page number before a page is served.
+    """
+
+    def use(name, delay=0.05, gate=None):
+        recording = load_fixture("dl_search.json")[name]
+        replayed = SimpleNamespace(requested=[], in_flight=0, peak=0)
+        lock = threading.Lock()
+
+        def fetch(shared_state, method, target_url, get_params=None, timeout=10):
+            page_num = int(get_params.get("page", 1))
+            with lock:
+                replayed.requested.append(page_num)
+                replayed.in_flight += 1
+                replayed.peak = max(replayed.peak, replayed.in_flight)
+            try:
+                if gate:
+                    gate(page_num)
+                time.sleep(delay)
+            finally:
+                with lock:
+                    replayed.in_flight -= 1
+            page = recording["pages"].get(str(page_num))
+            if page is None:
+                return SimpleNamespace(status_code=404, url=target_url, text="")
+            return SimpleNamespace(
+                status_code=page["status"],
+                url=f"https://www.{HOST}/search/{recording['search_id']}/?q=foo",
+                text=page["html"],
+            )
+
+        monkeypatch.setattr(dl, "fetch_via_requests_session", fetch)
+        return replayed
+
+    state.values["config"] = lambda section: {"dl": HOST}
+    monkeypatch.setattr(dl, "retrieve_and_validate_session", lambda s: True)
+    monkeypatch.setattr(
+        dl, "generate_download_link", lambda shared_state, title, url, *args: url
+    )
+    return use
+
+
+def sequential_search(source, shared_state):
+    """
+    The previous page walk: one page at a time until a stop condition is met.
+    """
+    releases = []
+    search_id = None
+    page_num = 0
+    release_titles_per_page = set()
+    while True:
+        page_num += 1
+        page_releases, extracted_search_id = source._search_single_page(
+            shared_state,
+            HOST,
+            SEARCH_STRING,
+            search_id,
+            page_num,
+            None,
+            SEARCH_CATEGORY,
+            None,
+            None,
+        )
+        page_release_titles = tuple(pr["details"]["title"] for pr in page_releases)
+        if page_release_titles in release_titles_per_page:
+            break
+        release_titles_per_page.add(page_release_titles)
+        if page_num == 1:
+            search_id = extracted_search_id
+            if not search_id:
+                break
+        releases.extend(page_releases)
+        if not page_releases:
+            break
+    return releases
+
+
+@pytest.mark.parametrize("recording", ["duplicate_last_page", "empty_page"])
+def test_pipelined_search_matches_sequential_walk(replay, state, recording):
+    source = dl.Source()
+
+    replay(recording)
+    expected = sequential_search(source, state)
+
+    replay(recording)
+    releases = source.search(state, time.time(), SEARCH_CATEGORY, SEARCH_STRING)
+
+    assert releases == expected
+    assert expected
+
+
+def test_duplicate_page_stops_search(replay, state):
+    requested = replay("duplicate_last_page").requested
+    releases = dl.Source().search(state, time.time(), SEARCH_CATEGORY, SEARCH_STRING)
+
+    # Pages 1-5 carry three releases each, page 6 repeats page 5
+    assert len(releases) == 15
+    assert [r["details"]["title"] for r in releases][:3] == [
+        "Foo.Bar.2001.German.DL.1080p.BluRay.x264-GRP1",
+        "Foo.Bar.2001.German.DL.2160p.UHD.BluRay.x265-GRP1",
+        "Foo.Bar.2001.German.DL.720p.WEB.h264-GRP1",
+    ]
+    # Pages past the stop may have been requested, but never more than the pipeline holds
+    assert max(requested) <= 6 + dl.MAX_PARALLEL_PAGES - 1
+
+
+def test_follow_up_pages_are_fetched_concurrently(replay, state):
+    # The first follow-up pages are only served once all of them were requested,
+    # a page walk that fetches one page at a time breaks the barrier
+    barrier = threading.Barrier(dl.MAX_PARALLEL_PAGES, timeout=5)
+    first_window = range(2, 2 + dl.MAX_PARALLEL_PAGES)
+
+    def gate(page_num):
+        if page_num in first_window:
+            barrier.wait()
+
+    replayed = replay("duplicate_last_page", delay=0, gate=gate)
+    releases = dl.Source().search(state, time.time(), SEARCH_CATEGORY, SEARCH_STRING)
+
+    assert not barrier.broken
+    assert len(releases) == 15
+    assert replayed.peak == dl.MAX_PARALLEL_PAGES
+
+
+@pytest.mark.benchmark
+def test_pipelined_search_benchmark(replay, state):
+    source = dl.Source()
+    delay = 0.2
+    results = {}
+    for mode, search in (
+        ("sequential", lambda: sequential_search(source, state)),
+        (
+            "pipelined",
+            lambda: source.search(state, time.time(), SEARCH_CATEGORY, SEARCH_STRING),
+        ),
+    ):
+        replay("duplicate_last_page", delay=delay)
+        start = time.perf_counter()
+        search()
+        results[mode] = time.perf_counter() - start
+
+    print(
+        f"\nDL search over 6 pages, {delay * 1000:.0f}ms per page: "
+        + ", ".join(f"{mode} {seconds:.2f}s" for mode, seconds in results.items())
+    )
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+"""
+Runs the FlareSolverr session pool against a stand-in FlareSolverr server.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from quasarr.providers import cloudflare
+from quasarr.providers.cloudflare import FlareSolverrSessionPool, flaresolverr_get
+
+
+class StandInFlareSolverr(ThreadingHTTPServer):
+    """
+    Answers sessions.* and request.* commands like FlareSolverr and counts session creations.
+    """
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.sessions = set()
+        self.created = 0
+        self.commands = []
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+    def handle_command(self, payload):
+        with self.lock:
+            self.commands.append(payload)
+            cmd = payload["cmd"]
+            if cmd == "sessions.create":
+                self.sessions.add(payload["session"])
+                self.created += 1
+                return {"status": "ok", "session": payload["session"]}
+            if cmd == "sessions.destroy":
+                self.sessions.discard(payload["session"])
+                return {"status": "ok"}
+            if cmd == "sessions.list":
+                return {"status": "ok", "sessions": sorted(self.sessions)}
+            if "session" in payload and payload["session"] not in self.sessions:
+                return {"status": "error", "message": "This session does not exist."}
+            return {
+                "status": "ok",
+                "solution": {
+                    "url": payload["url"],
+                    "status": 200,
+                    "response": "<html>solved</html>",
+                    "cookies": [],
+                    "headers": [],
+                },
+            }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        body = json.dumps(self.server.handle_command(payload)).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _NotSkipped:
+    def retrieve(self, key):
+        return None
+
+
+@pytest.fixture
+def flaresolverr(state):
+    server = StandInFlareSolverr()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    state.values["config"] = lambda section: {"url": server.url}
+    state.values["database"] = lambda table: _NotSkipped()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = FlareSolverrSessionPool(idle_timeout=0.2, reap_interval=0.05)
+    monkeypatch.setattr(cloudflare, "flaresolverr_session_pool", pool)
+    yield pool
+    pool.close()
+
+
+def test_requests_to_one_host_share_a_session(flaresolverr, pool, state):
+    for _ in range(3):
+        assert flaresolverr_get(state, "https://a.example/page").text == (
+            "<html>solved</html>"
+        )
+    flaresolverr_get(state, "https://b.example/page")
+
+    assert flaresolverr.created == 2
+    assert pool.sessions_created == 2
+
+
+def test_requests_carry_session_ttl(flaresolverr, pool, state):
+    flaresolverr_get(state, "https://a.example/page")
+    leased = pool.acquire(state, "https://b.example/page")
+    flaresolverr_get(state, "https://b.example/page", session_id=leased)
+
+    create_a, request_a, create_b, request_b = flaresolverr.commands
+    # FlareSolverr only honours the ttl on requests, not on sessions.create
+    assert "session_ttl_minutes" not in create_a
+    assert "session_ttl_minutes" not in create_b
+    assert request_a["session"] == create_a["session"]
+    assert request_b["session"] == leased
+    assert request_a["session_ttl_minutes"] == pool.session_ttl_minutes
+    assert request_b["session_ttl_minutes"] == pool.session_ttl_minutes
+    pool.release(state, "https://b.example/page", leased)
+
+
+def test_idle_sessions_are_reaped_without_new_requests(flaresolverr, pool, state):
+    flaresolverr_get(state, "https://a.example/page")
+    assert len(flaresolverr.sessions) == 1
+
+    deadline = time.time() + 2
+    while flaresolverr.sessions and time.time() < deadline:
+        time.sleep(0.05)
+    assert not flaresolverr.sessions
+
+
+def test_close_destroys_pooled_and_leased_sessions(flaresolverr, pool, state):
+    flaresolverr_get(state, "https://a.example/page")
+    leased = pool.acquire(state, "https://b.example/page")
+    assert len(flaresolverr.sessions) == 2
+
+    pool.close()
+    assert flaresolverr.sessions == {leased}
+    pool.release(state, "https://b.example/page", leased)
+    assert not flaresolverr.sessions
+
+
+def test_failed_session_is_not_reused(flaresolverr, pool, state):
+    flaresolverr_get(state, "https://a.example/page")
+    # FlareSolverr lost the session, e.g. after a restart
+    flaresolverr.sessions.clear()
+
+    with pytest.raises(RuntimeError):
+        flaresolverr_get(state, "https://a.example/page")
+    flaresolverr_get(state, "https://a.example/page")
+    assert flaresolverr.created == 2
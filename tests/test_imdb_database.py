@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+import sqlite3
+import time
+
+import pytest
+
+from quasarr.storage.imdb_database import IMDbDatabase
+
+
+@pytest.fixture
+def database(state):
+    return IMDbDatabase()
+
+
+def test_localized_title_creates_its_record(database):
+    expires = time.time() + 60
+    database.update_localized_title("tt0000001", "de", "Der Titel", expires)
+
+    metadata = database.retrieve("tt0000001")
+    assert metadata["localized"] == {"de": "Der Titel"}
+    assert metadata["ttl"] == expires
+
+
+def test_failed_localized_title_leaves_no_record(database):
+    with pytest.raises(sqlite3.Error):
+        # A title sqlite cannot store fails the second statement
+        database.update_localized_title("tt0000002", "de", object(), time.time())
+
+    assert database.retrieve("tt0000002") is None
+
+
+def test_fields_keep_the_localized_title(database):
+    expires = time.time() + 60
+    database.update_localized_title("tt0000003", "de", "Der Titel", expires)
+    database.update_fields("tt0000003", {"title": "The Title", "year": 2001}, expires)
+
+    metadata = database.retrieve("tt0000003")
+    assert metadata["title"] == "The Title"
+    assert metadata["year"] == 2001
+    assert metadata["localized"] == {"de": "Der Titel"}
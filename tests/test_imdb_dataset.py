@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+import gzip
+import random
+import time
+
+import pytest
+
+from quasarr.storage import imdb_dataset
+from quasarr.storage.imdb_dataset import import_imdb_dataset
+
+BASICS_HEADER = [
+    "tconst",
+    "titleType",
+    "primaryTitle",
+    "originalTitle",
+    "isAdult",
+    "startYear",
+    "endYear",
+    "runtimeMinutes",
+    "genres",
+]
+AKAS_HEADER = [
+    "titleId",
+    "ordering",
+    "title",
+    "region",
+    "language",
+    "types",
+    "attributes",
+    "isOriginalTitle",
+]
+
+
+def write_tsv(path, header, rows):
+    with gzip.open(path, "wt", encoding="utf-8", newline="") as f:
+        f.write("\t".join(header) + "\n")
+        for row in rows:
+            f.write("\t".join(row) + "\n")
+
+
+def basics_row(imdb_id, title_type, title, year):
+    return [imdb_id, title_type, title, title, "0", year, "\\N", "90", "Drama"]
+
+
+def akas_row(imdb_id, ordering, title, region, language="\\N", types="\\N"):
+    return [imdb_id, str(ordering), title, region, language, types, "\\N", "0"]
+
+
+@pytest.fixture
+def dataset(state, tmp_path, monkeypatch):
+    dbfile = str(tmp_path / "IMDb.db")
+    state.values["imdb_dataset_dbfile"] = dbfile
+    monkeypatch.setenv("IMDB_DATASET", str(tmp_path))
+    # The module level instance keeps its connection, so every test gets its own
+    reader = imdb_dataset.IMDbDataset()
+    return tmp_path, dbfile, reader
+
+
+def test_import_and_lookup(dataset):
+    directory, dbfile, reader = dataset
+    write_tsv(
+        directory / imdb_dataset.BASICS_FILE,
+        BASICS_HEADER,
+        [
+            basics_row("tt0133093", "movie", "The Matrix", "1999"),
+            basics_row("tt0903747", "tvSeries", "Breaking Bad", "2008"),
+            basics_row("tt0000001", "short", "Carmencita", "1894"),
+        ],
+    )
+    write_tsv(
+        directory / imdb_dataset.AKAS_FILE,
+        AKAS_HEADER,
+        [
+            akas_row("tt0133093", 1, "Matrix (DE)", "DE"),
+            akas_row("tt0133093", 2, "Matrix", "DE", types="imdbDisplay"),
+            akas_row("tt0133093", 3, "Matrix (FR)", "FR"),
+            akas_row("tt0903747", 1, "Breaking Bad (en)", "DE", language="en"),
+        ],
+    )
+
+    assert import_imdb_dataset(dbfile, str(directory))
+    # The same files are not imported again
+    assert not import_imdb_dataset(dbfile, str(directory))
+
+    assert reader.get_title("tt0133093") == ("The Matrix", 1999)
+    assert reader.get_title("tt0000001") is None
+    assert reader.get_localized_title("tt0133093", "de") == "Matrix"
+    assert reader.get_localized_title("tt0903747", "de") is None
+    assert reader.find_titles("matrix") == [("tt0133093", "movie", 1999)]
+
+
+@pytest.mark.benchmark
+def test_import_benchmark(dataset):
+    """
+    Import a dump sampled to the shape of title.basics / title.akas, then time lookups.
+    """
+    # Peak memory is read from getrusage, which Windows does not have
+    resource = pytest.importorskip("resource")
+    directory, dbfile, reader = dataset
+    rng = random.Random(35)
+    words = [f"word{i}" for i in range(5000)]
+    title_types = ["movie", "tvSeries", "tvEpisode", "short", "tvMovie", "video"]
+    title_count = 500_000
+    ids = [f"tt{i:07d}" for i in range(1, title_count + 1)]
+
+    write_tsv(
+        directory / imdb_dataset.BASICS_FILE,
+        BASICS_HEADER,
+        (
+            basics_row(
+                imdb_id,
+                rng.choice(title_types),
+                " ".join(rng.choices(words, k=rng.randint(1, 4))),
+                str(rng.randint(1920, 2025)),
+            )
+            for imdb_id in ids
+        ),
+    )
+    regions = ["DE", "US", "FR", "GB", "IT", "ES", "JP", "\\N"]
+    write_tsv(
+        directory / imdb_dataset.AKAS_FILE,
+        AKAS_HEADER,
+        (
+            akas_row(
+                imdb_id,
+                ordering,
+                " ".join(rng.choices(words, k=rng.randint(1, 4))),
+                rng.choice(regions),
+            )
+            for imdb_id in ids
+            for ordering in range(1, 4)
+        ),
+    )
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    assert import_imdb_dataset(dbfile, str(directory))
+    import_seconds = time.perf_counter() - start
+    # ru_maxrss is in KiB on Linux. Chunked inserts keep memory flat, whatever the dump size
+    growth_mb = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024
+    assert growth_mb < 64
+
+    samples = rng.sample(ids, 1000)
+    start = time.perf_counter()
+    for imdb_id in samples:
+        reader.get_title(imdb_id)
+        reader.get_localized_title(imdb_id, "de")
+    lookup_ms = (time.perf_counter() - start) * 1000 / len(samples)
+
+    start = time.perf_counter()
+    for word in words[:1000]:
+        reader.find_titles(word)
+    search_ms = (time.perf_counter() - start) * 1000 / 1000
+
+    print(
+        f"\nIMDb dataset: imported {title_count} titles / {3 * title_count} akas rows "
+        f"in {import_seconds:.1f}s (peak RSS +{growth_mb:.1f} MiB), id lookup {lookup_ms:.3f}ms, "
+        f"title search {search_ms:.3f}ms"
+    )
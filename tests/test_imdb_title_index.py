@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+import pytest
+
+from quasarr.providers import imdb_metadata
+from quasarr.providers.imdb_metadata import IMDbTitleIndex, TitleCleaner
+
+
+@pytest.fixture
+def index(monkeypatch):
+    titles = [
+        ("tt0372784", "Batman Begins", 2005),
+        ("tt0096895", "Batman", 1989),
+        ("tt0103776", "Batman Returns", 1992),
+        ("tt0051459", "Cat on a Hot Tin Roof", 1958),
+        ("tt1234567", "Cat on a Hot Tin Roof", 1976),
+    ]
+    monkeypatch.setattr(imdb_metadata.imdb_database, "all_titles", lambda: titles)
+    monkeypatch.setattr(imdb_metadata.imdb_dataset, "find_titles", lambda title: [])
+    return IMDbTitleIndex()
+
+
+def lookup(index, release, year):
+    return index.lookup(TitleCleaner.clean(release), "MOVIE", year)
+
+
+def test_exact_title_and_year(index):
+    assert lookup(index, "Batman.1989.German.DL.1080p.BluRay.x264-GRP", "1989") == (
+        "tt0096895"
+    )
+
+
+def test_partial_title_is_not_resolved(monkeypatch, index):
+    monkeypatch.setattr(
+        imdb_metadata.imdb_database,
+        "all_titles",
+        lambda: [("tt0372784", "Batman Begins", 2005)],
+    )
+    assert lookup(index, "Batman.1989.German.DL.1080p.BluRay.x264-GRP", "1989") is None
+
+
+def test_other_year_is_not_resolved(index):
+    assert (
+        lookup(index, "Batman.Returns.1993.German.1080p.WEB.h264-GRP", "1993") is None
+    )
+
+
+def test_year_separates_remakes(index):
+    assert lookup(index, "Cat.on.a.Hot.Tin.Roof.1976.1080p.WEB.h264-GRP", "1976") == (
+        "tt1234567"
+    )
+
+
+def test_title_without_known_year_is_not_resolved(index):
+    index.add("tt7654321", "Some Movie")
+    assert lookup(index, "Some.Movie.2020.German.1080p.WEB.h264-GRP", "2020") is None
+    index.add("tt7654321", "Some Movie", 2020)
+    assert lookup(index, "Some.Movie.2020.German.1080p.WEB.h264-GRP", "2020") == (
+        "tt7654321"
+    )
+
+
+def test_adding_a_title_keeps_the_known_year(index):
+    index.add("tt0103776", "Batman Returns")
+    assert lookup(index, "Batman.Returns.1992.German.1080p.WEB.h264-GRP", "1992") == (
+        "tt0103776"
+    )
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+"""
+Feeds a stand-in My.JDownloader event stream into PackageModel and EventSubscription.
+"""
+
+from collections import deque
+from types import SimpleNamespace
+
+import pytest
+
+from quasarr.providers.jd_events import EventSubscription, PackageModel
+from quasarr.providers.myjd_api import MYJDException
+
+PACKAGES = [{"uuid": 1, "name": "Package", "bytesLoaded": 0, "finished": False}]
+LINKS = [
+    {"uuid": 11, "packageUUID": 1, "name": "a.rar", "bytesLoaded": 0},
+    {"uuid": 12, "packageUUID": 1, "name": "b.rar", "bytesLoaded": 0},
+]
+
+
+def event(eventid, data, publisher="downloads"):
+    return {"publisher": publisher, "eventid": eventid, "eventData": data}
+
+
+class StandInEvents:
+    """
+    Serves queued event batches to listen(), like the /events endpoints of a device.
+    """
+
+    def __init__(self):
+        self.batches = deque()
+        self.subscriptions = 0
+        self.timeouts = None
+        self.unsubscribed = []
+
+    def subscribe(self, subscriptions, exclusions=None):
+        self.subscriptions += 1
+        return {"subscriptionid": self.subscriptions, "subscriptions": subscriptions}
+
+    def change_timeouts(self, subscription_id, poll_timeout, max_keepalive):
+        self.timeouts = (subscription_id, poll_timeout, max_keepalive)
+
+    def listen(self, subscription_id):
+        if not self.batches:
+            return []
+        batch = self.batches.popleft()
+        if isinstance(batch, BaseException):
+            raise batch
+        return batch
+
+    def unsubscribe(self, subscription_id):
+        self.unsubscribed.append(subscription_id)
+
+
+@pytest.fixture
+def stream():
+    events = StandInEvents()
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return [dict(p) for p in PACKAGES], [dict(link) for link in LINKS]
+
+    subscription = EventSubscription(
+        SimpleNamespace(events=events), PackageModel(), loader
+    )
+    return SimpleNamespace(
+        events=events, loads=loads, subscription=subscription, model=subscription.model
+    )
+
+
+def links_by_uuid(model):
+    return {link["uuid"]: link for link in model.snapshot()[1]}
+
+
+def test_first_poll_subscribes_and_loads(stream):
+    assert stream.subscription.poll() == 0
+    assert stream.events.subscriptions == 1
+    assert stream.events.timeouts[1:] == (2000, 60000)
+    assert len(stream.loads) == 1
+    assert not stream.model.stale
+
+
+def test_update_events_patch_in_place(stream):
+    stream.subscription.poll()
+    stream.events.batches.append(
+        [
+            event("LINK_UPDATE.bytesLoaded", {"uuid": 11, "data": 500}),
+            event("LINK_UPDATE", {"uuid": 12, "bytesLoaded": 700, "status": "Done"}),
+            event("PACKAGE_UPDATE.finished", {"uuid": 1, "data": True}),
+        ]
+    )
+
+    assert stream.subscription.poll() == 3
+    links = links_by_uuid(stream.model)
+    assert links[11]["bytesLoaded"] == 500
+    assert links[12]["bytesLoaded"] == 700
+    assert links[12]["status"] == "Done"
+    assert stream.model.snapshot()[0][0]["finished"] is True
+    # Patched in place, without loading the lists again
+    assert len(stream.loads) == 1
+
+
+def test_events_of_other_publishers_are_ignored(stream):
+    stream.subscription.poll()
+    stream.events.batches.append(
+        [event("LINK_UPDATE", {"uuid": 11, "bytesLoaded": 1}, publisher="linkgrabber")]
+    )
+
+    assert stream.subscription.poll() == 0
+    assert links_by_uuid(stream.model)[11]["bytesLoaded"] == 0
+    assert not stream.model.stale
+
+
+@pytest.mark.parametrize(
+    "structural",
+    [
+        event("STRUCTURE_UPDATE", {}),
+        event("LINK_UPDATE.bytesLoaded", {"uuid": 99, "data": 1}),
+        event("PACKAGE_UPDATE", {"uuid": 99, "name": "New"}),
+    ],
+)
+def test_structural_or_unknown_events_reload(stream, structural):
+    stream.subscription.poll()
+    stream.events.batches.append([structural])
+
+    model = PackageModel()
+    model.load(PACKAGES, LINKS)
+    model.apply([structural])
+    assert model.stale
+
+    stream.subscription.poll()
+    # The stale model is loaded again within the same poll
+    assert len(stream.loads) == 2
+    assert not stream.model.stale
+
+
+def test_expired_subscription_resubscribes_and_reloads(stream):
+    stream.subscription.poll()
+    stream.events.batches.append(False)
+
+    assert stream.subscription.poll() == 0
+    assert stream.model.stale
+    stream.subscription.poll()
+    assert stream.events.subscriptions == 2
+    assert len(stream.loads) == 2
+
+
+def test_failed_listen_resubscribes(stream):
+    stream.subscription.poll()
+    stream.events.batches.append(MYJDException("connection lost"))
+
+    assert stream.subscription.poll() == 0
+    stream.subscription.poll()
+    assert stream.events.subscriptions == 2
+    assert not stream.model.stale
+
+
+def test_close_unsubscribes(stream):
+    stream.subscription.poll()
+    stream.subscription.close()
+    assert stream.events.unsubscribed == [1]
+    assert stream.subscription.subscription_id is None
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+"""
+Replays recorded daily release feeds against the DJ and SJ feeds.
+"""
+
+import json
+import threading
+
+import pytest
+from conftest import load_fixture
+
+from quasarr.providers.hostname_issues import get_hostname_issue, mark_hostname_issue
+from quasarr.search.sources import dj, sj
+from quasarr.search.sources.helpers import junkies
+
+HOST = "junkies.example"
+FEED_DAYS = junkies.FEED_DAYS
+
+
+class DayFeeds:
+    """
+    Serves the recorded feed of each day. Every request of a round waits for all others of that round,
+    so the feeds finish in arbitrary order and a sequential fetch would time out.
+    """
+
+    def __init__(self):
+        self.days = load_fixture("junkies_feed.json")["days"]
+        self.failing = set()
+        self.requested = []
+        self.barrier = None
+
+    def expect(self, count):
+        self.requested.clear()
+        self.barrier = threading.Barrier(count, timeout=5)
+
+    def get(self, url, headers=None, timeout=None):
+        day = int(url.rsplit("/", 1)[1])
+        self.requested.append(day)
+        self.barrier.wait()
+        if day in self.failing:
+            raise ConnectionError(f"day {day} unavailable")
+        return Response(json.dumps(self.days[str(day)]).encode())
+
+
+class Response:
+    def __init__(self, content):
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+
+@pytest.fixture
+def feeds(monkeypatch, state):
+    day_feeds = DayFeeds()
+    monkeypatch.setattr(junkies, "_get_session", lambda: day_feeds)
+    monkeypatch.setattr(junkies, "_feed_cache", {})
+    state.values["config"] = lambda section: {"dj": HOST, "sj": HOST}
+    state.values["user_agent"] = "Quasarr tests"
+    state.values["database"] = state.get_db
+    for module in (dj, sj):
+        monkeypatch.setattr(
+            module, "generate_download_link", lambda shared_state, title, url, *a: url
+        )
+    return day_feeds
+
+
+def expected_titles(days, day_feeds):
+    return [
+        release["name"].rstrip(".")
+        for day in days
+        for release in day_feeds.days[str(day)]
+    ]
+
+
+@pytest.mark.parametrize("source", [dj.Source(), sj.Source()], ids=["dj", "sj"])
+def test_day_feeds_are_merged_from_today_backwards(feeds, state, source):
+    feeds.expect(FEED_DAYS)
+    releases = source.feed(state, 0, source.supported_categories[0])
+
+    assert sorted(feeds.requested) == list(range(FEED_DAYS))
+    assert [r["details"]["title"] for r in releases] == expected_titles(
+        range(FEED_DAYS), feeds
+    )
+    assert releases[0]["details"]["source"] == f"https://{HOST}/serie/foo-bar"
+
+
+@pytest.mark.parametrize("source", [dj.Source(), sj.Source()], ids=["dj", "sj"])
+def test_past_days_are_served_from_cache(feeds, state, source):
+    feeds.expect(FEED_DAYS)
+    first = source.feed(state, 0, source.supported_categories[0])
+
+    # Only today's feed is fetched again
+    feeds.expect(1)
+    second = source.feed(state, 0, source.supported_categories[0])
+
+    assert feeds.requested == [0]
+    assert second == first
+
+
+@pytest.mark.parametrize("source", [dj.Source(), sj.Source()], ids=["dj", "sj"])
+def test_failed_days_are_skipped(feeds, state, source):
+    mark_hostname_issue(source.initials, "feed", "previous outage")
+    feeds.failing = {1, 3}
+    feeds.expect(FEED_DAYS)
+    releases = source.feed(state, 0, source.supported_categories[0])
+
+    assert [r["details"]["title"] for r in releases] == expected_titles([0, 2], feeds)
+    assert get_hostname_issue(source.initials) is None
+
+
+@pytest.mark.parametrize("source", [dj.Source(), sj.Source()], ids=["dj", "sj"])
+def test_hostname_issue_only_if_every_day_failed(feeds, state, source):
+    feeds.failing = set(range(FEED_DAYS))
+    feeds.expect(FEED_DAYS)
+    releases = source.feed(state, 0, source.supported_categories[0])
+
+    assert releases == []
+    issue = get_hostname_issue(source.initials)
+    assert issue["operation"] == "feed"
+    assert "day 0 unavailable" in issue["error"]
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+"""
+Runs Myjdapi.request_api against a stand-in for a JDownloader device endpoint.
+"""
+
+import base64
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from Cryptodome.Cipher import AES
+
+from quasarr.providers import myjd_api
+from quasarr.providers.jd_cache import PACKAGE_LIST_PROFILES
+from quasarr.providers.myjd_api import Downloads, Myjdapi, pad, query_params, unpad
+
+
+def _cipher(token):
+    return AES.new(token[len(token) // 2 :], AES.MODE_CBC, token[: len(token) // 2])
+
+
+class StandInDevice(ThreadingHTTPServer):
+    """
+    Decrypts device calls and answers them encrypted with the data returned by
+    respond(call). Records the client port and response size of every call.
+    """
+
+    def __init__(self, token, connect_delay=0.0, respond=None):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.token = token
+        # Simulated cost of setting up a connection, e.g. the TLS handshake
+        self.connect_delay = connect_delay
+        self.respond = respond or (lambda call: [{"url": call["url"]}])
+        self.ports = []
+        self.response_sizes = []
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def answer(self, body, port):
+        call = json.loads(unpad(_cipher(self.token).decrypt(base64.b64decode(body))))
+        response = json.dumps({"rid": call["rid"], "data": self.respond(call)})
+        encrypted = base64.b64encode(
+            _cipher(self.token).encrypt(pad(response.encode()))
+        )
+        with self.lock:
+            self.ports.append(port)
+            self.response_sizes.append(len(encrypted))
+        return encrypted
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body in one segment, so delayed ACKs do not stall keep-alive calls
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        time.sleep(self.server.connect_delay)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        response = self.server.answer(body, self.client_address[1])
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def device():
+    def start(connect_delay=0.0, respond=None):
+        token = os.urandom(32)
+        server = StandInDevice(token, connect_delay, respond)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+
+        api = Myjdapi()
+        api._Myjdapi__device_encryption_token = token
+        api._Myjdapi__connected = True
+        return server, api
+
+    servers = []
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def call(server, api, path="/downloadsV2/queryLinks", params=None):
+    return api.request_api(
+        path,
+        "POST",
+        params or [{"maxResults": -1}],
+        action="/t_token_device",
+        api=server.url,
+    )
+
+
+def test_calls_share_one_connection(device):
+    server, api = device()
+
+    paths = [f"/call/{i}" for i in range(5)]
+    responses = [call(server, api, path) for path in paths]
+
+    assert [response["data"][0]["url"] for response in responses] == paths
+    assert len(set(server.ports)) == 1
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("connect_delay", [0.0, 0.02])
+def test_call_latency_benchmark(device, monkeypatch, connect_delay):
+    calls = 200
+    results = {}
+    for mode in ("new connection", "keep-alive"):
+        server, api = device(connect_delay)
+        if mode == "new connection":
+            # Previous behaviour: every call went through requests.get/post
+            monkeypatch.setattr(myjd_api, "_get_session", lambda api_url: requests)
+        else:
+            monkeypatch.undo()
+        call(server, api)
+
+        start = time.perf_counter()
+        for _ in range(calls):
+            assert call(server, api)
+        results[mode] = (time.perf_counter() - start) * 1000 / calls, server.ports
+
+    assert len(set(results["keep-alive"][1])) == 1
+    print(
+        f"\nMyJD stand-in, {connect_delay * 1000:.0f}ms connection setup: "
+        + ", ".join(
+            f"{mode} {ms:.2f}ms per call ({len(set(ports))} connections)"
+            for mode, (ms, ports) in results.items()
+        )
+    )
+
+
+def test_package_list_projection():
+    params = query_params("downloader_links", *PACKAGE_LIST_PROFILES)[0]
+
+    assert params["uuid"] and params["maxResults"] == -1
+    assert {"comment", "extractionStatus", "finished", "status", "url"} <= set(params)
+    for unused in ("variants", "hosts", "host", "priority", "speed", "running"):
+        assert unused not in params
+
+
+def history_link(i):
+    """
+    A finished download link with every field JDownloader returns on request.
+    """
+    return {
+        "name": f"Some.Show.S01E{i % 100:02d}.German.DL.1080p.WEB.h264-GRP.part{i % 20:02d}.rar",
+        "uuid": 1700000000000 + i,
+        "packageUUID": 1600000000000 + i // 25,
+        "host": "rapidgator.net",
+        "url": f"https://rapidgator.net/file/{i:032x}/Some.Show.S01E{i % 100:02d}.part{i % 20:02d}.rar.html",
+        "comment": f"Quasarr_tv_{i // 25:032x}",
+        "status": "Finished",
+        "enabled": True,
+        "bytesTotal": 1073741824,
+        "bytesLoaded": 1073741824,
+        "speed": 0,
+        "eta": -1,
+        "finished": True,
+        "priority": "DEFAULT",
+        "running": False,
+        "skipped": False,
+        "extractionStatus": "SUCCESSFUL",
+    }
+
+
+def project(records, params):
+    """
+    Return the records with name, uuid, packageUUID and the requested fields, like JDownloader.
+    """
+    requested = {key.lower() for key, value in params.items() if value is True}
+    requested |= {"name", "uuid", "packageuuid"}
+    return [
+        {key: value for key, value in record.items() if key.lower() in requested}
+        for record in records
+    ]
+
+
+@pytest.mark.benchmark
+def test_projection_payload_benchmark(device):
+    links = [history_link(i) for i in range(50000)]
+    server, api = device(
+        respond=lambda call: project(links, json.loads(call["params"][0]))
+    )
+    default_params = None
+
+    class Recorder:
+        def action(self, path, params):
+            nonlocal default_params
+            default_params = params
+
+    # The default params of Downloads.query_links, used before the projections
+    Downloads(Recorder()).query_links()
+    results = {}
+    for name, params in (
+        ("default fields", default_params),
+        ("projected", query_params("downloader_links", *PACKAGE_LIST_PROFILES)),
+    ):
+        server.response_sizes.clear()
+        start = time.perf_counter()
+        response = call(server, api, params=params)
+        results[name] = (
+            server.response_sizes[0] / 2**20,
+            (time.perf_counter() - start) * 1000,
+        )
+        assert len(response["data"]) == len(links)
+
+    print(
+        f"\nqueryLinks, {len(links)} finished links: "
+        + ", ".join(
+            f"{name} {size:.1f} MiB encrypted, {ms:.0f}ms round trip"
+            for name, (size, ms) in results.items()
+        )
+    )
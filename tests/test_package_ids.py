@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+import time
+
+from quasarr.downloads.packages import package_ids
+from quasarr.downloads.packages.package_ids import (
+    forget_package_id,
+    is_known_package_id,
+    remember_package_id,
+    sync_package_ids,
+)
+
+LISTED = "Quasarr_movies_" + "a" * 32
+ADDED = "Quasarr_movies_" + "b" * 32
+UNKNOWN = "Quasarr_movies_" + "c" * 32
+
+
+def test_unlisted_id_is_certainly_unknown(state):
+    sync_package_ids(state, {LISTED}, time.time())
+    assert is_known_package_id(state, UNKNOWN) is False
+    assert is_known_package_id(state, LISTED) is None
+
+
+def test_id_added_during_a_sync_survives_it(state):
+    fetched_at = time.time()
+    remember_package_id(state, ADDED)
+    # The lists were read before ADDED was added
+    sync_package_ids(state, {LISTED}, fetched_at)
+    assert is_known_package_id(state, ADDED) is None
+
+
+def test_id_still_crawled_survives_a_later_sync(state):
+    remember_package_id(state, ADDED)
+    # The linkgrabber has not listed ADDED yet
+    sync_package_ids(state, {LISTED}, time.time() + 1)
+    assert is_known_package_id(state, ADDED) is None
+
+
+def test_old_added_id_missing_from_jdownloader_is_dropped(state, monkeypatch):
+    remember_package_id(state, ADDED)
+    now = time.time() + package_ids.REMEMBERED_GRACE + 1
+    monkeypatch.setattr(package_ids.time, "time", lambda: now)
+    sync_package_ids(state, {LISTED}, now)
+    assert is_known_package_id(state, ADDED) is False
+
+
+def test_forgotten_id_does_not_survive_a_sync(state):
+    fetched_at = time.time()
+    remember_package_id(state, ADDED)
+    forget_package_id(state, ADDED)
+    sync_package_ids(state, {LISTED}, fetched_at)
+    assert is_known_package_id(state, ADDED) is False
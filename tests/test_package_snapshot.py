@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from quasarr.downloads.packages import snapshot
+from quasarr.downloads.packages.snapshot import (
+    PackageSnapshotService,
+    get_packages_from_snapshot,
+    invalidate_package_snapshot,
+)
+
+
+@pytest.fixture
+def jdownloader(monkeypatch, state):
+    jd = SimpleNamespace(query_failed=False, queue=[{"nzo_id": "a"}])
+
+    def get_packages(shared_state, _cache=None, auto_start=True):
+        if _cache is not None:
+            _cache.query_failed = jd.query_failed
+        return {"queue": [] if jd.query_failed else list(jd.queue), "history": []}
+
+    monkeypatch.setattr(
+        snapshot, "JDPackageCache", lambda device: SimpleNamespace(query_failed=False)
+    )
+    monkeypatch.setattr(snapshot, "get_packages", get_packages)
+    monkeypatch.setattr(state, "get_device", lambda: None)
+    return jd
+
+
+def published_queue(state):
+    generation, blob = state.values["package_snapshot_data"]
+    assert isinstance(blob, bytes)
+    return generation, json.loads(blob)["queue"]
+
+
+def test_refresh_publishes_snapshot(jdownloader, state):
+    PackageSnapshotService(state, 30).refresh()
+
+    assert state.values["package_snapshot"]["generation"] == 1
+    assert published_queue(state) == (1, [{"nzo_id": "a"}])
+
+
+def test_unchanged_refresh_only_renews_header(jdownloader, monkeypatch, state):
+    service = PackageSnapshotService(state, 30)
+    service.refresh()
+
+    updated = []
+    update = state.update
+    monkeypatch.setattr(
+        state, "update", lambda key, value: (updated.append(key), update(key, value))
+    )
+    service.refresh()
+    assert updated == ["package_snapshot"]
+    assert state.values["package_snapshot"]["generation"] == 1
+
+    jdownloader.queue.append({"nzo_id": "b"})
+    service.refresh()
+    assert updated == ["package_snapshot", "package_snapshot_data", "package_snapshot"]
+    assert published_queue(state) == (2, [{"nzo_id": "a"}, {"nzo_id": "b"}])
+
+
+def test_readers_decode_snapshot(jdownloader, monkeypatch, state):
+    monkeypatch.setenv("PACKAGE_SNAPSHOT", "30")
+    PackageSnapshotService(state, 30).refresh()
+
+    jdownloader.queue.append({"nzo_id": "live"})
+    assert get_packages_from_snapshot(state)["queue"] == [{"nzo_id": "a"}]
+
+    invalidate_package_snapshot(state)
+    assert state.values["package_snapshot_data"] is None
+    assert get_packages_from_snapshot(state)["queue"] == [
+        {"nzo_id": "a"},
+        {"nzo_id": "live"},
+    ]
+
+
+def test_failed_query_keeps_previous_snapshot(jdownloader, state):
+    service = PackageSnapshotService(state, 30)
+    service.refresh()
+
+    jdownloader.query_failed = True
+    service.refresh()
+
+    assert state.values["package_snapshot"]["generation"] == 1
+    assert published_queue(state) == (1, [{"nzo_id": "a"}])
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+"""
+Runs get_packages against a synthetic JDownloader download list.
+"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from quasarr.downloads.packages import get_packages
+from quasarr.providers import jd_cache
+
+
+def download_list(package_count, links_per_package):
+    """
+    Finished Quasarr packages, every fifth one an archive that is still extracting.
+    """
+    packages = []
+    links = []
+    for p in range(package_count):
+        package_uuid = 1600000000000 + p
+        package_id = f"Quasarr_tv_{p:032x}"
+        packages.append(
+            {
+                "name": f"Some.Show.S01E{p % 100:02d}.German.1080p.WEB.h264-GRP",
+                "uuid": package_uuid,
+                "comment": package_id,
+                "bytesTotal": links_per_package * 1024,
+                "bytesLoaded": links_per_package * 1024,
+                "saveTo": f"/downloads/tv/{p}",
+                "childCount": links_per_package,
+                "finished": True,
+            }
+        )
+        extracting = p % 5 == 0
+        for i in range(links_per_package):
+            links.append(
+                {
+                    "name": f"show.{p}.part{i:02d}.rar",
+                    "uuid": 1700000000000 + p * links_per_package + i,
+                    "packageUUID": package_uuid,
+                    "comment": package_id,
+                    "status": "Extracting" if extracting else "Extraction OK",
+                    "finished": True,
+                    "url": f"https://rapidgator.net/file/{p}/{i}",
+                    "extractionStatus": "RUNNING" if extracting else "SUCCESSFUL",
+                }
+            )
+    return packages, links
+
+
+def device(packages, links):
+    return SimpleNamespace(
+        linkgrabber=SimpleNamespace(
+            query_packages=lambda params=None: [],
+            query_links=lambda params=None: [],
+            is_collecting=lambda: False,
+        ),
+        downloads=SimpleNamespace(
+            query_packages=lambda params=None: packages,
+            query_links=lambda params=None: links,
+        ),
+        extraction=SimpleNamespace(get_archive_info=lambda links, packages: []),
+    )
+
+
+class ScanIndex:
+    """
+    Stand-in for the packageUUID index that scans all links on every lookup,
+    like the helpers did before the index existed.
+    """
+
+    def __init__(self, links):
+        self.links = links or []
+
+    def get(self, package_uuid, default=None):
+        found = [link for link in self.links if link.get("packageUUID") == package_uuid]
+        return found or default
+
+
+@pytest.fixture
+def jdownloader(state, monkeypatch):
+    def load(package_count, links_per_package):
+        packages, links = download_list(package_count, links_per_package)
+        monkeypatch.setattr(state, "get_device", lambda: device(packages, links))
+
+    return load
+
+
+def test_index_and_scan_agree(jdownloader, monkeypatch, state):
+    jdownloader(40, 5)
+    indexed = get_packages(state, auto_start=False)
+
+    monkeypatch.setattr(jd_cache, "index_links_by_package", ScanIndex)
+    scanned = get_packages(state, auto_start=False)
+
+    assert indexed == scanned
+    assert len(indexed["history"]) == 32
+    assert len(indexed["queue"]) == 8
+
+
+@pytest.mark.benchmark
+def test_get_packages_benchmark(jdownloader, monkeypatch, state):
+    jdownloader(2000, 25)
+    results = {}
+    for name in ("index", "scan"):
+        if name == "scan":
+            monkeypatch.setattr(jd_cache, "index_links_by_package", ScanIndex)
+        start = time.perf_counter()
+        results[name] = get_packages(state, auto_start=False)
+        results[name + "_s"] = time.perf_counter() - start
+
+    assert results["index"] == results["scan"]
+    print(
+        f"\nget_packages, 2000 packages / 50000 links: per-package scans "
+        f"{results['scan_s']:.2f}s, packageUUID index {results['index_s']:.2f}s"
+    )
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from quasarr.downloads.sources.helpers import redirect_resolver as module
+from quasarr.downloads.sources.helpers.redirect_resolver import RedirectResolver
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(module.time, "time", clock.time)
+    return clock
+
+
+class Mirrors:
+    """
+    Resolves https://wd.example/go/<name> by a table and counts the calls per url.
+    """
+
+    def __init__(self, targets):
+        self.targets = targets
+        self.calls = {}
+        self.lock = threading.Lock()
+
+    def __call__(self, url):
+        with self.lock:
+            self.calls[url] = self.calls.get(url, 0) + 1
+        return self.targets.get(url)
+
+
+def test_resolutions_are_cached_until_ttl(clock):
+    resolver = RedirectResolver(ttl=60, dead_ttl=10)
+    mirrors = Mirrors({"https://wd.example/go/a": "https://hoster.example/a"})
+
+    assert resolver.resolve("https://wd.example/go/a", mirrors) == (
+        "https://hoster.example/a"
+    )
+    clock.now += 59
+    assert resolver.resolve("https://wd.example/go/a", mirrors) == (
+        "https://hoster.example/a"
+    )
+    assert mirrors.calls["https://wd.example/go/a"] == 1
+
+    clock.now += 1
+    resolver.resolve("https://wd.example/go/a", mirrors)
+    assert mirrors.calls["https://wd.example/go/a"] == 2
+
+
+def test_dead_links_are_cached_for_dead_ttl(clock):
+    resolver = RedirectResolver(ttl=60, dead_ttl=10)
+    mirrors = Mirrors({"https://wd.example/go/dead": "https://wd.example/404.html"})
+
+    assert resolver.resolve("https://wd.example/go/dead", mirrors) is None
+    clock.now += 9
+    assert resolver.resolve("https://wd.example/go/dead", mirrors) is None
+    assert mirrors.calls["https://wd.example/go/dead"] == 1
+
+    clock.now += 1
+    resolver.resolve("https://wd.example/go/dead", mirrors)
+    assert mirrors.calls["https://wd.example/go/dead"] == 2
+
+
+def test_failed_resolutions_are_not_cached(clock):
+    resolver = RedirectResolver()
+    mirrors = Mirrors({})
+
+    assert resolver.resolve("https://wd.example/go/blocked", mirrors) is None
+    assert resolver.resolve("https://wd.example/go/blocked", mirrors) is None
+    assert mirrors.calls["https://wd.example/go/blocked"] == 2
+
+
+def test_resolve_all_keeps_order_of_urls():
+    resolver = RedirectResolver(max_workers=4)
+    urls = [f"https://wd.example/go/{i}" for i in range(8)]
+    mirrors = Mirrors({url: url.replace("wd", "hoster") for url in urls[1:]})
+
+    def slow_first(url):
+        # The first link finishes last
+        if url == urls[0]:
+            time.sleep(0.05)
+        return mirrors(url)
+
+    result = resolver.resolve_all([*urls, urls[3]], slow_first)
+
+    assert result == [None] + [url.replace("wd", "hoster") for url in urls[1:]] + [
+        urls[3].replace("wd", "hoster")
+    ]
+    # Duplicate urls are resolved once
+    assert mirrors.calls[urls[3]] == 1
+
+
+def test_concurrent_resolutions_of_one_url_are_coalesced(monkeypatch):
+    resolver = RedirectResolver()
+    follower_waiting = threading.Event()
+
+    class Flight(threading.Event):
+        def wait(self, timeout=None):
+            follower_waiting.set()
+            return super().wait(timeout)
+
+    monkeypatch.setattr(
+        module, "threading", SimpleNamespace(Event=Flight, Lock=threading.Lock)
+    )
+    calls = []
+
+    def resolve(url):
+        calls.append(url)
+        follower.start()
+        follower_waiting.wait(5)
+        # Failed resolutions are not cached, only the running flight can be shared
+        return None
+
+    results = []
+    follower = threading.Thread(
+        target=lambda: results.append(
+            resolver.resolve("https://wd.example/go/a", resolve)
+        )
+    )
+    results.append(resolver.resolve("https://wd.example/go/a", resolve))
+    follower.join()
+
+    assert calls == ["https://wd.example/go/a"]
+    assert results == [None, None]
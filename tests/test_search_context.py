@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+"""
+The search context is resolved once before fan-out and handed to every source.
+"""
+
+import pytest
+
+from quasarr import search
+from quasarr.constants import SEARCH_CAT_BOOKS, SEARCH_CAT_MOVIES
+from quasarr.search.sources.helpers import search_context
+from quasarr.search.sources.helpers.search_context import SearchContext
+
+IMDB_ID = "tt0133093"
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    """
+    Count IMDb lookups made by the search context.
+    """
+    calls = []
+
+    def localized_title(shared_state, imdb_id, language):
+        calls.append(("title", imdb_id, language))
+        return f"{imdb_id}-{language}"
+
+    def metadata(imdb_id):
+        calls.append(("metadata", imdb_id))
+        return {"year": 1999}
+
+    monkeypatch.setattr(search_context, "get_localized_title", localized_title)
+    monkeypatch.setattr(search_context, "get_imdb_metadata", metadata)
+    return calls
+
+
+def test_titles_are_resolved_on_construction(lookups, state):
+    context = SearchContext(state, IMDB_ID)
+
+    assert context.imdb_id == IMDB_ID
+    assert context.year == 1999
+    assert sorted(lookups) == [
+        ("metadata", IMDB_ID),
+        ("title", IMDB_ID, "de"),
+        ("title", IMDB_ID, "en"),
+    ]
+
+    # Sources only read what was resolved up front
+    assert context.localized_title("de") == f"{IMDB_ID}-de"
+    assert context.localized_title("en") == f"{IMDB_ID}-en"
+    assert context.localized_title("fr") is None
+    assert len(lookups) == 3
+
+
+def test_phrase_context_makes_no_lookups(lookups, state):
+    context = SearchContext(state, "Foo Bar")
+
+    assert context.imdb_id is None
+    assert context.year is None
+    assert context.localized_title("de") is None
+    assert lookups == []
+
+
+class RecordingSource:
+    supports_imdb = True
+    supports_phrase = True
+
+    def __init__(self, initials, category):
+        self.initials = initials
+        self.supported_categories = [category]
+        self.contexts = []
+
+    def search(self, shared_state, start_time, search_category, **kwargs):
+        self.contexts.append(kwargs.get("context"))
+        return []
+
+
+@pytest.mark.parametrize(
+    "category, kwargs",
+    [
+        (SEARCH_CAT_MOVIES, {"imdb_id": IMDB_ID}),
+        (SEARCH_CAT_BOOKS, {"search_phrase": "Foo Bar"}),
+    ],
+    ids=["imdb", "phrase"],
+)
+def test_every_source_gets_the_same_context(
+    monkeypatch, lookups, state, category, kwargs
+):
+    sources = {
+        initials: RecordingSource(initials, category) for initials in ("aa", "bb")
+    }
+    state.values["config"] = lambda section: {
+        initials: f"{initials}.example" for initials in sources
+    }
+    monkeypatch.setattr(search, "get_sources", lambda: sources)
+    monkeypatch.setattr(search, "get_search_category_sources", lambda cat: [])
+    monkeypatch.setattr(search, "search_cache", search.SearchCache())
+
+    search.get_search_results(state, "Radarr", category, **kwargs)
+
+    contexts = [c for source in sources.values() for c in source.contexts]
+    assert len(contexts) == 2
+    assert isinstance(contexts[0], SearchContext)
+    assert contexts[0] is contexts[1]
+    # IMDb lookups happen once per request, not once per source
+    assert len(lookups) == (3 if "imdb_id" in kwargs else 0)
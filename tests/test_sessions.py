@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+import base64
+import json
+import pickle
+import time
+
+import pytest
+import requests
+
+from quasarr.providers import sessions
+from quasarr.providers.sessions import (
+    SessionRegistry,
+    drop_session,
+    get_registered_session,
+    persist_session_cookies,
+    register_session,
+)
+
+HOSTNAME = "example"
+
+
+@pytest.fixture
+def db(state, monkeypatch):
+    state.values["database"] = state.get_db
+    # Every test starts like a fresh process
+    monkeypatch.setattr(sessions, "session_registry", SessionRegistry())
+    return state.get_db("sessions")
+
+
+def session(**cookies):
+    sess = requests.Session()
+    sess.headers.update({"User-Agent": "Quasarr tests"})
+    for name, value in cookies.items():
+        sess.cookies.set(name, value, domain="example.org", path="/")
+    return sess
+
+
+def stored(db):
+    return json.loads(db.retrieve(HOSTNAME))
+
+
+def test_persist_writes_changed_cookies_only(state, db):
+    sess = session(login="1")
+    register_session(state, HOSTNAME, sess)
+    created_at = stored(db)["created_at"]
+
+    assert not persist_session_cookies(state, HOSTNAME, sess)
+
+    sess.cookies.set("login", "2", domain="example.org", path="/")
+    assert persist_session_cookies(state, HOSTNAME, sess)
+    assert ["login", "2", "example.org", "/"] in stored(db)["cookies"]
+    assert stored(db)["created_at"] == created_at
+
+
+def test_persist_after_drop_does_not_restore_session(state, db):
+    sess = session(login="1")
+    register_session(state, HOSTNAME, sess)
+
+    drop_session(state, HOSTNAME)
+    sess.cookies.set("login", "2", domain="example.org", path="/")
+
+    assert not persist_session_cookies(state, HOSTNAME, sess)
+    assert db.retrieve(HOSTNAME) is None
+
+
+def test_persist_of_unregistered_session_keeps_stored_row(state, db, monkeypatch):
+    register_session(state, HOSTNAME, session(login="1"))
+    row = db.retrieve(HOSTNAME)
+
+    # Another process never registered the session
+    monkeypatch.setattr(sessions, "session_registry", SessionRegistry())
+    assert not persist_session_cookies(state, HOSTNAME, session(login="2"))
+    assert db.retrieve(HOSTNAME) == row
+
+
+@pytest.mark.parametrize("al_wrapped", [False, True])
+def test_legacy_pickle_is_migrated(state, db, al_wrapped):
+    token = base64.b64encode(pickle.dumps(session(login="1"))).decode("utf-8")
+    created_at = time.time() - 3600
+    if al_wrapped:
+        db.update_store(
+            HOSTNAME, json.dumps({"token": token, "created_at": created_at})
+        )
+    else:
+        db.update_store(HOSTNAME, token)
+
+    sess = get_registered_session(
+        state, HOSTNAME, max_age=24 * 3600 if al_wrapped else None
+    )
+
+    assert sess.cookies.get("login") == "1"
+    migrated = stored(db)
+    assert migrated["cookies"] == [["login", "1", "example.org", "/"]]
+    assert migrated["user_agent"] == "Quasarr tests"
+    assert migrated["created_at"] == (created_at if al_wrapped else 0)
+
+
+def test_expired_legacy_session_is_not_restored(state, db):
+    token = base64.b64encode(pickle.dumps(session(login="1"))).decode("utf-8")
+    db.update_store(
+        HOSTNAME, json.dumps({"token": token, "created_at": time.time() - 25 * 3600})
+    )
+
+    assert get_registered_session(state, HOSTNAME, max_age=24 * 3600) is None
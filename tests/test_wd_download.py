@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+import threading
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from quasarr.downloads.sources import wd
+from quasarr.downloads.sources.helpers.redirect_resolver import RedirectResolver
+
+URL = "https://wd.example/Movies/Some.Movie"
+
+
+class RecordingPool:
+    def __init__(self):
+        self.leased = []
+        self.released = []
+
+    def acquire(self, shared_state, url):
+        self.leased.append("session-1")
+        return "session-1"
+
+    def release(self, shared_state, url, session_id, healthy=True):
+        self.released.append((session_id, healthy))
+
+
+@pytest.fixture
+def pool(state, monkeypatch):
+    state.values["user_agent"] = "Quasarr tests"
+    state.values["config"] = lambda section: {"wd": "wd.example"}
+    pool = RecordingPool()
+
+    def blocked(url, **kwargs):
+        raise requests.ConnectionError("blocked")
+
+    monkeypatch.setattr(wd, "flaresolverr_session_pool", pool)
+    monkeypatch.setattr(wd, "is_flaresolverr_available", lambda shared_state: True)
+    monkeypatch.setattr(wd.requests, "get", blocked)
+    monkeypatch.setattr(wd, "mark_hostname_issue", lambda *args: None)
+    return pool
+
+
+@pytest.mark.parametrize(
+    "failure", [KeyError("solution"), requests.ConnectionError("FlareSolverr down")]
+)
+def test_failed_flaresolverr_request_releases_session(
+    pool, state, monkeypatch, failure
+):
+    def flaresolverr_solve_get(shared_state, url, timeout=30, session_id=None):
+        raise failure
+
+    monkeypatch.setattr(wd, "flaresolverr_solve_get", flaresolverr_solve_get)
+
+    result = wd.Source().get_download_links(state, URL, [], "Some.Movie", "")
+
+    assert result == {"links": [], "imdb_id": None}
+    assert pool.released == [("session-1", False)]
+
+
+PAGE = """
+<div class="card">
+  <div class="card-header">Downloads</div>
+  <div class="card-body">
+    <a class="background-rapidgator" href="/go/1">rapidgator</a>
+    <a class="background-ddownload" href="/go/2">ddownload</a>
+    <a class="background-katfile" href="/go/3">katfile</a>
+    <a class="background-nitroflare" href="/go/challenged">nitroflare</a>
+  </div>
+</div>
+"""
+
+
+def test_redirects_resolve_in_parallel_and_fall_back_when_challenged(
+    pool, state, monkeypatch
+):
+    # All plain redirect requests must be in flight at once to pass the barrier
+    barrier = threading.Barrier(4, timeout=5)
+    solved = []
+
+    def get(url, **kwargs):
+        if url == URL:
+            return SimpleNamespace(
+                status_code=200, text=PAGE, raise_for_status=lambda: None
+            )
+        barrier.wait()
+        if url.endswith("/challenged"):
+            return SimpleNamespace(status_code=403, text="", history=[])
+        return SimpleNamespace(
+            status_code=200,
+            text="",
+            url=url.replace("wd.example/go", "hoster.example"),
+            history=[SimpleNamespace(url=url)],
+            raise_for_status=lambda: None,
+        )
+
+    def flaresolverr_solve_get(shared_state, url, timeout=30, session_id=None):
+        solved.append((url, session_id))
+        return SimpleNamespace(status_code=200, text="", url="https://nitro.example/x")
+
+    monkeypatch.setattr(wd.requests, "get", get)
+    monkeypatch.setattr(wd, "flaresolverr_solve_get", flaresolverr_solve_get)
+    monkeypatch.setattr(wd, "redirect_resolver", RedirectResolver())
+
+    result = wd.Source().get_download_links(state, URL, [], "Some.Movie", "")
+
+    assert result["links"] == [
+        ["https://hoster.example/1", "rapidgator"],
+        ["https://hoster.example/2", "ddownload"],
+        ["https://hoster.example/3", "katfile"],
+        ["https://nitro.example/x", "nitroflare"],
+    ]
+    # Only the challenged link went through FlareSolverr
+    assert solved == [("https://wd.example/go/challenged", None)]
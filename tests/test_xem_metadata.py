@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+import json
+import random
+import time
+
+import pytest
+
+from quasarr.providers import xem_metadata
+from quasarr.providers.imdb_metadata import TitleCleaner
+from quasarr.providers.utils import search_string_in_sanitized_title
+
+
+def all_names_payload(show_count, seed=37):
+    """
+    allNames data shaped like TheXEM's: plain names and {name: season} entries per tvdb id.
+    """
+    rng = random.Random(seed)
+    words = [f"word{i}" for i in range(3000)] + ["no", "the", "season", "of"]
+    data = {}
+    for tvdb_id in range(100000, 100000 + show_count):
+        names = [" ".join(rng.choices(words, k=rng.randint(1, 5)))]
+        for season in range(1, rng.randint(1, 4)):
+            names.append({" ".join(rng.choices(words, k=rng.randint(2, 6))): season})
+        data[str(tvdb_id)] = names
+    return data
+
+
+def linear_scan(all_names, title):
+    """
+    Reference lookup: scans every name of every show, like before the index existed.
+    """
+    sanitized_title = TitleCleaner.sanitize(title)
+    for tvdb_id, names_list in all_names.items():
+        for entry in names_list:
+            names = [entry] if isinstance(entry, str) else list(entry)
+            for name in names:
+                if search_string_in_sanitized_title(sanitized_title, name):
+                    return tvdb_id
+    return None
+
+
+def queries(all_names, count, seed=37):
+    rng = random.Random(seed)
+    result = ["word1 word2", "missing title"]
+    for names in rng.sample(list(all_names.values()), count):
+        entry = rng.choice(names)
+        name = entry if isinstance(entry, str) else next(iter(entry))
+        words = name.split()
+        # Full names and partial names with words in order
+        result.append(name)
+        result.append(" ".join(words[: max(1, len(words) // 2)]))
+    return result
+
+
+@pytest.fixture
+def xem(state, monkeypatch):
+    state.values["user_agent"] = "Quasarr tests"
+    requests_made = []
+
+    def serve(payload):
+        class Response:
+            def raise_for_status(self):
+                pass
+
+            def json(self):
+                return {"result": "success", "data": payload}
+
+        def get(url, **kwargs):
+            requests_made.append(url)
+            return Response()
+
+        monkeypatch.setattr(xem_metadata.requests, "get", get)
+
+    index = xem_metadata.XEMNameIndex()
+    monkeypatch.setattr(xem_metadata, "xem_name_index", index)
+    return serve, requests_made, index
+
+
+def test_index_matches_linear_scan(xem):
+    serve, _, index = xem
+    all_names = all_names_payload(300)
+    serve(all_names)
+
+    for title in queries(all_names, 100):
+        assert index.search(title) == linear_scan(all_names, title), title
+    # Only articles are left of this title, the scan matched the first show with it
+    assert index.search("The") is None
+
+
+def test_index_is_persisted(xem):
+    serve, requests_made, index = xem
+    serve({"81797": ["One Piece", {"One Piece East Blue": 1}]})
+
+    assert index.search("One Piece") == "81797"
+    assert len(requests_made) == 1
+
+    # Another process reads the persisted index instead of fetching allNames
+    other = xem_metadata.XEMNameIndex()
+    assert other.search("One.Piece.East.Blue") == "81797"
+    assert other.search("Naruto") is None
+    assert len(requests_made) == 1
+
+
+@pytest.mark.benchmark
+def test_lookup_benchmark(xem):
+    serve, _, index = xem
+    all_names = all_names_payload(8000)
+    serve(all_names)
+    titles = queries(all_names, 50)
+    raw = json.dumps({"data": all_names})
+
+    start = time.perf_counter()
+    expected = []
+    for title in titles:
+        # The allNames row was decoded on every call before the index existed
+        expected.append(linear_scan(json.loads(raw)["data"], title))
+    scan_ms = (time.perf_counter() - start) * 1000 / len(titles)
+
+    start = time.perf_counter()
+    index.refresh()
+    build_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    found = [index.search(title) for title in titles]
+    index_us = (time.perf_counter() - start) * 1e6 / len(titles)
+
+    assert found == expected
+    print(
+        f"\nXEM allNames, {len(all_names)} shows: linear scan {scan_ms:.1f}ms per lookup, "
+        f"index {index_us:.1f}us per lookup (built and persisted in {build_ms:.0f}ms)"
+    )